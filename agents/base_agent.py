@@ -1,12 +1,23 @@
 from openai import OpenAI
 from typing import Dict, Any
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
 from structs.context import Context
 from structs.message import Message
+from services.async_runner import run_sync
+
+SYSTEM_PROMPTS_DIR = Path(__file__).parent / "system_prompts"
+
+
+@lru_cache(maxsize=None)
+def load_system_prompt(name: str) -> str:
+    """Read a system prompt from agents/system_prompts, once per process."""
+    return (SYSTEM_PROMPTS_DIR / name).read_text()
 
 class BaseAgent(ABC):
     @abstractmethod
-    def process(self, message: Message, context: Context) -> Dict[str, Any]:
+    async def process_async(self, message: Message, context: Context) -> Dict[str, Any]:
         """
         Process a message and update the context.
         Returns a dictionary containing at least:
@@ -14,4 +25,10 @@ class BaseAgent(ABC):
         - response: The agent's response as a string
         """
         
-        raise NotImplementedError("Subclasses should implement this method.")
\ No newline at end of file
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    def process(self, message: Message, context: Context) -> Dict[str, Any]:
+        """
+        Synchronous wrapper around process_async, executed on the shared event loop.
+        """
+        return run_sync(self.process_async(message, context))
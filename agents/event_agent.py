@@ -1,131 +1,355 @@
-from agents.base_agent import BaseAgent
-from openai import OpenAI
-from typing import Dict, Any, Optional
+from agents.base_agent import BaseAgent, load_system_prompt
+from openai import AsyncOpenAI
+import asyncio
+import logging
+from typing import Dict, Any, Optional, AsyncIterator, Awaitable, List
 from structs.context import Context
 from structs.message import Message
 from tools.ticketmaster_event_search import TicketmasterAPI
 from tools.event_categories import EventCategoriesAPI
 from tools.event_details import TicketmasterEventDetailsAPI
 from tools.event_search import EventSearchAPI
-from agents.memory_agent import MemoryAgent
+from tools.registry import ToolRegistry, ToolSpec
+from agents.shared_resources import SharedResources, get_shared_resources
+from agents.tool_executor import ToolExecutor
+from agents.summary_worker import SummaryWorker
+from agents.streaming import StreamedTurn, ToolCallAccumulator
+from services.completion_cache import CompletionCache, create_chat_completion, stream_chat_completion
 from tools.today_date import TodayDateTool
 from memory.chat_memory import ChatMemory
-from pathlib import Path
-import json
+
+logger = logging.getLogger(__name__)
+
+MODEL = "gpt-4.1"
+
+# Tools of the event agent, declared once per process; sessions build them on first call
+EVENT_AGENT_TOOLS = ToolRegistry([
+    ToolSpec("search_ticketmaster_events", TicketmasterAPI, "ticketmaster_event_search.json", enabled=False),
+    ToolSpec("get_ticketmaster_event_categories", EventCategoriesAPI, "ticketmaster_event_categories.json",
+             enabled=False),
+    ToolSpec("get_ticketmaster_event_details", TicketmasterEventDetailsAPI, "event_details.json", enabled=False),
+    ToolSpec("search_events", EventSearchAPI, "event_search.json"),
+])
 
 class EventAgent(BaseAgent):
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, completion_cache: Optional[CompletionCache] = None,
+                 resources: Optional[SharedResources] = None):
+        """
+        Args:
+            api_key: OpenAI API key; defaults to the environment
+            completion_cache: Completion cache; defaults to the one configured by LLM_CACHE_PATH
+            resources: Clients and resources shared with other sessions. Defaults to
+                       the process-wide ones, or to resources of this agent alone when
+                       an API key or completion cache is given.
+        """
+        if resources is None:
+            resources = SharedResources(api_key, completion_cache) if api_key or completion_cache \
+                else get_shared_resources()
+        self.resources = resources
         self.api_key = api_key
-        if api_key:
-            self.client = OpenAI(api_key=api_key)
-        else:
-            self.client = OpenAI()
-        system_prompt_path = Path(__file__).parent / "system_prompts" / "event_agent.txt"
+        self.completion_cache = resources.completion_cache
+        self.clients = resources.openai_clients
         self.system_prompt = Message(
             role="system",
-            content=system_prompt_path.read_text()
+            content=load_system_prompt("event_agent.txt")
         )
-        
-        # Initialize memory components
-        self.memory = ChatMemory()        
-        # Initialize tools
-        event_categories_tool = EventCategoriesAPI()
-        event_details_tool = TicketmasterEventDetailsAPI()
-        event_search_tool = EventSearchAPI()
-        self.tools = {
-            # 'search_ticketmaster_events': event_search_tool,
-            # 'get_ticketmaster_event_categories': event_categories_tool,
-            # 'get_ticketmaster_event_details': event_details_tool,
-            'search_events': event_search_tool,
-        }
-        self.memory_agent = MemoryAgent()
 
-    def process(self, message: Message, context: Context) -> Dict[str, Any]:
-        context.add_message(message)
-        
+        # Per-session state: memory, tool instances and the summary worker
+        self.memory = ChatMemory()
+        self.today_date_tool = TodayDateTool()
+        # Tools are built on first call; the schemas are shared by all sessions so the
+        # `tools` part of every request is identical
+        self.tools = EVENT_AGENT_TOOLS.view(search_events={"preferences_provider": self.memory.get_preferences})
+        self.tool_schemas = EVENT_AGENT_TOOLS.schemas
+        self.tool_executor = ToolExecutor()
+        self.memory_agent = resources.memory_agent
+        # Summaries are generated in the background; turns use the newest finished one
+        self.summary_worker = SummaryWorker(self.memory_agent, self.memory)
+
+    def _build_memory_message(self) -> Dict[str, Any]:
+        """
+        Build the per-turn context message (memory summary and date).
+
+        It is placed after the conversation rather than merged into the system
+        prompt, so the fixed system prompt, tool schemas and earlier history form
+        a prefix that stays identical between requests and can be served from the
+        provider's prompt cache.
+        """
         memory_summary = self.memory.get_summary()
-        print(f"Memory Summary: {memory_summary}")
-        enhanced_system_prompt = Message(
-            role="system",
-            content=self.system_prompt.content + "\n\n" + 
-                    "--- MEMORY SUMMARY ---\n" + 
-                    memory_summary + "\n"
-        )
-        
-        tools = [tool.tool_description for tool in self.tools.values()]
-        
-        messages_for_api = [{"role": "system", "content": enhanced_system_prompt.content}]
+        logger.debug("Memory summary: %s", memory_summary)
+        return {
+            "role": "system",
+            "content": f"Today's date: {self.today_date_tool.run({})}\n\n" +
+                       "--- MEMORY SUMMARY ---\n" +
+                       memory_summary + "\n"
+        }
+
+    def _messages_for_api(self, memory_message: Dict[str, Any], context: Context) -> List[Dict[str, Any]]:
+        # Stable prefix first (system prompt, history), per-turn content last
+        messages_for_api = [{"role": "system", "content": self.system_prompt.content}]
         messages_for_api.extend(context.messages_for_api())
-        try:
-            completion = self.client.chat.completions.create(
-                model="gpt-4.1",
-                messages=messages_for_api,
-                tools=tools
-            )
-            assistant_message = completion.choices[0].message
-        except Exception as e:
-            print(f"Error during OpenAI API call: {e}")
+        messages_for_api.append(memory_message)
+        return messages_for_api
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """The AsyncOpenAI client bound to the running event loop"""
+        return self.clients.get()
+
+    async def _run_tool_calls(self, tool_calls: List[Any], context: Context) -> List[Dict[str, Any]]:
+        """
+        Execute tool calls concurrently and append the assistant/tool message pairs
+        to the context in the original order. Returns per-call timings.
+        """
+        tool_timings = []
+        # Independent tool calls run concurrently; messages are appended in the original order
+        tool_results = await self.tool_executor.run_all_async(tool_calls, self.tools)
+        for tool_call, tool_result in zip(tool_calls, tool_results):
             context.add_message(
                 Message(
                     role="assistant",
-                    content="I'm sorry, I encountered an error while processing your request."
-                )
-            )
-            self.memory.add_message(message, "Error processing request.")
-            self.memory.update_summary(self.memory_agent.summarize_memory(self.memory))
-            return {"context": context, "response": "Error processing request."}
-
-        if hasattr(assistant_message, 'tool_calls') and assistant_message.tool_calls:
-            for tool_call in assistant_message.tool_calls:
-                context.add_message(
-                    Message(
-                        role="assistant",
-                        content="",
-                        tool_calls=[
-                            {
-                                "id": str(getattr(tool_call, "id", "")),
-                                "type": "function",
-                                "function": {
-                                    "name": str(getattr(tool_call.function, "name", "")),
-                                    "arguments": str(getattr(tool_call.function, "arguments", ""))
-                                }
+                    content="",
+                    tool_calls=[
+                        {
+                            "id": str(getattr(tool_call, "id", "")),
+                            "type": "function",
+                            "function": {
+                                "name": str(getattr(tool_call.function, "name", "")),
+                                "arguments": str(getattr(tool_call.function, "arguments", ""))
                             }
-                        ]
-                    )
+                        }
+                    ]
                 )
-                args = json.loads(tool_call.function.arguments)
-                result = self.tools[tool_call.function.name].run(args)
-                context.add_message(
-                    Message(
-                        role="tool",
-                        tool_call_id=tool_call.id,
-                        content=str(result)
-                    )
+            )
+            context.add_message(
+                Message(
+                    role="tool",
+                    tool_call_id=tool_call.id,
+                    content=tool_result.output
                 )
-            
-            # After processing all tool calls, get a final response
-            # Refresh messages for API
-            messages_for_api = [{"role": "system", "content": enhanced_system_prompt.content}]
-            messages_for_api.extend(context.messages_for_api())
-            
-            completion = self.client.chat.completions.create(
-                model="gpt-4.1",
-                messages=messages_for_api,
-                tools=tools
             )
-            assistant_message = completion.choices[0].message
+            tool_timings.append(tool_result.timing())
+        return tool_timings
 
-        assistant_response = assistant_message.content if assistant_message.content else ""
+    def _handle_api_error(self, error: Exception, message: Message, context: Context, remember: bool = True) -> str:
+        logger.error(f"Error during OpenAI API call: {error}")
+        context.add_message(
+            Message(
+                role="assistant",
+                content="I'm sorry, I encountered an error while processing your request."
+            )
+        )
+        # Recorded in memory; it is summarized together with the next successful turn
+        if remember:
+            self.memory.add_message(message, "Error processing request.")
+        return "Error processing request."
+
+    def _finish_turn(self, message: Message, context: Context, assistant_response: str,
+                     remember: bool = True) -> None:
         context.add_message(
             Message(
                 role="assistant",
                 content=assistant_response
             )
         )
-        
+        if remember:
+            self._remember(message, assistant_response)
+
+    def _remember(self, message: Message, assistant_response: str) -> None:
         # Update memory with the user message and assistant response
         self.memory.add_message(message, assistant_response)
-        # Update memory summary
-        self.memory.update_summary(self.memory_agent.summarize_memory(self.memory))
-        
-        return {"context": context, "response": assistant_response}
+        # Update memory summary in the background
+        self.summary_worker.request()
+
+    async def _create_completion(self, messages_for_api: List[Dict[str, Any]]) -> Any:
+        return await create_chat_completion(
+            self.client,
+            self.completion_cache,
+            usage_source="event_agent",
+            model=MODEL,
+            messages=messages_for_api,
+            tools=self.tool_schemas
+        )
+
+    async def process_async(self, message: Message, context: Context) -> Dict[str, Any]:
+        context.add_message(message)
+
+        memory_message = self._build_memory_message()
+
+        messages_for_api = self._messages_for_api(memory_message, context)
+        try:
+            completion = await self._create_completion(messages_for_api)
+            assistant_message = completion.choices[0].message
+        except Exception as e:
+            response = self._handle_api_error(e, message, context)
+            return {"context": context, "response": response}
+
+        tool_timings = []
+        if hasattr(assistant_message, 'tool_calls') and assistant_message.tool_calls:
+            tool_timings = await self._run_tool_calls(assistant_message.tool_calls, context)
+
+            # After processing all tool calls, get a final response
+            # Refresh messages for API
+            messages_for_api = self._messages_for_api(memory_message, context)
+
+            try:
+                completion = await self._create_completion(messages_for_api)
+                assistant_message = completion.choices[0].message
+            except Exception as e:
+                response = self._handle_api_error(e, message, context)
+                return {"context": context, "response": response, "tool_timings": tool_timings}
+
+        assistant_response = assistant_message.content if assistant_message.content else ""
+        self._finish_turn(message, context, assistant_response)
+
+        return {"context": context, "response": assistant_response, "tool_timings": tool_timings}
+
+    def process_stream(self, message: Message, context: Context,
+                       admission: Optional[Awaitable[bool]] = None) -> StreamedTurn:
+        """
+        Process a message, streaming the response.
+
+        Returns a StreamedTurn that yields content deltas as they arrive (iterate it
+        with `for` from sync code or `async for` from a coroutine). Tool calls
+        requested by the model are accumulated from the stream, executed, and followed
+        by a second streamed completion. When iteration finishes the turn exposes the
+        full response, the updated context and latency metrics.
+
+        The turn runs on a copy of the context; the copy and the memory are committed
+        when the response is complete. If the consumer stops iterating early, or the
+        turn's `review` (e.g. the moderation of the response) rejects the response,
+        the turn is discarded: `turn.discarded` is set and context and memory are
+        unchanged.
+
+        With `admission` (e.g. the moderation of the message), the turn is speculative:
+        it starts while `admission` is awaited and content is held back until admission
+        resolves True. If it resolves False, the turn is cancelled, nothing is yielded
+        and `turn.rejected` is set.
+        """
+        turn = StreamedTurn()
+        return turn.bind(self._drafted_turn(message, context, turn, admission))
+
+    async def _stream_completion(self, messages_for_api: List[Dict[str, Any]], turn: StreamedTurn, parts: List[str],
+                                 accumulator: ToolCallAccumulator) -> AsyncIterator[str]:
+        """
+        Stream one completion, yielding content deltas and collecting them in `parts`.
+        Tool-call deltas requested by the model are merged into `accumulator`.
+        """
+        stream = stream_chat_completion(
+            self.client,
+            self.completion_cache,
+            usage_source="event_agent",
+            model=MODEL,
+            messages=messages_for_api,
+            tools=self.tool_schemas
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                turn.mark_token()
+                parts.append(delta.content)
+                yield delta.content
+            if delta.tool_calls:
+                accumulator.add(delta.tool_calls)
+
+    async def _stream_turn(self, message: Message, context: Context, turn: StreamedTurn) -> AsyncIterator[str]:
+        """Run the turn on `context`; memory is left to the caller."""
+        context.add_message(message)
+        turn.context = context
+
+        memory_message = self._build_memory_message()
+
+        parts: List[str] = []
+        accumulator = ToolCallAccumulator()
+        try:
+            async for delta in self._stream_completion(
+                self._messages_for_api(memory_message, context), turn, parts, accumulator
+            ):
+                yield delta
+        except Exception as e:
+            turn.response = self._handle_api_error(e, message, context, remember=False)
+            turn.failed = True
+            turn.mark_token()
+            yield turn.response
+            return
+
+        tool_calls = accumulator.tool_calls()
+        if tool_calls:
+            turn.tool_timings = await self._run_tool_calls(tool_calls, context)
+            try:
+                async for delta in self._stream_completion(
+                    self._messages_for_api(memory_message, context), turn, parts,
+                    ToolCallAccumulator()
+                ):
+                    yield delta
+            except Exception as e:
+                turn.response = self._handle_api_error(e, message, context, remember=False)
+                turn.failed = True
+                turn.mark_token()
+                yield turn.response
+                return
+
+        turn.response = "".join(parts)
+        self._finish_turn(message, context, turn.response, remember=False)
+
+    async def _drafted_turn(self, message: Message, context: Context, turn: StreamedTurn,
+                            admission: Optional[Awaitable[bool]]) -> AsyncIterator[str]:
+        """Run the turn on a copy of the context and commit it once it is complete; see process_stream."""
+        draft = context.copy()
+        deltas = self._stream_turn(message, draft, turn)
+        if admission is not None:
+            deltas = self._speculative_deltas(deltas, turn, admission)
+
+        committed = False
+        try:
+            async for delta in deltas:
+                yield delta
+            if turn.rejected or (turn.review is not None and not await turn.review()):
+                return
+            turn.context = draft
+            if turn.failed:
+                self.memory.add_message(message, turn.response)
+            else:
+                self._remember(message, turn.response)
+            committed = True
+        finally:
+            await deltas.aclose()
+            if not committed:
+                turn.context = context
+                turn.discarded = not turn.rejected
+
+    async def _speculative_deltas(self, deltas: AsyncIterator[str], turn: StreamedTurn,
+                                  admission: Awaitable[bool]) -> AsyncIterator[str]:
+        """Produce the deltas while admission is decided, holding them back until the message is admitted."""
+        queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+
+        async def produce() -> None:
+            try:
+                async for delta in deltas:
+                    queue.put_nowait(delta)
+            finally:
+                queue.put_nowait(None)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            admitted = await admission
+        except BaseException:
+            producer.cancel()
+            raise
+        turn.mark_admitted()
+        if not admitted:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+            turn.rejected = True
+            turn.response = ""
+            return
+
+        try:
+            while (delta := await queue.get()) is not None:
+                yield delta
+            await producer
+        finally:
+            # The consumer may stop iterating early; the unfinished turn is discarded
+            producer.cancel()
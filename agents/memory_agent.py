@@ -1,45 +1,90 @@
-from agents.base_agent import BaseAgent
-from openai import OpenAI
-from typing import Dict, Any, Optional
+from agents.base_agent import BaseAgent, load_system_prompt
+from openai import AsyncOpenAI
+from typing import Dict, Any, Optional, Tuple
 from structs.context import Context
 from structs.message import Message
 from memory.chat_memory import ChatMemory
 from tools.today_date import TodayDateTool
-from pathlib import Path
+from services.async_runner import LoopLocal, run_sync
+from services.completion_cache import CompletionCache, create_chat_completion, get_default_completion_cache
 import json
 
 class MemoryAgent(BaseAgent):
-    def __init__(self, api_key: Optional[str] = None):
+    """
+    Summarizes chat memories. It keeps no per-conversation state, so one
+    instance can serve every session.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, completion_cache: Optional[CompletionCache] = None,
+                 clients: Optional[LoopLocal[AsyncOpenAI]] = None):
+        """
+        Args:
+            api_key: OpenAI API key; defaults to the environment
+            completion_cache: Completion cache; defaults to the one configured by LLM_CACHE_PATH
+            clients: Per-loop AsyncOpenAI clients to share with other agents;
+                     by default the agent creates its own
+        """
         self.api_key = api_key
-        if api_key:
-            self.client = OpenAI(api_key=api_key)
-        else:
-            self.client = OpenAI()
+        # Opt-in on-disk cache of completions (enabled with LLM_CACHE_PATH)
+        self.completion_cache = completion_cache or get_default_completion_cache()
+        # One AsyncOpenAI client per event loop (the shared loop for sync callers)
+        self.clients = clients or LoopLocal(lambda: AsyncOpenAI(api_key=api_key) if api_key else AsyncOpenAI())
         
-        system_prompt_path = Path(__file__).parent / "system_prompts" / "memory_agent.txt"
         self.system_prompt = Message(
             role="system",
-            content=system_prompt_path.read_text()
+            content=load_system_prompt("memory_agent.txt")
         )
         
         # Include today's date tool
         self.today_date_tool = TodayDateTool()
         
+    @property
+    def client(self) -> AsyncOpenAI:
+        """The AsyncOpenAI client bound to the running event loop"""
+        return self.clients.get()
+
     def summarize_memory(self, chat_memory: ChatMemory) -> str:
+        """
+        Synchronous wrapper around summarize_memory_async
+        """
+        return run_sync(self.summarize_memory_async(chat_memory))
+
+    async def summarize_memory_async(self, chat_memory: ChatMemory) -> str:
         """
         Summarize the conversation history and extract user preferences
         """
+        summary, _ = await self._summarize_new_messages(chat_memory)
+        return summary
+
+    async def update_summary_async(self, chat_memory: ChatMemory) -> str:
+        """
+        Fold the messages added since the last summary into the summary and
+        advance the memory's watermark. Returns the new summary.
+        """
+        summary, summarized_upto = await self._summarize_new_messages(chat_memory)
+        chat_memory.update_summary(summary, summarized_upto=summarized_upto)
+        return summary
+
+    async def _summarize_new_messages(self, chat_memory: ChatMemory) -> Tuple[str, int]:
+        """
+        Summarize only the messages past the memory's watermark together with the
+        current summary, so the request size does not grow with the conversation.
+        Returns the summary and the watermark it covers.
+        """
         # Get today's date
         today_date = self.today_date_tool.run({})
         
-        # Get conversation history from memory
-        memory_content = chat_memory.get_memory()
+        # Get the messages not yet covered by the summary
+        memory_content, summarized_upto = chat_memory.get_new_memory()
         current_summary = chat_memory.get_summary()
         if not current_summary:
             current_summary = "No previous summary available."
         
-        if not memory_content or memory_content == "No conversation history available.":
-            return f"Today's date: {today_date}\nMemory is empty. No summary can be created."
+        if summarized_upto == 0:
+            return f"Today's date: {today_date}\nMemory is empty. No summary can be created.", 0
+        if not memory_content:
+            # Nothing new since the last summary
+            return current_summary, summarized_upto
             
         # Create a message for summarization
         summarization_request = Message(
@@ -50,16 +95,20 @@ class MemoryAgent(BaseAgent):
                 f"({today_date}):\nCurrent Summary\n{current_summary}\nRecent Messages\n{memory_content}"
         )
         
-        # Create a temporary context for this request
+        # Create a temporary context for this request; the fixed system prompt goes
+        # first so it forms a stable, cacheable prompt prefix
         temp_context = Context()
-        temp_context.add_message(summarization_request)
         temp_context.add_message(self.system_prompt)
+        temp_context.add_message(summarization_request)
         
         # Convert messages to proper format
         messages_for_api = temp_context.messages_for_api()
         
         # Get summary from the AI
-        completion = self.client.chat.completions.create(
+        completion = await create_chat_completion(
+            self.client,
+            self.completion_cache,
+            usage_source="memory_agent",
             model="gpt-4.1",
             messages=messages_for_api
         )
@@ -68,9 +117,9 @@ class MemoryAgent(BaseAgent):
         if not summary:
             summary = "No summary generated."
         
-        return summary
+        return summary, summarized_upto
         
-    def process(self, message: Message, context: Context) -> Dict[str, Any]:
+    async def process_async(self, message: Message, context: Context) -> Dict[str, Any]:
         # """
         # Process memory summarization requests
         # """
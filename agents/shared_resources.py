@@ -0,0 +1,109 @@
+"""
+shared_resources.py
+
+Process-wide resources shared by all chat sessions.
+
+A chat session (one Streamlit user) only owns its conversation state: the
+EventAgent with its memory, summary worker and tool view, and the context.
+Everything that does not depend on the conversation is created once per
+process and shared:
+
+- the AsyncOpenAI clients (one connection pool per event loop), used by the
+  event agent, the memory agent and the moderation service
+- the completion cache
+- the memory agent, which keeps no per-conversation state
+- the moderation service
+- the HTTP pool of the event tools and the taxonomy, which already have
+  process-wide accessors and are exposed here for convenience
+
+System prompts (`load_system_prompt`) and tool schemas (`EVENT_AGENT_TOOLS`)
+are likewise loaded once per process.
+"""
+
+import logging
+import threading
+from typing import Callable, Optional
+
+from openai import AsyncOpenAI
+
+from agents.memory_agent import MemoryAgent
+from services.async_runner import LoopLocal
+from services.completion_cache import CompletionCache, get_default_completion_cache
+from services.http_client import HttpClient, get_http_client
+from services.moderation_service import ModerationService
+from services.taxonomy import Taxonomy, get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+
+class SharedResources:
+    """Clients and immutable resources shared by all sessions of a process."""
+
+    def __init__(self, api_key: Optional[str] = None, completion_cache: Optional[CompletionCache] = None,
+                 client_factory: Optional[Callable[[], AsyncOpenAI]] = None):
+        """
+        Args:
+            api_key: OpenAI API key; defaults to the environment
+            completion_cache: Completion cache; defaults to the one configured by LLM_CACHE_PATH
+            client_factory: Creates the AsyncOpenAI client of an event loop
+        """
+        self.api_key = api_key
+        # Opt-in on-disk cache of completions (enabled with LLM_CACHE_PATH)
+        self.completion_cache = completion_cache or get_default_completion_cache()
+        if client_factory is None:
+            client_factory = lambda: AsyncOpenAI(api_key=api_key) if api_key else AsyncOpenAI()
+        # One AsyncOpenAI client per event loop (the shared loop for sync callers)
+        self.openai_clients: LoopLocal[AsyncOpenAI] = LoopLocal(client_factory)
+        self._lock = threading.Lock()
+        self._memory_agent: Optional[MemoryAgent] = None
+        self._moderation_service: Optional[ModerationService] = None
+        self._moderation_failed = False
+
+    @property
+    def memory_agent(self) -> MemoryAgent:
+        """The memory agent summarizing every session's memory."""
+        if self._memory_agent is None:
+            with self._lock:
+                if self._memory_agent is None:
+                    self._memory_agent = MemoryAgent(api_key=self.api_key, completion_cache=self.completion_cache,
+                                                     clients=self.openai_clients)
+        return self._memory_agent
+
+    @property
+    def moderation_service(self) -> Optional[ModerationService]:
+        """The moderation service, or None if it could not be initialized."""
+        if self._moderation_service is None and not self._moderation_failed:
+            with self._lock:
+                if self._moderation_service is None and not self._moderation_failed:
+                    try:
+                        self._moderation_service = ModerationService(api_key=self.api_key,
+                                                                     clients=self.openai_clients)
+                        logger.info("Moderation service initialized successfully")
+                    except Exception as e:
+                        logger.error(f"Failed to initialize moderation service: {e}")
+                        self._moderation_failed = True
+        return self._moderation_service
+
+    @property
+    def http_client(self) -> HttpClient:
+        """The pooled HTTP client of the event tools."""
+        return get_http_client()
+
+    @property
+    def taxonomy(self) -> Taxonomy:
+        """The category taxonomy."""
+        return get_taxonomy()
+
+
+_shared: Optional[SharedResources] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_resources() -> SharedResources:
+    """Get the resources shared by all sessions of this process, creating them on first use."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = SharedResources()
+    return _shared
@@ -0,0 +1,149 @@
+"""
+streaming.py
+
+Helpers for streaming chat completions: accumulating tool-call deltas into
+complete tool calls, and a turn object that yields content deltas while
+recording latency metrics.
+"""
+
+import logging
+import time
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from services.async_runner import iterate_sync
+
+logger = logging.getLogger(__name__)
+
+
+class ToolCallAccumulator:
+    """Builds complete tool calls from the partial deltas of a streamed completion."""
+
+    def __init__(self):
+        self._calls: Dict[int, Dict[str, str]] = {}
+
+    def add(self, tool_call_deltas: List[Any]) -> None:
+        """Merge the tool-call deltas of one chunk."""
+        for delta in tool_call_deltas:
+            call = self._calls.setdefault(delta.index, {"id": "", "name": "", "arguments": ""})
+            if getattr(delta, "id", None):
+                call["id"] = delta.id
+            function = getattr(delta, "function", None)
+            if function is not None:
+                if getattr(function, "name", None):
+                    call["name"] += function.name
+                if getattr(function, "arguments", None):
+                    call["arguments"] += function.arguments
+
+    def tool_calls(self) -> List[SimpleNamespace]:
+        """
+        Get the accumulated tool calls, ordered by index.
+
+        The returned objects mirror the shape of non-streamed tool calls
+        (`id`, `function.name`, `function.arguments`).
+        """
+        return [
+            SimpleNamespace(
+                id=call["id"],
+                type="function",
+                function=SimpleNamespace(name=call["name"], arguments=call["arguments"]),
+            )
+            for _, call in sorted(self._calls.items())
+        ]
+
+
+class StreamedTurn:
+    """
+    A single agent turn whose response is streamed.
+
+    Iterating the turn (with `for` or `async for`) yields content deltas as they
+    arrive. Once iteration finishes, `response`, `context` and the latency
+    metrics are populated. A speculative turn, started before its message was
+    admitted, also records when admission was decided and whether the message
+    was rejected.
+
+    A consumer that checks the response (e.g. its moderation) can set `review`:
+    it is awaited once the response is complete, before the turn is committed,
+    and the turn is discarded if it returns False.
+    """
+
+    def __init__(self):
+        self.response: str = ""
+        self.context = None
+        self.tool_timings: List[Dict[str, Any]] = []
+        self.started_at: float = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.admitted_at: Optional[float] = None
+        self.rejected = False
+        self.failed = False
+        # Set when the turn was stopped early or failed its review; context and memory are unchanged
+        self.discarded = False
+        self.review: Optional[Callable[[], Awaitable[bool]]] = None
+        self._deltas: Optional[AsyncIterator[str]] = None
+
+    def bind(self, deltas: AsyncIterator[str]) -> "StreamedTurn":
+        """Attach the async generator producing the content deltas."""
+        self._deltas = deltas
+        return self
+
+    def mark_token(self) -> None:
+        """Record the arrival of a content token."""
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        if self._deltas is None:
+            return
+        try:
+            async for delta in self._deltas:
+                yield delta
+        finally:
+            # Close the producer right away if the consumer stopped early (no-op once exhausted)
+            aclose = getattr(self._deltas, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        self.finished_at = time.perf_counter()
+        logger.info("Streamed turn metrics: %s", self.metrics())
+
+    def __iter__(self) -> Iterator[str]:
+        return iterate_sync(self.__aiter__())
+
+    def mark_admitted(self) -> None:
+        """Record that the admission of a speculative turn was decided; held tokens are released now."""
+        self.admitted_at = time.perf_counter()
+        if self.first_token_at is not None:
+            self.first_token_at = max(self.first_token_at, self.admitted_at)
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        """Seconds from the start of the turn to the first content token."""
+        if self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started_at
+
+    @property
+    def total_latency(self) -> Optional[float]:
+        """Seconds from the start of the turn until the stream was exhausted."""
+        if self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    def metrics(self) -> Dict[str, Any]:
+        """Latency metrics in milliseconds."""
+        ttft = self.time_to_first_token
+        total = self.total_latency
+        metrics = {
+            "time_to_first_token_ms": round(ttft * 1000, 1) if ttft is not None else None,
+            "total_latency_ms": round(total * 1000, 1) if total is not None else None,
+            "tool_timings": self.tool_timings,
+            "discarded": self.discarded,
+        }
+        if self.admitted_at is not None:
+            metrics["admission_ms"] = round((self.admitted_at - self.started_at) * 1000, 1)
+            metrics["rejected"] = self.rejected
+        return metrics
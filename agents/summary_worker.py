@@ -0,0 +1,86 @@
+"""
+summary_worker.py
+
+Runs memory summarization for one chat session in the background, off the
+response critical path. Requests arriving while a summary is being generated
+are coalesced into a single follow-up summary, and the agent keeps using the
+newest finished summary in the meantime.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from agents.memory_agent import MemoryAgent
+from memory.chat_memory import ChatMemory
+from services.async_runner import get_loop
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryWorker:
+    """Per-session background summarizer with request coalescing."""
+
+    def __init__(self, memory_agent: MemoryAgent, memory: ChatMemory):
+        self.memory_agent = memory_agent
+        self.memory = memory
+        self._lock = threading.Lock()
+        self._running = False
+        self._pending = False
+        self._idle = threading.Event()
+        self._idle.set()
+        self.requested = 0
+        self.coalesced = 0
+        self.completed = 0
+        self.failed = 0
+
+    def request(self) -> None:
+        """
+        Request a new summary of the session memory.
+
+        Returns immediately. If a summary is already being generated, the request is
+        merged with any other pending ones into a single summary that runs afterwards.
+        """
+        with self._lock:
+            self.requested += 1
+            if self._running:
+                if self._pending:
+                    self.coalesced += 1
+                self._pending = True
+                return
+            self._running = True
+            self._idle.clear()
+        asyncio.run_coroutine_threadsafe(self._run(), get_loop())
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            try:
+                await self.memory_agent.update_summary_async(self.memory)
+                self.completed += 1
+                logger.info("Memory summary updated in %.1f ms", (time.perf_counter() - started) * 1000)
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Error summarizing memory: {e}")
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    self._idle.set()
+                    return
+                self._pending = False
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until no summary is running or pending. Returns False on timeout."""
+        return self._idle.wait(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters describing the worker's activity."""
+        return {
+            "requested": self.requested,
+            "coalesced": self.coalesced,
+            "completed": self.completed,
+            "failed": self.failed,
+            "running": self._running,
+        }
@@ -0,0 +1,132 @@
+"""
+tool_executor.py
+
+Runs the tool calls requested by a single assistant message concurrently.
+Results are returned in the order of the original tool calls, so callers can
+append the matching `tool` messages to the context deterministically.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional
+
+from tools.base_tool import BaseTool
+from services.async_runner import run_sync
+
+logger = logging.getLogger(__name__)
+
+# The event agent prompt allows at most five tool calls per user prompt
+DEFAULT_MAX_WORKERS = 5
+# Slightly above the 10s HTTP timeout used by the event tools
+DEFAULT_TOOL_TIMEOUT = 15.0
+
+
+@dataclass
+class ToolCallResult:
+    """Outcome of a single tool call."""
+    tool_call_id: str
+    name: str
+    arguments: str
+    output: str
+    duration: float
+    timed_out: bool = False
+
+    def timing(self) -> Dict[str, Any]:
+        """Timing information suitable for logging or returning to the caller."""
+        return {
+            "tool_call_id": self.tool_call_id,
+            "name": self.name,
+            "duration_ms": round(self.duration * 1000, 1),
+            "timed_out": self.timed_out,
+        }
+
+
+class ToolExecutor:
+    """Bounded executor that runs independent tool calls concurrently."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: float = DEFAULT_TOOL_TIMEOUT,
+        tool_timeouts: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Args:
+            max_workers: Maximum number of tool calls running at the same time per batch
+            timeout: Default per-call timeout in seconds
+            tool_timeouts: Optional per-tool overrides of the timeout, keyed by tool name
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.tool_timeouts = tool_timeouts or {}
+
+    def get_timeout(self, name: str) -> float:
+        """Get the timeout for the given tool."""
+        return self.tool_timeouts.get(name, self.timeout)
+
+    def run_all(self, tool_calls: List[Any], tools: Mapping[str, BaseTool]) -> List[ToolCallResult]:
+        """Synchronous wrapper around run_all_async."""
+        return run_sync(self.run_all_async(tool_calls, tools))
+
+    async def run_all_async(self, tool_calls: List[Any], tools: Mapping[str, BaseTool]) -> List[ToolCallResult]:
+        """
+        Run all tool calls concurrently and wait for them to finish.
+
+        Args:
+            tool_calls: Tool calls from an assistant message (objects with `id` and `function`)
+            tools: Mapping of tool name to tool instance
+
+        Returns:
+            List[ToolCallResult]: One result per tool call, in the original order
+        """
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.max_workers)
+        results = await asyncio.gather(*(
+            self._run_one(tool_call, tools, semaphore) for tool_call in tool_calls
+        ))
+
+        wall_time = time.perf_counter() - started
+        logger.info(
+            "Executed %d tool call(s) in %.1f ms (sequential estimate %.1f ms): %s",
+            len(results),
+            wall_time * 1000,
+            sum(r.duration for r in results) * 1000,
+            [r.timing() for r in results],
+        )
+        return list(results)
+
+    async def _run_one(self, tool_call: Any, tools: Mapping[str, BaseTool],
+                       semaphore: asyncio.Semaphore) -> ToolCallResult:
+        """Run a single tool call, converting failures into an error string for the LLM."""
+        name = str(getattr(tool_call.function, "name", ""))
+        arguments = str(getattr(tool_call.function, "arguments", ""))
+        timeout = self.get_timeout(name)
+        timed_out = False
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                tool = tools.get(name)
+                if tool is None:
+                    output = f"Error: unknown tool '{name}'."
+                else:
+                    args = json.loads(arguments) if arguments else {}
+                    output = str(await asyncio.wait_for(tool.run_async(args), timeout))
+            except asyncio.TimeoutError:
+                timed_out = True
+                output = f"Error: tool '{name}' timed out after {timeout:.0f} seconds."
+            except json.JSONDecodeError as e:
+                output = f"Error: invalid arguments for tool '{name}': {e}"
+            except Exception as e:
+                output = f"Unexpected error: {e}"
+            duration = time.perf_counter() - started
+        return ToolCallResult(
+            tool_call_id=str(getattr(tool_call, "id", "")),
+            name=name,
+            arguments=arguments,
+            output=output,
+            duration=duration,
+            timed_out=timed_out,
+        )
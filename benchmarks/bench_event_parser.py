@@ -0,0 +1,75 @@
+"""
+Microbenchmark of event response parsing: validated vs fast parser.
+
+Parses a synthetic 200-event page in both response shapes and reports the
+median time per page. The fast parser returns an EventStore of plain
+records; its Event models are only built when the events are accessed.
+
+Usage:
+    python benchmarks/bench_event_parser.py [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SWAGGER_API_KEY", "benchmark")
+
+from services.event_api_service import EventApiService
+
+PAGE_SIZE = 200
+
+
+def make_page(shape: str, size: int = PAGE_SIZE) -> dict:
+    events = []
+    for i in range(size):
+        event = {
+            "id": str(i),
+            "name": f"Event {i}",
+            "description": "An example event description",
+            "url": f"https://example.com/events/{i}",
+            "venues": [{"name": f"Venue {i % 20}", "city": {"name": "Warsaw"},
+                        "country": {"name": "Poland", "countryCode": "PL"},
+                        "address": {"line1": f"Street {i % 50}"}}],
+            "images": [{"url": f"https://example.com/images/{i}.jpg", "alt": "poster"}],
+            "classifications": [{"genre": {"name": "Rock"}}],
+        }
+        if shape == "startDateTime":
+            event["startDateTime"] = f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}T19:30:00Z"
+        else:
+            event["dates"] = {"start": {"localDate": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                                        "localTime": "19:30:00"}}
+        events.append(event)
+    return {"events": events, "foundMoreEvents": True}
+
+
+def time_parse(service: EventApiService, data: dict, fast: bool, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        service._extract_events_from_response(data, fast=fast)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    service = EventApiService(api_key="benchmark", cache=None)
+    print(f"Parse time per {PAGE_SIZE}-event page (median of {args.repeat} runs)")
+    for shape in ("startDateTime", "dates"):
+        data = make_page(shape)
+        validated = time_parse(service, data, fast=False, repeat=args.repeat)
+        fast = time_parse(service, data, fast=True, repeat=args.repeat)
+        print(f"  {shape:<14} validated {validated * 1000:7.2f} ms   fast {fast * 1000:7.2f} ms"
+              f"   speedup {validated / fast:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Memory benchmark of search results: list of Event models vs EventStore.
+
+Parses synthetic 200-event pages (1000 events by default) and reports the
+memory retained by the results, measured with tracemalloc, plus the cost of
+materializing and formatting events from the store.
+
+Usage:
+    python benchmarks/bench_event_store.py [--events N]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SWAGGER_API_KEY", "benchmark")
+
+from bench_event_parser import PAGE_SIZE, make_page
+from services.event_api_service import _parse_events_fast
+
+
+def retained_bytes(build) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=1000)
+    args = parser.parse_args()
+
+    pages = [make_page("startDateTime")["events"] for _ in range(max(1, args.events // PAGE_SIZE))]
+    count = len(pages) * PAGE_SIZE
+
+    lists, list_bytes = retained_bytes(lambda: [list(_parse_events_fast(page)) for page in pages])
+    stores, store_bytes = retained_bytes(lambda: [_parse_events_fast(page) for page in pages])
+    assert all(store == events for store, events in zip(stores, lists))
+
+    per_1k = 1000 / count
+    print(f"Memory retained by {count} events")
+    print(f"  list of Event  {list_bytes / 1024:9.1f} KiB   ({list_bytes * per_1k / 1024:.1f} KiB per 1k events)")
+    print(f"  EventStore     {store_bytes / 1024:9.1f} KiB   ({store_bytes * per_1k / 1024:.1f} KiB per 1k events)")
+    print(f"  reduction      {list_bytes / store_bytes:9.1f}x")
+
+    started = time.perf_counter()
+    for store in stores:
+        list(store)
+    materialize = time.perf_counter() - started
+    started = time.perf_counter()
+    for store in stores:
+        list(store.summaries())
+    summaries = time.perf_counter() - started
+    print(f"Materializing all events: {materialize * 1000:.2f} ms; formatting summaries: {summaries * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
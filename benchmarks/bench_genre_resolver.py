@@ -0,0 +1,63 @@
+"""
+Benchmark of the genre resolver: index build/load time and lookup latency.
+
+Reports the time to build the trigram index and to load it from the cached
+artifact, and the median latency of exact, fuzzy and repeated (cached) lookups.
+
+Usage:
+    python benchmarks/bench_genre_resolver.py [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.genre_resolver import GenreResolver
+from services.taxonomy import get_taxonomy
+
+EXACT = ["Sports - Football", "rock", "Arts & Theater", "jazz", "NBA"]
+FUZZY = ["sports - footbal", "basketbal", "Fotball", "classical music", "hip hop"]
+
+
+def median_us(call, texts, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        for text in texts:
+            started = time.perf_counter()
+            call(text)
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    taxonomy = get_taxonomy()
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / "genre_index.pickle"
+        started = time.perf_counter()
+        GenreResolver(taxonomy, cache_path)
+        build_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        resolver = GenreResolver(taxonomy, cache_path)
+        load_ms = (time.perf_counter() - started) * 1000
+
+    print(f"Index build: {build_ms:.1f} ms, load from artifact: {load_ms:.1f} ms ({len(resolver._keys)} keys)")
+    print(f"Exact lookup:  {median_us(resolver._resolve, EXACT, args.repeat):.1f} us")
+    print(f"Fuzzy lookup:  {median_us(resolver._resolve, FUZZY, args.repeat):.1f} us")
+    print(f"Cached lookup: {median_us(resolver.resolve, FUZZY, args.repeat):.2f} us")
+    for text in FUZZY:
+        print(f"  {text!r} -> {resolver.canonicalize(text)!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark of moderation batching: API requests, batch sizes and queueing delay.
+
+Simulates concurrent sessions (threads using the sync wrappers, like the
+Streamlit script threads) that each moderate a series of distinct texts, once
+with batching disabled (one text per request) and once with the default
+micro-batching window. The moderation API is served by an in-process mock
+transport that answers after a fixed latency.
+
+Usage:
+    python benchmarks/bench_moderation.py [--sessions N] [--checks N] [--latency MS]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from openai import AsyncOpenAI
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.async_runner import LoopLocal
+from services.moderation_service import DEFAULT_BATCH_WINDOW_SECONDS, DEFAULT_MAX_BATCH_SIZE, ModerationService
+
+RESULT = {"flagged": False, "categories": {"violence": False}, "category_scores": {"violence": 0.01}}
+
+
+def run(sessions: int, checks: int, latency: float, window: float, max_batch_size: int):
+    async def handler(request):
+        await asyncio.sleep(latency)
+        texts = json.loads(request.content)["input"]
+        return httpx.Response(200, json={"id": "modr-bench", "model": "omni-moderation-latest",
+                                         "results": [RESULT] * len(texts)})
+
+    clients = LoopLocal(lambda: AsyncOpenAI(
+        api_key="benchmark", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))))
+    # Without the local screener, so every text reaches the (mock) API
+    service = ModerationService(api_key="benchmark", clients=clients, batch_window=window,
+                                max_batch_size=max_batch_size, screener=None)
+    service.is_flagged("warm up")
+
+    def session(index):
+        timings = []
+        for check in range(checks):
+            started = time.perf_counter()
+            service.is_flagged(f"session {index} message {check}")
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        timings = sorted(t for result in pool.map(session, range(sessions)) for t in result)
+    elapsed = time.perf_counter() - started
+    stats = service.stats()
+    batching = stats["batching"]
+    print(f"  API requests:      {stats['api_calls'] - 1} for {sessions * checks} checks")
+    print(f"  Batch size:        mean {batching['mean_batch_size']}, max {batching['max_batch_size']}")
+    print(f"  Queueing delay:    p50 {batching['queue_delay_ms_p50']:.2f} ms, "
+          f"p95 {batching['queue_delay_ms_p95']:.2f} ms")
+    print(f"  Check latency:     p50 {statistics.median(timings) * 1000:.2f} ms, "
+          f"p95 {timings[int(len(timings) * 0.95)] * 1000:.2f} ms")
+    print(f"  Throughput:        {sessions * checks / elapsed:.0f} checks/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--checks", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=50.0, help="Mock API latency in milliseconds")
+    args = parser.parse_args()
+
+    print("One text per request:")
+    run(args.sessions, args.checks, args.latency / 1000, 0.0, 1)
+    print(f"Micro-batched ({DEFAULT_BATCH_WINDOW_SECONDS * 1000:g} ms window, up to {DEFAULT_MAX_BATCH_SIZE} texts):")
+    run(args.sessions, args.checks, args.latency / 1000, DEFAULT_BATCH_WINDOW_SECONDS, DEFAULT_MAX_BATCH_SIZE)
+
+
+if __name__ == "__main__":
+    main()
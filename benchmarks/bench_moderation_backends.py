@@ -0,0 +1,89 @@
+"""
+Benchmark of the local moderation screener in front of a remote backend.
+
+Moderates a sample of chat messages (mostly ordinary event requests, some
+borderline or harmful) and reports the time the screener takes per text, the
+share of texts it flags locally, and the median moderation latency with and
+without the screener. The remote backend is the offline stand-in
+(LocalModerationBackend) with a simulated latency.
+
+Usage:
+    python benchmarks/bench_moderation_backends.py [--backend-ms MS] [--repeat N]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.moderation_backends import LocalModerationBackend, LocalScreener
+from services.moderation_service import ModerationService
+
+MESSAGES = [
+    "Any jazz concerts in Berlin this weekend?",
+    "I'm looking for something to do with my kids on Saturday afternoon",
+    "Find me a theatre show in Warsaw next Friday",
+    "Are there any rock festivals in Poland this summer?",
+    "What time does the Coldplay concert start?",
+    "Cheap comedy shows in London tonight",
+    "Is there parking near the stadium?",
+    "Show me classical music events in Vienna in December",
+    "Which of these is closest to the city centre?",
+    "Can you recommend a family-friendly musical?",
+    "Thanks, that's perfect!",
+    "Any basketball games in Madrid next week?",
+    "I'd like tickets for two, preferably under 50 euros",
+    "What about open air cinema in Prague?",
+    "Tickets for The Killers, please",
+    "This app is stupid, just give me the list",
+    "Are there any shooting ranges open on Sunday?",
+    "I want to make a bomb and hurt people",
+    "I will kill you if the show is cancelled",
+    "Where can I buy cocaine at the festival?",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend-ms", type=float, default=150.0)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    screener = LocalScreener()
+    decided = [screener.screen(text) for text in MESSAGES]
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        for text in MESSAGES:
+            screener.screen(text)
+    per_text = (time.perf_counter() - started) / (args.repeat * len(MESSAGES))
+
+    flagged = sum(verdict is not None for verdict in decided)
+    print(f"Screen:                {per_text * 1e6:.1f} us per text")
+    print(f"Flagged locally:       {flagged} of {len(MESSAGES)}")
+
+    async def latencies(service):
+        timings = []
+        for text in MESSAGES:
+            started = time.perf_counter()
+            await service.is_flagged_async(text)
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    backend = lambda: LocalModerationBackend(latency=args.backend_ms / 1000)
+    for label, service in [
+        ("Backend only:", ModerationService(backend=backend(), screener=None, cache_size=0)),
+        ("Screen, then backend:", ModerationService(backend=backend(), cache_size=0)),
+    ]:
+        timings = asyncio.run(latencies(service))
+        print(f"{label:<23}median {statistics.median(timings) * 1000:.2f} ms, "
+              f"mean {statistics.mean(timings) * 1000:.1f} ms per message "
+              f"({service.stats()['api_calls']} backend calls)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark of event ranking: time to score and rank 1000 events.
+
+Builds a synthetic result set with genres drawn from the taxonomy, several
+cities and a spread of dates, and reports the median ranking time.
+
+Usage:
+    python benchmarks/bench_ranking.py [--events N] [--repeat N]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SWAGGER_API_KEY", "benchmark")
+
+from memory.preferences import UserPreferences
+from services.event_models import Event, EventDate, EventSearchParams, EventSearchResponse, Venue
+from services.event_ranker import EventRanker
+from services.event_store import EventStore
+from services.taxonomy import get_taxonomy
+
+CITIES = ["Warsaw", "Krakow", "Berlin", "London", "Paris", "New York"]
+
+
+def make_response(count: int, seed: int = 1) -> EventSearchResponse:
+    rng = random.Random(seed)
+    taxonomy = get_taxonomy()
+    genres = sorted(taxonomy.genres)
+    start = date(2025, 6, 1)
+    events = EventStore(
+        Event(
+            id=str(i),
+            name=f"Event {i}",
+            url=f"https://example.com/events/{i}",
+            dates=EventDate(start_date=(start + timedelta(days=rng.randint(0, 120))).isoformat(),
+                            start_time="19:30:00"),
+            venues=[Venue(name=f"Venue {rng.randint(0, 60)}", city=rng.choice(CITIES))],
+            genre=rng.choice(genres),
+        )
+        for i in range(count)
+    )
+    response = EventSearchResponse(total_count=count, page_size=count)
+    response.events = events
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    response = make_response(args.events)
+    params = EventSearchParams(eventGenre="Music - Rock", eventLocationCity="Warsaw", eventStartDate="2025-06-15")
+    preferences = UserPreferences(genres={"jazz": 1.0, "blues": 0.5}, cities={"Krakow": 0.5})
+    ranker = EventRanker()
+    ranker.rank(response, params, preferences)  # warm up the taxonomy
+
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        ranked = ranker.rank(response, params, preferences)
+        timings.append(time.perf_counter() - started)
+    print(f"Ranking {args.events} events (median of {args.repeat} runs): {statistics.median(timings) * 1000:.2f} ms")
+    for event in list(ranked.events)[:5]:
+        print(f"  {event.dates.start_date}  {event.venues[0].city:<9} {event.genre}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark of chat sessions: cost of a new session and of an idle one.
+
+Simulates new Streamlit sessions (an EventAgent and a Context on the shared
+resources) and reports the time to construct a session, the time to its first
+answered message, the memory retained per idle session and how many OpenAI
+clients (connection pools) were created. The OpenAI API is served by an
+in-process mock transport, so network time is excluded; with real traffic, a
+new client also pays for new TLS connections on its first request.
+
+Usage:
+    python benchmarks/bench_sessions.py [--sessions N]
+"""
+
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+import httpx
+from openai import AsyncOpenAI
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SWAGGER_API_KEY", "benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from agents.event_agent import EventAgent
+from agents.shared_resources import SharedResources
+from structs.context import Context
+from structs.message import Message
+
+COMPLETION = {
+    "id": "chatcmpl-bench", "object": "chat.completion", "created": 0, "model": "gpt-4.1",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "Hello!"}, "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=20)
+    args = parser.parse_args()
+
+    clients_created = 0
+
+    def client_factory() -> AsyncOpenAI:
+        nonlocal clients_created
+        clients_created += 1
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=COMPLETION))
+        return AsyncOpenAI(api_key="benchmark", http_client=httpx.AsyncClient(transport=transport))
+
+    resources = SharedResources(client_factory=client_factory)
+
+    def new_session():
+        return EventAgent(resources=resources), Context()
+
+    def first_message(session):
+        agent, context = session
+        agent.process(Message(role="user", content="Any concerts this weekend?"), context)
+        agent.summary_worker.wait_idle(5)
+
+    first_message(new_session())  # warm up imports and shared resources
+
+    construct, first = [], []
+    for _ in range(args.sessions):
+        started = time.perf_counter()
+        session = new_session()
+        constructed = time.perf_counter()
+        first_message(session)
+        construct.append(constructed - started)
+        first.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    sessions = [new_session() for _ in range(args.sessions)]
+    idle, _ = tracemalloc.get_traced_memory()
+    for session in sessions:
+        first_message(session)
+    gc.collect()
+    after_turn, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"Session construction:    {statistics.median(construct) * 1000:.2f} ms")
+    print(f"Time to first message:   {statistics.median(first) * 1000:.2f} ms (mock API)")
+    print(f"Idle session:            {idle / len(sessions) / 1024:.1f} KiB")
+    print(f"Session after one turn:  {after_turn / len(sessions) / 1024:.1f} KiB")
+    print(f"OpenAI clients created:  {clients_created} for {2 * args.sessions + 1} sessions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark of speculative turns: time to first token with input moderation.
+
+Runs chat turns the way main.py does, once moderating the user message before
+the agent turn starts and once speculatively, with the turn running alongside
+moderation. The OpenAI API (moderation and streamed completions) is served by
+an in-process mock transport with fixed latencies, so the difference is the
+moderation wait that the overlap hides.
+
+Usage:
+    python benchmarks/bench_speculation.py [--turns N] [--moderation-ms MS] [--first-token-ms MS]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+import httpx
+from openai import AsyncOpenAI
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SWAGGER_API_KEY", "benchmark")
+
+from agents.event_agent import EventAgent
+from agents.shared_resources import SharedResources
+from services.async_runner import run_sync
+from services.moderation_service import ModerationService
+from structs.context import Context
+from structs.message import Message
+
+RESULT = {"flagged": False, "categories": {"violence": False}, "category_scores": {"violence": 0.01}}
+SUMMARY = {
+    "id": "chatcmpl-bench", "object": "chat.completion", "created": 0, "model": "gpt-4.1",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "Summary"}, "finish_reason": "stop"}],
+}
+
+
+def _chunk(content):
+    return {"id": "chatcmpl-bench", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4.1",
+            "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--moderation-ms", type=float, default=150.0)
+    parser.add_argument("--first-token-ms", type=float, default=400.0)
+    args = parser.parse_args()
+
+    async def handler(request):
+        payload = json.loads(request.content)
+        if request.url.path.endswith("/moderations"):
+            await asyncio.sleep(args.moderation_ms / 1000)
+            return httpx.Response(200, json={"id": "modr-bench", "model": "omni-moderation-latest",
+                                             "results": [RESULT] * len(payload["input"])})
+        if not payload.get("stream"):
+            return httpx.Response(200, json=SUMMARY)
+        await asyncio.sleep(args.first_token_ms / 1000)
+        body = "".join(f"data: {json.dumps(_chunk(word))}\n\n" for word in ["Two ", "concerts."])
+        return httpx.Response(200, content=body + "data: [DONE]\n\n", headers={"content-type": "text/event-stream"})
+
+    resources = SharedResources(client_factory=lambda: AsyncOpenAI(
+        api_key="benchmark", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))))
+    # No screener and no verdict cache, so every turn waits for moderation
+    moderation = ModerationService(api_key="benchmark", clients=resources.openai_clients, cache_size=0,
+                                   screener=None)
+    agent = EventAgent(resources=resources)
+
+    async def admit(text):
+        return not await moderation.is_flagged_async(text)
+
+    def turn(index, speculative):
+        text = f"Any concerts this weekend? ({index})"
+        started = time.perf_counter()
+        admission = admit(text) if speculative else None
+        if not speculative:
+            run_sync(admit(text))
+        first_token = None
+        for _ in agent.process_stream(Message(role="user", content=text), Context(), admission):
+            if first_token is None:
+                first_token = time.perf_counter() - started
+        return first_token
+
+    turn(-1, False)
+    for speculative in (False, True):
+        timings = [turn(i, speculative) for i in range(args.turns)]
+        label = "Speculative:" if speculative else "Moderate, then answer:"
+        print(f"{label:<24}time to first token {statistics.median(timings) * 1000:.1f} ms")
+    print(f"(moderation {args.moderation_ms:g} ms, model first token {args.first_token_ms:g} ms)")
+    agent.summary_worker.wait_idle(5)
+
+
+if __name__ == "__main__":
+    main()
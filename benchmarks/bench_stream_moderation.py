@@ -0,0 +1,100 @@
+"""
+Benchmark of streamed output moderation: how long after the last token the verdict is ready.
+
+Streams a reply word by word and compares moderating the whole reply after
+the stream with moderating it chunk by chunk while it streams
+(ModeratedStream). Also reports how much of a reply with a flagged sentence
+is shown before the stream is stopped. The moderation API is served by an
+in-process mock transport that answers after a fixed latency.
+
+Usage:
+    python benchmarks/bench_stream_moderation.py [--moderation-ms MS] [--token-ms MS]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+
+import httpx
+from openai import AsyncOpenAI
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.async_runner import LoopLocal
+from services.moderation_service import ModerationService
+from services.stream_moderation import ModeratedStream
+
+REPLY = (
+    "I found three concerts in Berlin this weekend. The first is a jazz quartet at the A-Trane on Friday at 8 pm. "
+    "On Saturday, the Philharmonic plays Mahler's Fifth, and a few tickets are still available. "
+    "If you prefer something louder, an indie rock double bill is on at the Columbiahalle on Sunday. "
+    "Tickets start at 25 euros for the jazz night and 40 euros for the Philharmonic. "
+    "Would you like me to look for events next weekend as well, or narrow these down by price?"
+)
+FLAGGED_SENTENCE = "Bring a bomb to the show. "
+
+
+async def _words(text, token_ms):
+    for word in re.findall(r"\S+\s*", text):
+        await asyncio.sleep(token_ms / 1000)
+        yield word
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--moderation-ms", type=float, default=150.0)
+    parser.add_argument("--token-ms", type=float, default=20.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    async def handler(request):
+        texts = json.loads(request.content)["input"]
+        await asyncio.sleep(args.moderation_ms / 1000)
+        results = [{"flagged": "bomb" in text, "categories": {"violence": "bomb" in text},
+                    "category_scores": {"violence": 0.01}} for text in texts]
+        return httpx.Response(200, json={"id": "modr-bench", "model": "omni-moderation-latest", "results": results})
+
+    clients = LoopLocal(lambda: AsyncOpenAI(
+        api_key="benchmark", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))))
+    # No screener and no verdict cache, so every run calls the (mock) API
+    moderation = ModerationService(api_key="benchmark", clients=clients, cache_size=0, screener=None)
+
+    async def after_stream():
+        text = "".join([word async for word in _words(REPLY, args.token_ms)])
+        last_token = time.perf_counter()
+        await moderation.is_flagged_async(text)
+        return time.perf_counter() - last_token
+
+    async def incremental():
+        stream = ModeratedStream(_words(REPLY, args.token_ms), moderation)
+        async for _ in stream:
+            pass
+        return stream.verdict_delay, len(stream.chunks)
+
+    async def flagged():
+        reply = REPLY.replace("Tickets start", FLAGGED_SENTENCE + "Tickets start")
+        stream = ModeratedStream(_words(reply, args.token_ms), moderation)
+        shown = "".join([word async for word in stream])
+        return len(shown), reply.index(FLAGGED_SENTENCE), len(reply)
+
+    async def run():
+        serial = [await after_stream() for _ in range(args.runs)]
+        chunked = [await incremental() for _ in range(args.runs)]
+        stopped = await flagged()
+        return serial, chunked, stopped
+
+    serial, chunked, (shown, flagged_at, total) = asyncio.run(run())
+    print(f"Reply of {len(REPLY)} chars, {args.token_ms:g} ms per word, moderation {args.moderation_ms:g} ms")
+    print(f"Moderate after the stream:  verdict {min(serial) * 1000:.1f} ms after the last token")
+    print(f"Moderate while streaming:   verdict {min(d for d, _ in chunked) * 1000:.1f} ms after the last token "
+          f"({chunked[0][1]} chunks)")
+    print(f"Flagged sentence at char {flagged_at} of {total}: stream stopped after {shown} chars")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark of the category taxonomy and agent startup.
+
+Reports the time to load the taxonomy by compiling the source JSON and from
+the cached artifact, the memory held by the shared taxonomy, and the time and
+retained memory of constructing one EventAgent (one chat session).
+
+Usage:
+    python benchmarks/bench_taxonomy.py [--sessions N] [--repeat N]
+"""
+
+import argparse
+import gc
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to Python path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("SWAGGER_API_KEY", "benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from agents.event_agent import EventAgent
+from services.taxonomy import Taxonomy
+
+
+def median_ms(build, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        build()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / "taxonomy.pickle"
+        compile_ms = median_ms(lambda: Taxonomy.load(cache_path=None), args.repeat)
+        Taxonomy.load(cache_path=cache_path)
+        cached_ms = median_ms(lambda: Taxonomy.load(cache_path=cache_path), args.repeat)
+        artifact_kib = cache_path.stat().st_size / 1024
+
+        gc.collect()
+        tracemalloc.start()
+        taxonomy = Taxonomy.load(cache_path=cache_path)
+        taxonomy_kib = tracemalloc.get_traced_memory()[0] / 1024
+        tracemalloc.stop()
+
+    print(f"Taxonomy load, compiling the source: {compile_ms:.2f} ms")
+    print(f"Taxonomy load, from the artifact:    {cached_ms:.2f} ms ({artifact_kib:.0f} KiB on disk)")
+    print(f"Shared taxonomy in memory:           {taxonomy_kib:.0f} KiB")
+
+    EventAgent()  # warm up imports and process-wide caches
+    session_ms = median_ms(EventAgent, args.repeat)
+    gc.collect()
+    tracemalloc.start()
+    sessions = [EventAgent() for _ in range(args.sessions)]
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"EventAgent construction:             {session_ms:.2f} ms")
+    print(f"Retained per session:                {retained / len(sessions) / 1024:.1f} KiB "
+          f"(peak while building {args.sessions}: {peak / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
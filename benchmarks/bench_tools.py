@@ -0,0 +1,65 @@
+"""
+Benchmark of tool startup: what each declared tool costs to set up.
+
+For every tool of the event agent, reports the time to load its schema from
+tools/descriptions (cold, then cached), the time to construct it for the
+first and for later sessions, and the estimated tokens its schema adds to
+every request. Also reports the cost of creating a session's tool view.
+
+Usage:
+    python benchmarks/bench_tools.py [--sessions N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from dataclasses import replace
+
+# Add project root to Python path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+os.environ.setdefault("SWAGGER_API_KEY", "benchmark")
+os.environ.setdefault("TICKETMASTER_API_KEY", "benchmark")
+
+from agents.event_agent import EVENT_AGENT_TOOLS
+from tools.registry import ToolRegistry, load_tool_description
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=20)
+    args = parser.parse_args()
+
+    # A registry with every declared tool enabled, so all of them are measured
+    specs = [replace(spec, enabled=True) for spec in EVENT_AGENT_TOOLS.specs]
+    load_tool_description.cache_clear()
+    registry = ToolRegistry(specs)
+    registry.schemas
+
+    cached_schema_us = {}
+    for spec in specs:
+        started = time.perf_counter()
+        load_tool_description(spec.description_file)
+        cached_schema_us[spec.name] = (time.perf_counter() - started) * 1e6
+
+    for _ in range(args.sessions):
+        for spec in specs:
+            registry.create(spec.name)
+
+    print(f"{'tool':<36}{'schema cold':>12}{'cached':>10}{'first init':>12}{'later init':>12}{'tokens':>8}")
+    for name, cost in registry.startup_report().items():
+        print(f"{name:<36}{cost['schema_ms']:>9.3f} ms{cached_schema_us[name]:>7.1f} us"
+              f"{cost['first_init_ms']:>9.3f} ms{cost['last_init_ms']:>9.3f} ms{cost['schema_tokens']:>8}")
+
+    timings = []
+    for _ in range(args.sessions):
+        started = time.perf_counter()
+        EVENT_AGENT_TOOLS.view(search_events={"preferences_provider": None})
+        timings.append(time.perf_counter() - started)
+    print(f"Session tool view: {statistics.median(timings) * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -59,3 +59,25 @@ def get_moderation_api_key() -> Optional[str]:
         api_key = get_openai_api_key()
     
     return api_key
+
+def get_llm_cache_path() -> Optional[str]:
+    """
+    Get the path of the on-disk LLM completion cache from environment variables or config.
+    Returns None when the cache is not enabled.
+    """
+    path = os.environ.get("LLM_CACHE_PATH")
+    if not path and "LLM_CACHE_PATH" in CONFIG:
+        path = CONFIG["LLM_CACHE_PATH"]
+        warnings.warn("Using LLM_CACHE_PATH from config.py instead of environment variable", UserWarning)
+    return path or None
+
+def get_speculative_moderation() -> bool:
+    """
+    Whether the agent turn starts while the user message is still being moderated.
+    Enabled unless SPECULATIVE_MODERATION is set to 0, false or off.
+    """
+    value = os.environ.get("SPECULATIVE_MODERATION")
+    if value is None and "SPECULATIVE_MODERATION" in CONFIG:
+        value = str(CONFIG["SPECULATIVE_MODERATION"])
+        warnings.warn("Using SPECULATIVE_MODERATION from config.py instead of environment variable", UserWarning)
+    return (value or "1").strip().lower() not in ("0", "false", "off")
@@ -1,8 +1,12 @@
 import streamlit as st
 from agents.event_agent import EventAgent
+from agents.shared_resources import get_shared_resources
 from structs.context import Context
 from structs.message import Message
-from services.moderation_service import ModerationService
+from services.async_runner import run_sync
+from services.stream_moderation import ModeratedStream
+from services.usage_tracker import prompt_cache_stats
+from env_config import get_speculative_moderation
 from dotenv import load_dotenv
 import os
 import logging
@@ -18,21 +22,44 @@ st.set_page_config(page_title="Event Chat", page_icon=":speech_balloon:")
 
 st.title("Event Chat")
 
+# Clients, pools, the moderation service and other immutable resources are created
+# once per process; each session only holds its own conversation state
+resources = get_shared_resources()
+moderation_service = resources.moderation_service
+# Start the agent turn while the user message is being moderated
+speculative_moderation = get_speculative_moderation()
+
+FLAGGED_INPUT_RESPONSE = ("I'm sorry, but I can't respond to that message as it may contain inappropriate content. "
+                          "Please try a different request.")
+FLAGGED_RESPONSE = "I apologize, but I can't provide that information. Let me know if I can help with something else."
+
 if "agent" not in st.session_state:
-    st.session_state.agent = EventAgent()
+    st.session_state.agent = EventAgent(resources=resources)
 if "context" not in st.session_state:
     st.session_state.context = Context()
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
 if "user_input" not in st.session_state:
     st.session_state.user_input = ""
-if "moderation_service" not in st.session_state:
+if "pending_input" not in st.session_state:
+    st.session_state.pending_input = None
+if "last_turn_metrics" not in st.session_state:
+    st.session_state.last_turn_metrics = None
+
+async def admit_message(user_input: str) -> bool:
+    """Moderate a user message; returns False if it was flagged."""
     try:
-        st.session_state.moderation_service = ModerationService()
-        logger.info("Moderation service initialized successfully")
+        if not await moderation_service.is_flagged_async(user_input):
+            return True
+        # Get detailed information about flagged categories (served from the verdict cache)
+        flagged_categories = await moderation_service.get_flagged_categories_async(user_input)
+        categories_str = ", ".join(flagged_categories.get(user_input, []))
+        logger.warning(f"User message flagged by moderation API. Categories: {categories_str}")
+        return False
     except Exception as e:
-        logger.error(f"Failed to initialize moderation service: {e}")
-        st.session_state.moderation_service = None
+        logger.error(f"Error during content moderation: {e}")
+        # Continue with message processing if moderation fails
+        return True
 
 def send_message():
     user_input = st.session_state.user_input.strip()
@@ -41,46 +68,54 @@ def send_message():
     if not user_input:
         return
         
-    # Check moderation if service is available
-    content_flagged = False
-    if st.session_state.moderation_service:
-        try:
-            content_flagged = st.session_state.moderation_service.is_flagged(user_input)
-            if content_flagged:
-                # Get detailed information about flagged categories
-                flagged_categories = st.session_state.moderation_service.get_flagged_categories(user_input)
-                categories_str = ", ".join(flagged_categories.get(user_input, []))
-                logger.warning(f"User message flagged by moderation API. Categories: {categories_str}")
-                
-                # Add user message to history but respond with moderation message
-                st.session_state.chat_history.append(("You", user_input))
-                st.session_state.chat_history.append(("Assistant", "I'm sorry, but I can't respond to that message as it may contain inappropriate content. Please try a different request."))
-                st.session_state.user_input = ""
-                return
-        except Exception as e:
-            logger.error(f"Error during content moderation: {e}")
-            # Continue with message processing if moderation fails
+    # Without speculation, moderate before the turn starts
+    if moderation_service and not speculative_moderation and not run_sync(admit_message(user_input)):
+        # Add user message to history but respond with moderation message
+        st.session_state.chat_history.append(("You", user_input))
+        st.session_state.chat_history.append(("Assistant", FLAGGED_INPUT_RESPONSE))
+        st.session_state.user_input = ""
+        return
     
-    # Process message normally if not flagged
+    # Queue the message; the agent turn is streamed while the page renders
+    st.session_state.pending_input = user_input
+    st.session_state.user_input = ""
+
+def stream_pending_message():
+    """Run the agent on the pending message, rendering tokens as they arrive"""
+    user_input = st.session_state.pending_input
+    st.session_state.pending_input = None
+
+    st.markdown(f"**You:** {user_input}")
+    placeholder = st.empty()
     user_message = Message(role="user", content=user_input)
-    result = st.session_state.agent.process(user_message, st.session_state.context)
-    st.session_state.context = result["context"]
-    response = result["response"]
-    
-    # Optionally check the response with moderation API as well
-    response_flagged = False
-    if st.session_state.moderation_service:
-        try:
-            response_flagged = st.session_state.moderation_service.is_flagged(response)
-            if response_flagged:
-                logger.warning("Assistant response flagged by moderation API")
-                response = "I apologize, but I can't provide that information. Let me know if I can help with something else."
-        except Exception as e:
-            logger.error(f"Error during response moderation: {e}")
+    # Speculatively, the turn runs alongside moderation; its output, context and memory
+    # changes are held back until the message is admitted, and discarded if it is flagged
+    admission = admit_message(user_input) if moderation_service and speculative_moderation else None
+    turn = st.session_state.agent.process_stream(user_message, st.session_state.context, admission)
+    # The response is moderated sentence by sentence while it streams, and stopped if flagged;
+    # a flagged response is kept out of the context and the memory
+    stream = ModeratedStream(turn, moderation_service) if moderation_service else None
+    if stream:
+        turn.review = stream.verdict
+    with placeholder.container():
+        st.markdown("**Assistant:**")
+        st.write_stream(stream or turn)
+    st.session_state.context = turn.context
+    st.session_state.last_turn_metrics = turn.metrics()
+    if turn.rejected:
+        placeholder.markdown(f"**Assistant:** {FLAGGED_INPUT_RESPONSE}")
+        st.session_state.chat_history.append(("You", user_input))
+        st.session_state.chat_history.append(("Assistant", FLAGGED_INPUT_RESPONSE))
+        return
+    response = turn.response
+    if stream:
+        st.session_state.last_turn_metrics["moderation"] = stream.metrics()
+        if stream.flagged:
+            response = FLAGGED_RESPONSE
+            placeholder.markdown(f"**Assistant:** {response}")
     
     st.session_state.chat_history.append(("You", user_input))
     st.session_state.chat_history.append(("Assistant", response))
-    st.session_state.user_input = ""
 
 st.text_input("You:", key="user_input", on_change=send_message)
 
@@ -91,21 +126,39 @@ for role, msg in st.session_state.chat_history:
     else:
         st.markdown(f"**Assistant:** {msg}")
 
+if st.session_state.pending_input:
+    stream_pending_message()
+
 # Add a memory viewer in the sidebar if there are messages
 if st.session_state.agent and hasattr(st.session_state.agent, "memory_agent"):
     with st.sidebar:
         summary = st.session_state.agent.memory.get_summary()
         st.subheader("Memory Summary")
         st.write(summary)
+
+        if st.session_state.last_turn_metrics:
+            st.subheader("Last Turn Latency")
+            st.json(st.session_state.last_turn_metrics)
+
+        with st.expander("Prompt Cache", expanded=False):
+            st.json(prompt_cache_stats.summary())
+            if st.session_state.agent.completion_cache:
+                st.caption("Completion cache")
+                st.json(st.session_state.agent.completion_cache.stats())
+
+        with st.expander("HTTP Pool", expanded=False):
+            st.json(resources.http_client.stats())
         
         # Add moderation debug section (hidden by default)
         with st.expander("Moderation Debug", expanded=False):
             st.caption("Analyze content with OpenAI Moderation API")
+            if moderation_service:
+                st.json(moderation_service.stats())
             debug_input = st.text_area("Enter text to check:")
             
-            if st.button("Check Content") and debug_input and st.session_state.moderation_service:
+            if st.button("Check Content") and debug_input and moderation_service:
                 try:
-                    analysis = st.session_state.moderation_service.get_moderation_analysis(debug_input)
+                    analysis = moderation_service.get_moderation_analysis(debug_input)
                     st.json(analysis)
                 except Exception as e:
                     st.error(f"Error analyzing content: {e}")
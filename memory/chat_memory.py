@@ -1,15 +1,28 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from memory.base_memory import BaseMemory
 from structs.message import Message
 from datetime import datetime
 from tools.today_date import TodayDateTool
+from memory.preferences import UserPreferences, infer_preferences
+from services.taxonomy import get_taxonomy
 import json
+import threading
 
 class ChatMemory(BaseMemory):
     def __init__(self):
         self.messages: List[Message] = []
+        # Transcript lines ("User: ..." / "Assistant: ..."), one per message, built as messages arrive
+        self._lines: List[str] = []
+        self._memory_str: Optional[str] = None
+        # Number of messages already covered by the current summary
+        self.summarized_upto = 0
+        self._lock = threading.Lock()
         today_date = TodayDateTool().run({})
         self.summary = f"Today's date: {today_date}.\nNo summary available."
+        # Explicitly stated preferences, merged with the ones inferred from the conversation
+        self.user_preferences = UserPreferences()
+        self._preferences: Optional[UserPreferences] = None
+        self._user_texts: List[str] = []
     
 
     def add_message(self, message: Message, response: str) -> None:
@@ -18,21 +31,33 @@ class ChatMemory(BaseMemory):
             today = datetime.now().strftime('%Y-%m-%d')
             user_msg = Message(role="user", content=f"[{today}] {message.content}")
             assistant_msg = Message(role="assistant", content=response)
-            self.messages.append(user_msg)
-            self.messages.append(assistant_msg)
+            with self._lock:
+                self.messages.append(user_msg)
+                self.messages.append(assistant_msg)
+                self._lines.append(f"User: {user_msg.content}")
+                self._lines.append(f"Assistant: {assistant_msg.content}")
+                self._user_texts.append(message.content)
+                self._memory_str = None
+                self._preferences = None
 
 
     def get_memory(self) -> str:
         """Get the conversation memory as a string"""
-        if not self.messages:
-            return "No conversation history available."
-        memory_str = ""
-        for message in self.messages:
-            if message.role == "user":
-                memory_str += f"User: {message.content}\n"
-            elif message.role == "assistant":
-                memory_str += f"Assistant: {message.content}\n"
-        return memory_str.strip() if memory_str else "No conversation history available."
+        with self._lock:
+            if self._memory_str is None:
+                memory_str = "\n".join(self._lines).strip()
+                self._memory_str = memory_str if memory_str else "No conversation history available."
+            return self._memory_str
+
+    def get_new_memory(self) -> Tuple[str, int]:
+        """
+        Get the messages not yet covered by the summary as a string.
+        Returns the string (empty if there is nothing new) and the watermark it extends to,
+        which should be passed to update_summary once the new summary is produced.
+        """
+        with self._lock:
+            upto = len(self._lines)
+            return "\n".join(self._lines[self.summarized_upto:upto]).strip(), upto
             
     def get_messages(self):
         """Get the raw messages from memory"""
@@ -40,13 +65,38 @@ class ChatMemory(BaseMemory):
     
     def clear(self) -> None:
         """Clear the memory"""
-        self.messages = []
-        self.user_preferences = {}
+        with self._lock:
+            self.messages = []
+            self._lines = []
+            self._memory_str = None
+            self.summarized_upto = 0
+            self._user_texts = []
+            self._preferences = None
+        self.user_preferences = UserPreferences()
+    
+    def get_preferences(self) -> UserPreferences:
+        """
+        Get the user's event preferences: genres mentioned by the user or in the
+        summary, merged with the explicitly set `user_preferences`.
+        """
+        with self._lock:
+            preferences = self._preferences
+            if preferences is None:
+                texts = self._user_texts + [self.summary]
+                preferences = self._preferences = infer_preferences(texts, get_taxonomy())
+        return preferences.merged(self.user_preferences)
     
     def get_summary(self) -> str:
         """Get the current summary of the conversation"""
         return self.summary
 
-    def update_summary(self, summary: str) -> None:
-        """Update the summary of the conversation"""
-        self.summary = summary
+    def update_summary(self, summary: str, summarized_upto: Optional[int] = None) -> None:
+        """
+        Update the summary of the conversation.
+        If summarized_upto is given, the watermark moves forward to that many messages.
+        """
+        with self._lock:
+            self.summary = summary
+            self._preferences = None
+            if summarized_upto is not None and summarized_upto > self.summarized_upto:
+                self.summarized_upto = min(summarized_upto, len(self._lines))
@@ -0,0 +1,67 @@
+"""
+User preferences inferred from the conversation.
+
+Preferences are genres and cities with weights in [0, 1]. Genres are found by
+matching the category names of the taxonomy in what the user said and in the
+memory summary; explicit preferences can be set on the memory as well.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable
+
+from services.taxonomy import Taxonomy, normalize_name
+
+# Category names too generic to say anything about the user's taste
+_GENERIC_NAMES = frozenset({"undefined", "other", "miscellaneous", "music", "sports", "film", "arts & theatre"})
+
+
+@dataclass
+class UserPreferences:
+    """Genres and cities a user prefers, with weights in [0, 1]."""
+    genres: Dict[str, float] = field(default_factory=dict)
+    cities: Dict[str, float] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.genres or self.cities)
+
+    def merged(self, other: "UserPreferences") -> "UserPreferences":
+        """Preferences of both, keeping the higher weight for names in both."""
+        genres, cities = dict(self.genres), dict(self.cities)
+        for target, source in ((genres, other.genres), (cities, other.cities)):
+            for name, weight in source.items():
+                target[name] = max(weight, target.get(name, 0.0))
+        return UserPreferences(genres=genres, cities=cities)
+
+
+_genre_patterns: Dict[int, "re.Pattern[str]"] = {}
+
+
+def _genre_pattern(taxonomy: Taxonomy) -> "re.Pattern[str]":
+    """Regex matching any specific category name of the taxonomy as a whole word."""
+    pattern = _genre_patterns.get(id(taxonomy))
+    if pattern is None:
+        names = {normalize_name(name) for name in list(taxonomy.genres) + list(taxonomy.subgenres)}
+        names -= _GENERIC_NAMES
+        # Longest first, so "alternative rock" wins over "rock"
+        alternatives = "|".join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+        pattern = _genre_patterns[id(taxonomy)] = re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)")
+    return pattern
+
+
+def infer_preferences(texts: Iterable[str], taxonomy: Taxonomy) -> UserPreferences:
+    """
+    Infer genre preferences from conversation text.
+
+    Each genre's weight is its number of mentions relative to the most
+    mentioned genre.
+    """
+    pattern = _genre_pattern(taxonomy)
+    mentions: Counter = Counter()
+    for text in texts:
+        mentions.update(pattern.findall(normalize_name(text)))
+    if not mentions:
+        return UserPreferences()
+    most = max(mentions.values())
+    return UserPreferences(genres={name: count / most for name, count in mentions.items()})
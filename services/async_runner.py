@@ -0,0 +1,103 @@
+"""
+Async runner.
+
+The application's agents, tools and services are asyncio-native. This module
+lets the synchronous API wrap them thinly: coroutines are executed on a single
+process-wide event loop that runs in a background daemon thread, so blocking
+callers (such as the Streamlit script thread) can use them without creating a
+new event loop per call.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, AsyncIterator, Awaitable, Callable, Generic, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Get the background event loop, starting it on first use."""
+    global _loop, _loop_thread
+    if _loop is not None:
+        return _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="async-runner", daemon=True)
+            thread.start()
+            _loop, _loop_thread = loop, thread
+    return _loop
+
+
+def run_sync(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """
+    Run a coroutine on the background event loop and wait for its result.
+
+    Args:
+        coro: The coroutine to run
+        timeout: Optional number of seconds to wait for the result
+
+    Returns:
+        The coroutine's result
+
+    Raises:
+        RuntimeError: If called from the background loop itself, which would deadlock
+    """
+    loop = get_loop()
+    if threading.current_thread() is _loop_thread:
+        raise RuntimeError("run_sync() cannot be called from the async runner thread; await the coroutine instead")
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    return future.result(timeout)
+
+
+def iterate_sync(agen: AsyncIterator[T]) -> Iterator[T]:
+    """Iterate an async iterator from synchronous code using the background event loop."""
+    finished = False
+    try:
+        while True:
+            try:
+                yield run_sync(agen.__anext__())
+            except StopAsyncIteration:
+                finished = True
+                return
+    finally:
+        aclose = getattr(agen, "aclose", None)
+        if not finished and aclose is not None:
+            run_sync(aclose())
+
+
+class LoopLocal(Generic[T]):
+    """
+    Lazily created, per-event-loop instances of an object.
+
+    Async clients (httpx, AsyncOpenAI) hold connections bound to the event loop
+    that created them. LoopLocal hands out one instance per running loop, so the
+    same service can be used both from the background loop (sync wrappers) and
+    from an application's own event loop.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._instances: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, T]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """Get the instance for the running event loop."""
+        loop = asyncio.get_running_loop()
+        instance = self._instances.get(loop)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(loop)
+                if instance is None:
+                    instance = self._factory()
+                    self._instances[loop] = instance
+        return instance
+
+    def set(self, instance: Any, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Override the instance used on a loop (defaults to the background loop)."""
+        self._instances[loop or get_loop()] = instance
@@ -0,0 +1,315 @@
+"""
+Completion Cache
+
+An opt-in, disk-backed cache for chat completion responses. Requests are keyed
+by a canonical hash of the request payload (model, messages, tools, ...), so a
+payload that was already answered -- reruns, retries, replayed test
+conversations -- is served from a local SQLite store instead of a new round
+trip. The store is bounded by entry count and size with LRU eviction, and
+entries expire after a TTL.
+
+Streamed requests share the cache with non-streamed ones: a streamed
+completion is stored once it has been received completely, and a cached
+completion is replayed to a streaming caller as chunks.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+from env_config import get_llm_cache_path
+from services.usage_tracker import prompt_cache_stats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+# Request options that change how a completion is delivered, not what it contains
+STREAM_OPTIONS = ("stream", "stream_options")
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """Canonical hash of a completion request: key order and whitespace do not matter."""
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """SQLite-backed LRU cache of serialized chat completions with a TTL."""
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float = DEFAULT_TTL_SECONDS,
+    ):
+        """
+        Args:
+            path: Location of the SQLite database file
+            max_entries: Maximum number of cached completions
+            max_bytes: Maximum total size of the cached payloads
+            ttl: Seconds after which an entry expires
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS completions_accessed ON completions (accessed)")
+
+    def get(self, key: str) -> Optional[str]:
+        """Get the cached payload for a key, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    with self._conn:
+                        self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE completions SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """Store a payload and evict expired and least recently used entries over the bounds."""
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._conn.execute("DELETE FROM completions WHERE created < ?", (now - self.ttl,))
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions").fetchone()
+            while count > self.max_entries or total > self.max_bytes:
+                row = self._conn.execute(
+                    "SELECT key, size FROM completions ORDER BY accessed ASC LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    break
+                self._conn.execute("DELETE FROM completions WHERE key = ?", (row[0],))
+                count -= 1
+                total -= row[1]
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all cached completions."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM completions")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and the current size of the store."""
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": count,
+            "bytes": total,
+        }
+
+
+async def create_chat_completion(client: Any, cache: Optional[CompletionCache], usage_source: str,
+                                 **request: Any) -> Any:
+    """
+    Call `client.chat.completions.create(**request)` through the cache.
+
+    Token usage of completions that actually reach the API is recorded in the
+    prompt cache statistics; completions served from this cache are not.
+    Streamed requests bypass the cache here; use stream_chat_completion for them.
+
+    Args:
+        client: AsyncOpenAI client
+        cache: The completion cache, or None to always call the API
+        usage_source: Name of the caller for usage statistics
+        **request: Keyword arguments of the completion request
+
+    Returns:
+        ChatCompletion: The cached or freshly created completion
+    """
+    if cache is None or request.get("stream"):
+        completion = await client.chat.completions.create(**request)
+        prompt_cache_stats.record(getattr(completion, "usage", None), source=usage_source, model=request.get("model", ""))
+        return completion
+
+    key = request_key(request)
+    payload = await asyncio.to_thread(cache.get, key)
+    if payload is not None:
+        try:
+            return ChatCompletion.model_validate_json(payload)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cached completion: {e}")
+
+    completion = await client.chat.completions.create(**request)
+    prompt_cache_stats.record(getattr(completion, "usage", None), source=usage_source, model=request.get("model", ""))
+    try:
+        await asyncio.to_thread(cache.put, key, completion.model_dump_json())
+    except Exception as e:
+        logger.warning(f"Could not cache completion: {e}")
+    return completion
+
+
+async def stream_chat_completion(client: Any, cache: Optional[CompletionCache], usage_source: str,
+                                 **request: Any) -> AsyncIterator[ChatCompletionChunk]:
+    """
+    Stream `client.chat.completions.create(**request, stream=True)` through the cache.
+
+    Streamed and non-streamed requests with the same payload share one entry.
+    On a hit the cached completion is replayed as chunks without calling the
+    API; on a miss the chunks are passed through as they arrive and the
+    completion is stored once the stream has been received completely.
+
+    Args:
+        client: AsyncOpenAI client
+        cache: The completion cache, or None to always call the API
+        usage_source: Name of the caller for usage statistics
+        **request: Keyword arguments of the completion request
+
+    Yields:
+        ChatCompletionChunk: The chunks of the completion
+    """
+    model = request.get("model", "")
+    key = request_key({name: value for name, value in request.items() if name not in STREAM_OPTIONS})
+    if cache is not None:
+        payload = await asyncio.to_thread(cache.get, key)
+        if payload is not None:
+            try:
+                completion = ChatCompletion.model_validate_json(payload)
+            except Exception as e:
+                logger.warning(f"Discarding unreadable cached completion: {e}")
+            else:
+                for chunk in _completion_chunks(completion):
+                    yield chunk
+                return
+
+    request = {**request, "stream": True, "stream_options": {"include_usage": True}}
+    stream = await client.chat.completions.create(**request)
+    collected = _StreamedCompletion()
+    async for chunk in stream:
+        if getattr(chunk, "usage", None) is not None:
+            prompt_cache_stats.record(chunk.usage, source=usage_source, model=model)
+        collected.add(chunk)
+        yield chunk
+
+    if cache is not None:
+        try:
+            await asyncio.to_thread(cache.put, key, collected.completion().model_dump_json())
+        except Exception as e:
+            logger.warning(f"Could not cache completion: {e}")
+
+
+class _StreamedCompletion:
+    """Collects the chunks of a streamed completion into a complete ChatCompletion."""
+
+    def __init__(self):
+        self.chunk: Optional[ChatCompletionChunk] = None
+        self.content: List[str] = []
+        self.tool_calls: Dict[int, Dict[str, Any]] = {}
+        self.finish_reason: Optional[str] = None
+        self.usage: Any = None
+
+    def add(self, chunk: ChatCompletionChunk) -> None:
+        self.chunk = self.chunk or chunk
+        if getattr(chunk, "usage", None) is not None:
+            self.usage = chunk.usage
+        if not chunk.choices:
+            return
+        choice = chunk.choices[0]
+        self.finish_reason = choice.finish_reason or self.finish_reason
+        delta = choice.delta
+        if delta.content:
+            self.content.append(delta.content)
+        for call in delta.tool_calls or []:
+            merged = self.tool_calls.setdefault(
+                call.index, {"id": "", "type": "function", "function": {"name": "", "arguments": ""}})
+            if call.id:
+                merged["id"] = call.id
+            if call.function is not None:
+                merged["function"]["name"] += call.function.name or ""
+                merged["function"]["arguments"] += call.function.arguments or ""
+
+    def completion(self) -> ChatCompletion:
+        message: Dict[str, Any] = {"role": "assistant", "content": "".join(self.content) or None}
+        if self.tool_calls:
+            message["tool_calls"] = [call for _, call in sorted(self.tool_calls.items())]
+        return ChatCompletion.model_validate({
+            "id": self.chunk.id if self.chunk else "",
+            "object": "chat.completion",
+            "created": self.chunk.created if self.chunk else 0,
+            "model": self.chunk.model if self.chunk else "",
+            "choices": [{"index": 0, "message": message,
+                         "finish_reason": self.finish_reason or ("tool_calls" if self.tool_calls else "stop")}],
+            "usage": self.usage.model_dump() if self.usage is not None else None,
+        })
+
+
+def _completion_chunks(completion: ChatCompletion) -> List[ChatCompletionChunk]:
+    """A cached completion as the single chunk a stream of it would add up to."""
+    message = completion.choices[0].message
+    delta: Dict[str, Any] = {"role": "assistant", "content": message.content}
+    if message.tool_calls:
+        delta["tool_calls"] = [
+            {"index": index, "id": call.id, "type": "function",
+             "function": {"name": call.function.name, "arguments": call.function.arguments}}
+            for index, call in enumerate(message.tool_calls)
+        ]
+    return [ChatCompletionChunk.model_validate({
+        "id": completion.id,
+        "object": "chat.completion.chunk",
+        "created": completion.created,
+        "model": completion.model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": completion.choices[0].finish_reason}],
+    })]
+
+
+_default_cache: Optional[CompletionCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_completion_cache() -> Optional[CompletionCache]:
+    """
+    Get the process-wide completion cache configured by LLM_CACHE_PATH,
+    or None if caching is not enabled.
+    """
+    global _default_cache
+    path = get_llm_cache_path()
+    if not path:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None or _default_cache.path != path:
+            _default_cache = CompletionCache(path)
+    return _default_cache
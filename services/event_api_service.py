@@ -2,125 +2,384 @@
 Event API Service
 
 This module provides a service for interacting with the event search API.
-It uses Pydantic models for request and response validation.
+It uses the Pydantic models of services.event_models for request and
+response validation.
 """
 
-import requests
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, field_validator
+import asyncio
+import logging
+import httpx
+from typing import List, Optional, Dict, Any, AsyncIterator, Hashable, Iterator, Sequence, Set, Tuple
 from datetime import datetime
+from functools import lru_cache
 from env_config import get_swagger_api_key
+from services.event_models import (
+    Venue, EventDate, EventImage, Event, EventSearchResponse, EventSearchParams
+)
+from services.async_runner import run_sync, iterate_sync
+from services.ttl_cache import TTLCache
+from services.http_client import HttpClient, get_http_client
+from services.json_stream import JsonArrayStreamDecoder
+from services.event_store import EventRecord, EventStore, event_record
+from services.event_encoder import DEFAULT_TOKEN_BUDGET, encode_events
+
+logger = logging.getLogger(__name__)
 
 BASE_URL = "https://event-search-staging.thrugo.com/api/events"
+REQUEST_TIMEOUT = 10
+# Number of pages fetched ahead of the page being consumed by iter_events
+DEFAULT_PREFETCH_PAGES = 2
+# Response fields that may hold the list of events, in order of preference
+EVENT_ARRAY_KEYS = ("events", "items")
 
-class Venue(BaseModel):
-    """Venue information for an event."""
-    name: str = Field(..., description="Name of the venue")
-    city: Optional[str] = Field(None, description="City where the venue is located")
-    country: Optional[str] = Field(None, description="Country where the venue is located")
-    country_code: Optional[str] = Field(None, description="ISO country code")
-    address: Optional[str] = Field(None, description="Full address of the venue")
-
-class EventDate(BaseModel):
-    """Date and time information for an event."""
-    start_date: str = Field(..., description="Start date of the event (ISO format)")
-    start_time: Optional[str] = Field(None, description="Start time of the event")
-    end_date: Optional[str] = Field(None, description="End date of the event (ISO format)")
-    end_time: Optional[str] = Field(None, description="End time of the event")
-    
-    @field_validator('start_date', 'end_date', mode='before')
-    @classmethod
-    def validate_date_format(cls, v):
-        if v:
-            try:
-                datetime.fromisoformat(v.replace('Z', '+00:00'))
-            except ValueError:
-                raise ValueError(f"Invalid date format: {v}. Expected ISO format (YYYY-MM-DD).")
-        return v
-
-class EventImage(BaseModel):
-    """Image information for an event."""
-    url: str = Field(..., description="URL of the event image")
-    alt: Optional[str] = Field(None, description="Alternative text for the image")
-
-class Event(BaseModel):
-    """Detailed event information."""
-    id: str = Field(..., description="Unique identifier for the event")
-    name: str = Field(..., description="Name of the event")
-    description: Optional[str] = Field(None, description="Description of the event")
-    url: Optional[str] = Field(None, description="URL for event details or ticketing")
-    dates: EventDate = Field(..., description="Date and time information")
-    venues: List[Venue] = Field(default_factory=list, description="List of venues")
-    images: List[EventImage] = Field(default_factory=list, description="List of event images")
-    genre: Optional[str] = Field(None, description="Genre of the event")
-    
-    def format_summary(self) -> str:
-        """Format the event as a summary string."""
-        venue_str = ""
-        if self.venues and len(self.venues) > 0:
-            venue = self.venues[0]
-            venue_parts = [venue.name]
-            if venue.city:
-                venue_parts.append(venue.city)
-            if venue.country:
-                venue_parts.append(venue.country)
-            venue_str = ", ".join(venue_parts)
+# --- Response parsing -------------------------------------------------------
+#
+# Two parsers build the same events from one item of the API response.
+# _parse_event_validated runs every object through Pydantic validation. The
+# fast path detects the response shape once per payload, checks field types
+# by hand and writes plain records (services.event_store.EventRecord) that
+# the EventStore keeps as is; models are only built when an event is
+# accessed. Items it does not recognize go through the validated path,
+# so both parsers always return equal results.
+
+# How event dates are laid out in a response
+_DATES_ISO = "startDateTime"
+_DATES_NESTED = "dates"
+_DATES_NONE = None
+
+
+class _NotFastPath(Exception):
+    """Raised by the fast parser for items it leaves to the validated parser."""
+
+
+def _find_events_list(data: Dict[str, Any]) -> Optional[List[Any]]:
+    """The list of raw events in a response, or None if there is none."""
+    for key in EVENT_ARRAY_KEYS:
+        if isinstance(data.get(key), list):
+            return data[key]
+    return None
+
+
+def _parse_event_validated(event_data: Dict[str, Any]) -> Optional[Event]:
+    """Build a validated Event from one raw item, or None if it cannot be processed."""
+    try:
+        # Extract venue data
+        venues = []
+        venue_list = event_data.get("venues", [])
+        if venue_list and isinstance(venue_list, list):
+            for venue_data in venue_list:
+                if isinstance(venue_data, dict):
+                    # Handle full venue object
+                    venues.append(Venue(
+                        name=venue_data.get("name", "Unknown Venue"),
+                        city=venue_data.get("city", {}).get("name") if isinstance(venue_data.get("city"), dict) else venue_data.get("city"),
+                        country=venue_data.get("country", {}).get("name") if isinstance(venue_data.get("country"), dict) else venue_data.get("country"),
+                        country_code=venue_data.get("country", {}).get("countryCode") if isinstance(venue_data.get("country"), dict) else None,
+                        address=venue_data.get("address", {}).get("line1") if isinstance(venue_data.get("address"), dict) else venue_data.get("address")
+                    ))
+                elif isinstance(venue_data, str):
+                    # Handle venue as string
+                    venues.append(Venue(
+                        name=venue_data,
+                        city=None,
+                        country=None,
+                        country_code=None,
+                        address=None
+                    ))
+        
+        # Process dates
+        start_date = ""
+        start_time = None
+        end_date = None
+        end_time = None
         
-        date_str = self.dates.start_date
-        time_str = self.dates.start_time if self.dates.start_time else ""
+        if "startDateTime" in event_data:
+            iso_date = event_data.get("startDateTime", "")
+            if iso_date:
+                try:
+                    dt = datetime.fromisoformat(iso_date.replace('Z', '+00:00'))
+                    start_date = dt.strftime("%Y-%m-%d")
+                    start_time = dt.strftime("%H:%M:%S")
+                except ValueError:
+                    # If date format is not standard ISO, use as is
+                    start_date = iso_date
+        elif "dates" in event_data:
+            dates_data = event_data.get("dates", {})
+            if isinstance(dates_data, dict):
+                start_data = dates_data.get("start", {})
+                if isinstance(start_data, dict):
+                    start_date = start_data.get("localDate", "")
+                    start_time = start_data.get("localTime")
+                end_data = dates_data.get("end", {})
+                if isinstance(end_data, dict):
+                    end_date = end_data.get("localDate")
+                    end_time = end_data.get("localTime")
         
-        return f"{self.name} at {venue_str} on {date_str} {time_str} - {self.url or ''}"
-
-class EventSearchResponse(BaseModel):
-    """Response from the event search API."""
-    events: List[Event] = Field(default_factory=list, description="List of events")
-    total_count: int = Field(0, description="Total number of events found")
-    page: int = Field(1, description="Current page number")
-    page_size: int = Field(50, description="Number of events per page")
-    found_more_events: bool = Field(False, description="Indicates if there are more events available")
-
-class EventSearchParams(BaseModel):
-    """Parameters for searching events."""
-    eventGenre: Optional[str] = Field(None, description="Genre of the event (e.g., 'Sports - Football')")
-    eventLocationCity: Optional[str] = Field(None, description="City where the event takes place")
-    eventLocationCountryCode: Optional[str] = Field(None, description="ISO country code of the event location")
-    eventStartDate: Optional[str] = Field(None, description="Start date of the event in ISO format (yyyy-MM-dd)")
-    eventEndDate: Optional[str] = Field(None, description="End date of the event in ISO format (yyyy-MM-dd)")
-    eventName: Optional[str] = Field(None, description="Name of the event to search for")
-    pageSize: Optional[int] = Field(50, description="Number of results per page (Min: 1, Max: 200, Default: 50)")
+        # Create EventDate object
+        dates = EventDate(
+            start_date=start_date,
+            start_time=start_time,
+            end_date=end_date,
+            end_time=end_time
+        )
+        
+        # Process images
+        images = []
+        if "images" in event_data and isinstance(event_data.get("images"), list):
+            for image_data in event_data.get("images", []):
+                if isinstance(image_data, dict):
+                    images.append(EventImage(
+                        url=image_data.get("url", ""),
+                        alt=image_data.get("alt")
+                    ))
+        elif "image" in event_data and event_data.get("image"):
+            image_url = event_data.get("image")
+            if isinstance(image_url, str):
+                images.append(EventImage(url=image_url, alt=None))
+        
+        # Create Event object
+        return Event(
+            id=str(event_data.get("id", "")),
+            name=event_data.get("name", "Unknown Event"),
+            description=event_data.get("description"),
+            url=event_data.get("url"),
+            dates=dates,
+            venues=venues,
+            images=images,
+            genre=event_data.get("genre") or 
+                (event_data.get("classifications", [{}])[0].get("genre", {}).get("name") 
+                 if event_data.get("classifications") and len(event_data.get("classifications", [])) > 0 
+                 else None)
+        )
+    except Exception:
+        # Skip events that can't be processed
+        return None
+
+
+def _detect_date_shape(events_list: List[Any]) -> Optional[str]:
+    """Date layout of a payload, taken from the first item that has dates."""
+    for item in events_list:
+        if isinstance(item, dict):
+            if _DATES_ISO in item:
+                return _DATES_ISO
+            if _DATES_NESTED in item:
+                return _DATES_NESTED
+    return _DATES_NONE
+
+
+def _str(value: Any) -> str:
+    if type(value) is not str:
+        raise _NotFastPath
+    return value
+
+
+def _opt_str(value: Any) -> Optional[str]:
+    if value is not None and type(value) is not str:
+        raise _NotFastPath
+    return value
+
+
+@lru_cache(maxsize=4096)
+def _is_iso_date(value: str) -> bool:
+    try:
+        datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return True
+    except ValueError:
+        return False
+
+
+@lru_cache(maxsize=4096)
+def _split_iso_datetime(value: str) -> Tuple[str, str]:
+    """Date and time parts of an ISO datetime, as the validated parser formats them."""
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise _NotFastPath
+    if dt.year < 1000:
+        raise _NotFastPath
+    # Built from a parsed datetime, so already in valid ISO format
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}", f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+
+
+def _checked_date(value: Any) -> Optional[str]:
+    """An API-provided date string, checked the way EventDate validates it."""
+    if value and (type(value) is not str or not _is_iso_date(value)):
+        raise _NotFastPath
+    return value
+
+
+def _fast_venue(venue_data: Any) -> Optional[Tuple[Optional[str], ...]]:
+    if type(venue_data) is str:
+        return (venue_data, None, None, None, None)
+    if type(venue_data) is not dict:
+        return None
+    city = venue_data.get("city")
+    if type(city) is dict:
+        city = city.get("name")
+    country = venue_data.get("country")
+    country_code = None
+    if type(country) is dict:
+        country_code = country.get("countryCode")
+        country = country.get("name")
+    address = venue_data.get("address")
+    if type(address) is dict:
+        address = address.get("line1")
+    return (
+        _str(venue_data.get("name", "Unknown Venue")),
+        _opt_str(city),
+        _opt_str(country),
+        _opt_str(country_code),
+        _opt_str(address),
+    )
+
+
+def _fast_dates(event_data: Dict[str, Any],
+                date_shape: Optional[str]) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
+    start_date = ""
+    start_time = end_date = end_time = None
+    if date_shape is _DATES_ISO:
+        iso_date = event_data[_DATES_ISO]
+        if iso_date:
+            start_date, start_time = _split_iso_datetime(_str(iso_date))
+    elif date_shape is _DATES_NESTED:
+        dates_data = event_data[_DATES_NESTED]
+        if type(dates_data) is dict:
+            start_data = dates_data.get("start", {})
+            if type(start_data) is dict:
+                start_date = _str(_checked_date(start_data.get("localDate", "")))
+                start_time = _opt_str(start_data.get("localTime"))
+            end_data = dates_data.get("end", {})
+            if type(end_data) is dict:
+                end_date = _opt_str(_checked_date(end_data.get("localDate")))
+                end_time = _opt_str(end_data.get("localTime"))
+    return start_date, start_time, end_date, end_time
+
+
+def _fast_images(event_data: Dict[str, Any]) -> Tuple[Tuple[str, Optional[str]], ...]:
+    images = event_data.get("images")
+    if type(images) is list:
+        return tuple(
+            (_str(image.get("url", "")), _opt_str(image.get("alt")))
+            for image in images if type(image) is dict
+        )
+    image_url = event_data.get("image")
+    if image_url and type(image_url) is str:
+        return ((image_url, None),)
+    return ()
+
+
+def _fast_genre(event_data: Dict[str, Any]) -> Optional[str]:
+    genre = event_data.get("genre")
+    if genre:
+        return _opt_str(genre)
+    classifications = event_data.get("classifications")
+    if not classifications:
+        return None
+    if type(classifications) is not list or type(classifications[0]) is not dict:
+        raise _NotFastPath
+    genre = classifications[0].get("genre", {})
+    if type(genre) is not dict:
+        raise _NotFastPath
+    return _opt_str(genre.get("name"))
+
+
+def _parse_event_fast(event_data: Any, date_shape: Optional[str]) -> EventRecord:
+    """Build an event record without Pydantic. Raises _NotFastPath for unexpected items."""
+    if type(event_data) is not dict:
+        raise _NotFastPath
+    has_iso, has_nested = _DATES_ISO in event_data, _DATES_NESTED in event_data
+    if date_shape is _DATES_ISO:
+        if not has_iso:
+            raise _NotFastPath
+    elif has_iso or has_nested != (date_shape is _DATES_NESTED):
+        raise _NotFastPath
     
-    @field_validator('eventStartDate', 'eventEndDate', mode='before')
-    @classmethod
-    def validate_date_format(cls, v):
-        if v:
-            try:
-                datetime.strptime(v, "%Y-%m-%d")
-            except ValueError:
-                raise ValueError(f"Invalid date format: {v}. Expected format: YYYY-MM-DD")
-        return v
+    venues = []
+    venue_list = event_data.get("venues")
+    if venue_list:
+        if type(venue_list) is not list:
+            raise _NotFastPath
+        for venue_data in venue_list:
+            venue = _fast_venue(venue_data)
+            if venue is not None:
+                venues.append(venue)
     
-    @field_validator('pageSize')
-    @classmethod
-    def validate_page_size(cls, v):
-        if v is not None:
-            if v < 1:
-                return 1
-            if v > 200:
-                return 200
-        return v
+    start_date, start_time, end_date, end_time = _fast_dates(event_data, date_shape)
+    return (
+        str(event_data.get("id", "")),
+        _str(event_data.get("name", "Unknown Event")),
+        _opt_str(event_data.get("description")),
+        _opt_str(event_data.get("url")),
+        _fast_images(event_data),
+        start_date, start_time, end_date, end_time,
+        _fast_genre(event_data),
+        tuple(venues),
+    )
+
+
+def _parse_event(event_data: Any, date_shape: Optional[str]) -> Optional[EventRecord]:
+    """Parse one raw event on the fast path, falling back to the validated parser."""
+    try:
+        return _parse_event_fast(event_data, date_shape)
+    except Exception:
+        event = _parse_event_validated(event_data)
+        return event_record(event) if event is not None else None
+
+
+def _parse_events_fast(events_list: List[Any]) -> EventStore:
+    """Parse a page of raw events, detecting the date layout once for the whole page."""
+    date_shape = _detect_date_shape(events_list)
+    events = EventStore()
+    for event_data in events_list:
+        record = _parse_event(event_data, date_shape)
+        if record is not None:
+            events.append_record(record)
+    return events
+
+
+# Search results shared by every service instance (and so by every user)
+search_cache: TTLCache["EventSearchResponse"] = TTLCache(max_entries=256, max_bytes=32 * 1024 * 1024, ttl=300)
 
 class EventApiService:
     """Service for interacting with the event search API."""
     
-    def __init__(self, api_key: str = get_swagger_api_key()):
-        """Initialize the service with API key."""
+    def __init__(self, api_key: str = get_swagger_api_key(), cache: Optional[TTLCache] = search_cache,
+                 http_client: Optional[HttpClient] = None, fast_parse: bool = True,
+                 stream_responses: bool = True):
+        """
+        Initialize the service with API key.
+        
+        Args:
+            api_key: Key for the event search API
+            cache: Cache of parsed search responses keyed by normalized parameters;
+                   defaults to the process-wide cache, None disables caching
+            http_client: Pooled HTTP client; defaults to the process-wide one
+            fast_parse: Parse responses with the fast parser instead of validating
+                        every event through Pydantic
+            stream_responses: Decode response bodies incrementally as they arrive
+                              instead of buffering and decoding them whole
+        """
         self.api_key = api_key
         self.base_url = BASE_URL
+        self.cache = cache
+        self.http_client = http_client or get_http_client()
+        self.fast_parse = fast_parse
+        self.stream_responses = stream_responses
+        # Fire-and-forget prefetch tasks, referenced so they are not garbage collected
+        self._prefetch_tasks: Set[asyncio.Task] = set()
     
     def search_events(self, params: EventSearchParams) -> EventSearchResponse:
         """
         Search for events using the provided parameters.
         
+        Synchronous wrapper around search_events_async.
+        """
+        return run_sync(self.search_events_async(params))
+    
+    async def search_events_async(self, params: EventSearchParams) -> EventSearchResponse:
+        """
+        Search for events using the provided parameters.
+        
         Args:
             params: EventSearchParams object with search criteria
             
@@ -130,174 +389,231 @@ class EventApiService:
         Raises:
             ValueError: If the API request fails
         """
-        headers = {"X-API-Key": self.api_key}
+        cache_key = params.cache_key() if self.cache is not None else None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                # Cached responses are shared; callers must not modify them
+                return cached
         
-        # Convert Pydantic model to dict, excluding None values
         try:
-            params_dict = params.model_dump(exclude_none=True)
-        except AttributeError:
-            # Fallback for older Pydantic versions (pre v2.0)
-            params_dict = {k: v for k, v in params.__dict__.items() if v is not None}
-        
-        try:
-            response = requests.get(self.base_url, headers=headers, params=params_dict, timeout=10)
+            if self.stream_responses:
+                return await self._fetch_streamed(params, cache_key)
+            
+            response = await self.http_client.get(
+                self.base_url, headers=self._headers(), params=self._query_params(params), timeout=REQUEST_TIMEOUT
+            )
             response.raise_for_status()
             data = response.json()
             
-            events_data = self._extract_events_from_response(data)
+            events_response = self._build_response(params, data, self._extract_events_from_response(data))
+            if cache_key is not None:
+                self.cache.put(cache_key, events_response, size=len(response.content))
+            return events_response
             
-            return EventSearchResponse(
-                events=events_data,
-                total_count=len(events_data),
-                page=1,
-                page_size=params.pageSize or 50,
-                found_more_events=data.get("foundMoreEvents", False)
-            )
-            
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             raise ValueError(f"Error contacting Event API: {e}")
         except Exception as e:
             raise ValueError(f"Unexpected error: {e}")
     
-    def _extract_events_from_response(self, data: Dict[str, Any]) -> List[Event]:
-        print(f"Extracting events from data: {data}")
+    async def _fetch_streamed(self, params: EventSearchParams,
+                              cache_key: Optional[Hashable]) -> EventSearchResponse:
+        """
+        Fetch one page with a streamed body, parsing events as they are decoded.
+        
+        Raw event dicts are parsed and dropped one at a time instead of decoding
+        the whole body into a dict tree first. The response is cached once the
+        body is complete.
+        """
+        decoder = JsonArrayStreamDecoder(EVENT_ARRAY_KEYS)
+        date_shape = _DATES_NONE
+        events = EventStore()
+        async with self.http_client.stream(
+            self.base_url, headers=self._headers(), params=self._query_params(params), timeout=REQUEST_TIMEOUT
+        ) as response:
+            response.raise_for_status()
+            chunks = response.aiter_bytes()
+            while not decoder.done:
+                chunk = await anext(chunks, None)
+                for event_data in (decoder.feed(chunk) if chunk is not None else decoder.close()):
+                    if self.fast_parse:
+                        if date_shape is _DATES_NONE:
+                            date_shape = _detect_date_shape((event_data,))
+                        record = _parse_event(event_data, date_shape)
+                        if record is not None:
+                            events.append_record(record)
+                    else:
+                        event = _parse_event_validated(event_data)
+                        if event is not None:
+                            events.append(event)
+                if chunk is None:
+                    break
+            size = response.num_bytes_downloaded
+        
+        logger.debug("Streamed %d of %d events from response", len(events), decoder.items_decoded)
+        events_response = self._build_response(params, decoder.fields, events)
+        if cache_key is not None:
+            self.cache.put(cache_key, events_response, size=size)
+        return events_response
+    
+    def _headers(self) -> Dict[str, str]:
+        return {"X-API-Key": self.api_key}
+    
+    @staticmethod
+    def _query_params(params: EventSearchParams) -> Dict[str, Any]:
+        # Convert Pydantic model to dict, excluding None values
+        try:
+            return params.model_dump(exclude_none=True)
+        except AttributeError:
+            # Fallback for older Pydantic versions (pre v2.0)
+            return {k: v for k, v in params.__dict__.items() if v is not None}
+    
+    def _build_response(self, params: EventSearchParams, data: Dict[str, Any],
+                        events: Sequence[Event]) -> EventSearchResponse:
+        """Assemble the search response from the parsed events and the other response fields."""
+        page = params.page or 1
+        page_size = params.pageSize or 50
+        events_response = EventSearchResponse(
+            # The API reports no total, only whether more pages follow (foundMoreEvents); this
+            # is the true total on the last page and a lower bound before it
+            total_count=(page - 1) * page_size + len(events),
+            page=page,
+            page_size=page_size,
+            found_more_events=data.get("foundMoreEvents", False)
+        )
+        # Set after validation, which would turn the compact store back into a list of models
+        events_response.events = events if isinstance(events, EventStore) else EventStore(events)
+        return events_response
+    
+    def iter_events(self, params: EventSearchParams, max_events: Optional[int] = None,
+                    prefetch: int = DEFAULT_PREFETCH_PAGES) -> "EventPages":
+        """
+        Stream events page by page, starting at `params.page`.
+        
+        Args:
+            params: EventSearchParams object with search criteria
+            max_events: Optional maximum number of events to yield
+            prefetch: Number of pages to fetch ahead of the current one
+            
+        Returns:
+            EventPages: Iterable of the events in API order, see EventPages
+        """
+        return EventPages(self, params, max_events, prefetch)
+    
+    def prefetch_next_page(self, params: EventSearchParams, events_response: EventSearchResponse) -> None:
+        """
+        Start fetching the page after `events_response` in the background so a
+        "show me more" follow-up is served from the cache. Must be called from
+        a running event loop.
+        """
+        if not events_response.found_more_events or self.cache is None:
+            return
+        next_params = params.model_copy(update={"page": events_response.page + 1})
+        task = asyncio.get_running_loop().create_task(self._prefetch(next_params))
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_tasks.discard)
+    
+    async def _prefetch(self, params: EventSearchParams) -> None:
+        try:
+            await self.search_events_async(params)
+        except Exception as e:
+            logger.debug(f"Prefetch of page {params.page} failed: {e}")
+    
+    def _extract_events_from_response(self, data: Dict[str, Any], fast: Optional[bool] = None) -> Sequence[Event]:
         """
         Extract events from API response data, handling different response formats.
         
         Args:
             data: The JSON response data from the API
+            fast: Use the fast parser; defaults to the service's `fast_parse` setting
             
         Returns:
-            List[Event]: Extracted event objects
+            Sequence[Event]: Extracted events; an EventStore when parsed on the fast path
         """
-        events_data = []
+        events_list = _find_events_list(data)
+        if events_list is None:
+            return []
         
-        # Determine which key contains the events list
-        events_list = []
-        if "events" in data and isinstance(data.get("events"), list):
-            events_list = data.get("events", [])
-        elif "items" in data and isinstance(data.get("items"), list):
-            events_list = data.get("items", [])
+        if fast if fast is not None else self.fast_parse:
+            events_data = _parse_events_fast(events_list)
         else:
-            return events_data
-        
-        for event_data in events_list:
-            try:
-                # Extract venue data
-                venues = []
-                venue_list = event_data.get("venues", [])
-                if venue_list and isinstance(venue_list, list):
-                    for venue_data in venue_list:
-                        if isinstance(venue_data, dict):
-                            # Handle full venue object
-                            venues.append(Venue(
-                                name=venue_data.get("name", "Unknown Venue"),
-                                city=venue_data.get("city", {}).get("name") if isinstance(venue_data.get("city"), dict) else venue_data.get("city"),
-                                country=venue_data.get("country", {}).get("name") if isinstance(venue_data.get("country"), dict) else venue_data.get("country"),
-                                country_code=venue_data.get("country", {}).get("countryCode") if isinstance(venue_data.get("country"), dict) else None,
-                                address=venue_data.get("address", {}).get("line1") if isinstance(venue_data.get("address"), dict) else venue_data.get("address")
-                            ))
-                        elif isinstance(venue_data, str):
-                            # Handle venue as string
-                            venues.append(Venue(
-                                name=venue_data,
-                                city=None,
-                                country=None,
-                                country_code=None,
-                                address=None
-                            ))
-                
-                # Process dates
-                start_date = ""
-                start_time = None
-                end_date = None
-                end_time = None
-                
-                if "startDateTime" in event_data:
-                    iso_date = event_data.get("startDateTime", "")
-                    if iso_date:
-                        try:
-                            dt = datetime.fromisoformat(iso_date.replace('Z', '+00:00'))
-                            start_date = dt.strftime("%Y-%m-%d")
-                            start_time = dt.strftime("%H:%M:%S")
-                        except ValueError:
-                            # If date format is not standard ISO, use as is
-                            start_date = iso_date
-                elif "dates" in event_data:
-                    dates_data = event_data.get("dates", {})
-                    if isinstance(dates_data, dict):
-                        start_data = dates_data.get("start", {})
-                        if isinstance(start_data, dict):
-                            start_date = start_data.get("localDate", "")
-                            start_time = start_data.get("localTime")
-                        end_data = dates_data.get("end", {})
-                        if isinstance(end_data, dict):
-                            end_date = end_data.get("localDate")
-                            end_time = end_data.get("localTime")
-                
-                # Create EventDate object
-                dates = EventDate(
-                    start_date=start_date,
-                    start_time=start_time,
-                    end_date=end_date,
-                    end_time=end_time
-                )
-                
-                # Process images
-                images = []
-                if "images" in event_data and isinstance(event_data.get("images"), list):
-                    for image_data in event_data.get("images", []):
-                        if isinstance(image_data, dict):
-                            images.append(EventImage(
-                                url=image_data.get("url", ""),
-                                alt=image_data.get("alt")
-                            ))
-                elif "image" in event_data and event_data.get("image"):
-                    image_url = event_data.get("image")
-                    if isinstance(image_url, str):
-                        images.append(EventImage(url=image_url, alt=None))
-                
-                # Create Event object
-                event = Event(
-                    id=str(event_data.get("id", "")),
-                    name=event_data.get("name", "Unknown Event"),
-                    description=event_data.get("description"),
-                    url=event_data.get("url"),
-                    dates=dates,
-                    venues=venues,
-                    images=images,
-                    genre=event_data.get("genre") or 
-                        (event_data.get("classifications", [{}])[0].get("genre", {}).get("name") 
-                         if event_data.get("classifications") and len(event_data.get("classifications", [])) > 0 
-                         else None)
-                )
-                
-                events_data.append(event)
-            except Exception:
-                # Skip events that can't be processed
-                continue
-        print(events_data)
+            events_data = [event for event in map(_parse_event_validated, events_list) if event is not None]
+        logger.debug("Extracted %d of %d events from response", len(events_data), len(events_list))
         return events_data
     
-    def format_events_for_llm(self, events_response: EventSearchResponse) -> str:
+    def format_events_for_llm(self, events_response: EventSearchResponse,
+                              token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET) -> str:
         """
         Format the events data in a way that's suitable for an LLM.
         
         Args:
             events_response: The structured event search response
+            token_budget: Maximum number of estimated tokens of the result, or None for no limit
             
         Returns:
-            str: Formatted string representation of events
+            str: Compact table of the events, see services.event_encoder
         """
-        if not events_response.events:
-            return "No events found for the given criteria."
-        
-        formatted_events = [event.format_summary() for event in events_response.events]
-        
-        result = f"Found {events_response.total_count} events. Showing {len(formatted_events)}:"
-        if events_response.found_more_events:
-            result += " (more events are available)"
-        result += "\n\n"
-        result += "\n".join(formatted_events)
-        
-        return result
+        return encode_events(events_response, token_budget).text
+
+
+class EventPages:
+    """
+    The events of a search, streamed page by page.
+    
+    Iterate it with `for` or `async for`. While the caller consumes the events
+    of one page, the next `prefetch` pages are fetched concurrently. Iteration
+    stops after `max_events` events or on the last page; pages fetched ahead
+    and no longer needed are cancelled. As the API reports no total,
+    `total_count` is only set (to the true total) once the last page was
+    fetched, and stays None if iteration stopped before it.
+    """
+    
+    def __init__(self, service: EventApiService, params: EventSearchParams, max_events: Optional[int] = None,
+                 prefetch: int = DEFAULT_PREFETCH_PAGES):
+        self.service = service
+        self.params = params
+        self.max_events = max_events
+        self.prefetch = prefetch
+        self.total_count: Optional[int] = None
+        self.pages_requested = 0
+    
+    def _fetch(self, page: int) -> "asyncio.Task[EventSearchResponse]":
+        self.pages_requested += 1
+        return asyncio.ensure_future(self.service.search_events_async(self.params.model_copy(update={"page": page})))
+    
+    async def __aiter__(self) -> AsyncIterator[Event]:
+        page = self.params.page or 1
+        yielded = 0
+        pending: Dict[int, asyncio.Task] = {}
+        try:
+            while True:
+                task = pending.pop(page, None) or self._fetch(page)
+                response = await task
+                
+                if not response.found_more_events:
+                    self.total_count = response.total_count
+                elif response.events:
+                    # Prefetch only the pages the caller still needs
+                    ahead = self.prefetch
+                    if self.max_events is not None:
+                        still_needed = self.max_events - yielded - len(response.events)
+                        ahead = min(ahead, max(0, -(-still_needed // response.page_size)))
+                    for next_page in range(page + 1, page + 1 + ahead):
+                        if next_page not in pending:
+                            pending[next_page] = self._fetch(next_page)
+                
+                for event in response.events:
+                    yield event
+                    yielded += 1
+                    if self.max_events is not None and yielded >= self.max_events:
+                        return
+                
+                if not response.found_more_events or not response.events:
+                    return
+                page += 1
+        finally:
+            for task in pending.values():
+                task.cancel()
+    
+    def __iter__(self) -> Iterator[Event]:
+        return iterate_sync(self.__aiter__())
@@ -0,0 +1,191 @@
+"""
+Event Encoder
+
+Compact, token-budgeted encoding of event search results for the LLM.
+
+A tool result is stored in the conversation and re-sent on every later turn,
+so it should carry what the model needs to answer (title, date and time,
+venue, genre, ticket link) in as few tokens as possible. The encoder writes
+results as a pipe-separated table, lists repeated venues once in a legend and
+hoists values shared by all rows (city, country, genre) into the header. Rows are
+added until the token budget is reached; the rest, and the rows the ranker
+left out, are counted in a "not shown" marker that asks for a narrower search.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from services.event_models import Event, EventSearchResponse
+from services.event_store import EventStore
+from structs.tokens import estimate_tokens
+
+# Budget of a single search tool result, in estimated tokens
+DEFAULT_TOKEN_BUDGET = 1200
+
+_NO_EVENTS = "No events found for the given criteria."
+
+
+@dataclass
+class EncodedEvents:
+    """An encoded search result and its size."""
+    text: str
+    tokens: int
+    shown: int
+    available: int
+
+    @property
+    def truncated(self) -> bool:
+        return self.shown < self.available
+
+
+def _rows(events: Sequence[Event]) -> List[Tuple[str, str, Optional[Tuple[str, Optional[str], Optional[str]]], str, str]]:
+    """(name, date time, (venue, city, country), genre, url) of each event."""
+    if isinstance(events, EventStore):
+        names, urls, genres = events.column("name"), events.column("url"), events.column("genre")
+        dates, times = events.column("start_date"), events.column("start_time")
+        venues = [venue_list[0][:3] if venue_list else None for venue_list in events.column("venues")]
+    else:
+        names = [event.name for event in events]
+        urls = [event.url for event in events]
+        genres = [event.genre for event in events]
+        dates = [event.dates.start_date for event in events]
+        times = [event.dates.start_time for event in events]
+        venues = [(event.venues[0].name, event.venues[0].city, event.venues[0].country) if event.venues else None
+                  for event in events]
+    return [
+        (_cell(name), _cell(_date_time(date, time)), venue, _cell(genre), url or "")
+        for name, date, time, venue, genre, url in zip(names, dates, times, venues, genres, urls)
+    ]
+
+
+def _date_time(date: Optional[str], time: Optional[str]) -> str:
+    # Seconds are noise for event start times
+    if time and len(time) == 8 and time.endswith(":00"):
+        time = time[:5]
+    return f"{date or '?'} {time}" if time else (date or "?")
+
+
+def _cell(value: Optional[str]) -> str:
+    return (value or "").replace("|", "/").replace("\n", " ").strip()
+
+
+def _shared(values: List[Optional[str]]) -> Optional[str]:
+    """The value shared by all rows, if there is exactly one and it is set."""
+    distinct = set(values)
+    return distinct.pop() if len(distinct) == 1 and None not in distinct else None
+
+
+def encode_events(events_response: EventSearchResponse, token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET) -> EncodedEvents:
+    """
+    Encode a search response for the LLM within a token budget.
+
+    Args:
+        events_response: The structured event search response
+        token_budget: Maximum number of estimated tokens of the result, or None for no limit
+
+    Returns:
+        EncodedEvents: The encoded text with its estimated token count and the
+        number of events shown and available on the page
+    """
+    events = events_response.events
+    if not events:
+        return EncodedEvents(_NO_EVENTS, estimate_tokens(_NO_EVENTS), 0, 0)
+
+    rows = _rows(events)
+    venues = [row[2] for row in rows]
+    shared_city = _shared([venue[1] if venue else None for venue in venues])
+    shared_country = _shared([venue[2] if venue else None for venue in venues])
+    shared_genre = _shared([row[3] or None for row in rows])
+    shared = (shared_city, shared_country, shared_genre)
+
+    notes = []
+    location = ", ".join(part for part in (shared_city, shared_country) if part)
+    if location:
+        notes.append(f"Location: {location}.")
+    if shared_genre:
+        notes.append(f"Genre: {shared_genre}.")
+    columns = "name | date time | venue" + ("" if shared_genre else " | genre") + " | url"
+
+    # Fixed parts, with room for the longest possible "not shown" marker
+    fixed = estimate_tokens(_header(events_response, len(rows), notes)) + estimate_tokens(columns) + 4
+    marker_reserve = estimate_tokens(_more_marker(len(rows) + events_response.omitted_count, events_response)) + 1
+    budget = None if token_budget is None else token_budget - fixed - marker_reserve
+
+    # Pick the rows that fit. Venue repeats are counted over all rows here; the
+    # final rendering counts them over the chosen rows only, which is never longer.
+    shown, used = 0, 0
+    for line, legend_entry in _render_rows(rows, shared):
+        cost = estimate_tokens(line) + 1 + (estimate_tokens(legend_entry) + 1 if legend_entry else 0)
+        if budget is not None and used + cost > budget and shown:
+            break
+        used += cost
+        shown += 1
+
+    lines, legend = [], []
+    for line, legend_entry in _render_rows(rows[:shown], shared):
+        lines.append(line)
+        if legend_entry:
+            legend.append(legend_entry)
+
+    parts = [_header(events_response, shown, notes)]
+    if legend:
+        parts.append("Venues: " + "; ".join(legend))
+    parts.append(columns)
+    parts.extend(lines)
+    marker = _more_marker(len(rows) - shown + events_response.omitted_count, events_response)
+    if marker:
+        parts.append(marker)
+    text = "\n".join(parts)
+    return EncodedEvents(text, estimate_tokens(text), shown, len(rows))
+
+
+def _render_rows(rows: List[tuple], shared: Tuple[Optional[str], Optional[str], Optional[str]]) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Table lines of the rows, each with the venue legend entry it introduces.
+    
+    Venues repeated often enough for it to pay off are listed once in the
+    legend and referenced by id; the others are written inline.
+    """
+    shared_city, shared_country, shared_genre = shared
+    venue_counts = Counter(row[2] for row in rows if row[2])
+    venue_ids: Dict[Tuple[str, Optional[str], Optional[str]], str] = {}
+    for name, date_time, venue, genre, url in rows:
+        venue_cell, legend_entry = "", None
+        if venue:
+            venue_name, city, country = venue
+            parts = [_cell(venue_name)] + [
+                _cell(part) for part in (None if shared_city else city, None if shared_country else country) if part
+            ]
+            venue_text = ", ".join(parts)
+            count = venue_counts[venue]
+            # A reference costs about three characters per row plus one legend entry
+            if (count - 1) * len(venue_text) <= (count + 1) * 3 + 2:
+                venue_cell = venue_text
+            else:
+                venue_cell = venue_ids.get(venue)
+                if venue_cell is None:
+                    venue_cell = venue_ids[venue] = f"V{len(venue_ids) + 1}"
+                    legend_entry = f"{venue_cell}={venue_text}"
+        cells = [name, date_time, venue_cell] + ([] if shared_genre else [genre]) + [url]
+        yield " | ".join(cells), legend_entry
+
+
+def _header(events_response: EventSearchResponse, shown: int, notes: List[str]) -> str:
+    # Before the last page the count is only a lower bound; the API reports no total
+    if events_response.found_more_events:
+        found = f"Found at least {events_response.total_count} events (page {events_response.page}, more pages available)"
+    else:
+        found = f"Found {events_response.total_count} events (page {events_response.page})"
+    return " ".join([f"{found}, showing {shown}."] + notes)
+
+
+def _more_marker(remaining: int, events_response: EventSearchResponse) -> str:
+    more = []
+    if remaining > 0:
+        # Rows cut by ranking or the token budget cannot be fetched again: a re-fetch of
+        # the page is ranked and cut the same way
+        more.append(f"{remaining} more matches on this page not shown; narrow the search to see them")
+    if events_response.found_more_events:
+        more.append(f"more on page {events_response.page + 1}")
+    return ("(" + "; ".join(more) + ")") if more else ""
@@ -0,0 +1,147 @@
+"""
+Event Models
+
+Pydantic models of event search requests and responses.
+"""
+
+from typing import List, Optional, Hashable, Sequence, Tuple
+from pydantic import BaseModel, Field, field_validator
+from datetime import datetime
+
+class Venue(BaseModel):
+    """Venue information for an event."""
+    name: str = Field(..., description="Name of the venue")
+    city: Optional[str] = Field(None, description="City where the venue is located")
+    country: Optional[str] = Field(None, description="Country where the venue is located")
+    country_code: Optional[str] = Field(None, description="ISO country code")
+    address: Optional[str] = Field(None, description="Full address of the venue")
+
+class EventDate(BaseModel):
+    """Date and time information for an event."""
+    start_date: str = Field(..., description="Start date of the event (ISO format)")
+    start_time: Optional[str] = Field(None, description="Start time of the event")
+    end_date: Optional[str] = Field(None, description="End date of the event (ISO format)")
+    end_time: Optional[str] = Field(None, description="End time of the event")
+    
+    @field_validator('start_date', 'end_date', mode='before')
+    @classmethod
+    def validate_date_format(cls, v):
+        if v:
+            try:
+                datetime.fromisoformat(v.replace('Z', '+00:00'))
+            except ValueError:
+                raise ValueError(f"Invalid date format: {v}. Expected ISO format (YYYY-MM-DD).")
+        return v
+
+class EventImage(BaseModel):
+    """Image information for an event."""
+    url: str = Field(..., description="URL of the event image")
+    alt: Optional[str] = Field(None, description="Alternative text for the image")
+
+class Event(BaseModel):
+    """Detailed event information."""
+    id: str = Field(..., description="Unique identifier for the event")
+    name: str = Field(..., description="Name of the event")
+    description: Optional[str] = Field(None, description="Description of the event")
+    url: Optional[str] = Field(None, description="URL for event details or ticketing")
+    dates: EventDate = Field(..., description="Date and time information")
+    venues: List[Venue] = Field(default_factory=list, description="List of venues")
+    images: List[EventImage] = Field(default_factory=list, description="List of event images")
+    genre: Optional[str] = Field(None, description="Genre of the event")
+    
+    def format_summary(self) -> str:
+        """Format the event as a summary string."""
+        venue = self.venues[0] if self.venues else None
+        return format_event_summary(
+            self.name,
+            (venue.name, venue.city, venue.country) if venue else None,
+            self.dates.start_date,
+            self.dates.start_time,
+            self.url,
+        )
+
+def format_event_summary(name: str, venue: Optional[Tuple[str, Optional[str], Optional[str]]],
+                         start_date: str, start_time: Optional[str], url: Optional[str]) -> str:
+    """
+    Format an event as a summary string.
+    
+    Args:
+        name: Name of the event
+        venue: Name, city and country of the first venue, or None
+        start_date: Start date of the event
+        start_time: Start time of the event
+        url: URL for event details or ticketing
+    """
+    venue_str = ""
+    if venue:
+        venue_name, city, country = venue
+        venue_parts = [venue_name]
+        if city:
+            venue_parts.append(city)
+        if country:
+            venue_parts.append(country)
+        venue_str = ", ".join(venue_parts)
+    
+    time_str = start_time if start_time else ""
+    
+    return f"{name} at {venue_str} on {start_date} {time_str} - {url or ''}"
+
+class EventSearchResponse(BaseModel):
+    """Response from the event search API."""
+    # A list or a compact services.event_store.EventStore
+    events: Sequence[Event] = Field(default_factory=list, description="List of events")
+    total_count: int = Field(0, description="Number of events found up to and including this page; the total on the last page")
+    page: int = Field(1, description="Current page number")
+    page_size: int = Field(50, description="Number of events per page")
+    found_more_events: bool = Field(False, description="Indicates if there are more events available")
+    omitted_count: int = Field(0, description="Events of this page left out, e.g. by ranking")
+
+class EventSearchParams(BaseModel):
+    """Parameters for searching events."""
+    eventGenre: Optional[str] = Field(None, description="Genre of the event (e.g., 'Sports - Football')")
+    eventLocationCity: Optional[str] = Field(None, description="City where the event takes place")
+    eventLocationCountryCode: Optional[str] = Field(None, description="ISO country code of the event location")
+    eventStartDate: Optional[str] = Field(None, description="Start date of the event in ISO format (yyyy-MM-dd)")
+    eventEndDate: Optional[str] = Field(None, description="End date of the event in ISO format (yyyy-MM-dd)")
+    eventName: Optional[str] = Field(None, description="Name of the event to search for")
+    pageSize: Optional[int] = Field(50, description="Number of results per page (Min: 1, Max: 200, Default: 50)")
+    page: Optional[int] = Field(None, description="Page number to return, starting at 1 (Default: 1)")
+    
+    @field_validator('eventStartDate', 'eventEndDate', mode='before')
+    @classmethod
+    def validate_date_format(cls, v):
+        if v:
+            try:
+                datetime.strptime(v, "%Y-%m-%d")
+            except ValueError:
+                raise ValueError(f"Invalid date format: {v}. Expected format: YYYY-MM-DD")
+        return v
+    
+    @field_validator('pageSize')
+    @classmethod
+    def validate_page_size(cls, v):
+        if v is not None:
+            if v < 1:
+                return 1
+            if v > 200:
+                return 200
+        return v
+    
+    @field_validator('page')
+    @classmethod
+    def validate_page(cls, v):
+        if v is not None and v < 1:
+            return 1
+        return v
+
+    def cache_key(self) -> Hashable:
+        """
+        Normalized key identifying the search: defaults are filled in, unset
+        fields are dropped, and strings are compared case-insensitively.
+        """
+        values = self.model_dump(exclude_none=True)
+        values.setdefault("page", 1)
+        return tuple(sorted(
+            (name, value.strip().lower() if isinstance(value, str) else value)
+            for name, value in values.items()
+        ))
@@ -0,0 +1,185 @@
+"""
+Event Ranker
+
+Orders search results by how well they fit the request and the user before
+they are handed to the LLM, so the model sees the best candidates first and
+only the top-k are forwarded.
+
+Each event gets a weighted score from four signals:
+- date: proximity of the start date to the requested start (or today)
+- genre: similarity of the event genre to the requested one in the taxonomy
+- city: whether the first venue is in the requested city
+- preferences: similarity to genres and cities the user prefers
+
+Scoring is vectorized with NumPy over the columns of an EventStore. The
+signals are computed once per distinct value (dates, genres and venues repeat
+a lot within a page) and gathered into arrays by the column codes.
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, List, Optional, Sequence
+
+import numpy as np
+
+from memory.preferences import UserPreferences
+from services.event_models import Event, EventSearchParams, EventSearchResponse
+from services.event_store import EventStore
+from services.taxonomy import Node, Taxonomy, get_taxonomy, node_similarity, normalize_name
+
+logger = logging.getLogger(__name__)
+
+# Number of ranked events forwarded to the LLM
+DEFAULT_TOP_K = 25
+# Days after which the date proximity signal has dropped to 1/e
+DATE_SCALE_DAYS = 14.0
+
+
+@dataclass
+class RankingWeights:
+    """Relative weights of the ranking signals."""
+    date: float = 1.0
+    genre: float = 1.5
+    city: float = 1.0
+    preferences: float = 0.75
+
+
+class EventRanker:
+    """Scores and orders the events of a search response."""
+
+    def __init__(self, taxonomy: Optional[Taxonomy] = None, weights: Optional[RankingWeights] = None,
+                 top_k: int = DEFAULT_TOP_K):
+        """
+        Args:
+            taxonomy: Category taxonomy for genre matching; defaults to the shared one
+            weights: Weights of the ranking signals
+            top_k: Number of events kept by `rank`
+        """
+        self._taxonomy = taxonomy
+        self.weights = weights or RankingWeights()
+        self.top_k = top_k
+
+    @property
+    def taxonomy(self) -> Taxonomy:
+        if self._taxonomy is None:
+            self._taxonomy = get_taxonomy()
+        return self._taxonomy
+
+    def score(self, events: Sequence[Event], params: EventSearchParams,
+              preferences: Optional[UserPreferences] = None, today: Optional[date] = None) -> np.ndarray:
+        """
+        Score events against the request and the user's preferences.
+
+        Args:
+            events: Events to score (an EventStore, or any sequence of events)
+            params: The search request
+            preferences: The user's preferences, if known
+            today: Reference date when the request has no start date
+
+        Returns:
+            np.ndarray: One score per event; higher is better
+        """
+        store = events if isinstance(events, EventStore) else EventStore(events)
+        weights = self.weights
+        scores = np.zeros(len(store), dtype=np.float64)
+        if not len(store):
+            return scores
+
+        reference = _parse_date(params.eventStartDate) or today or date.today()
+        scores += weights.date * self._gather(store, "start_date", lambda value: _date_proximity(value, reference))
+
+        requested_genre = self._nodes(params.eventGenre)
+        if params.eventGenre:
+            genre_text = normalize_name(params.eventGenre)
+            scores += weights.genre * self._gather(
+                store, "genre", lambda value: self._genre_similarity(value, genre_text, requested_genre))
+
+        if params.eventLocationCity:
+            city = normalize_name(params.eventLocationCity)
+            scores += weights.city * self._gather(
+                store, "venues", lambda venues: float(_first_city(venues) == city))
+
+        if preferences:
+            preferred_genres = [(normalize_name(name), self._nodes(name), weight)
+                                for name, weight in preferences.genres.items()]
+            preferred_cities = {normalize_name(name): weight for name, weight in preferences.cities.items()}
+            if preferred_genres:
+                scores += weights.preferences * self._gather(store, "genre", lambda value: max(
+                    weight * self._genre_similarity(value, text, nodes) for text, nodes, weight in preferred_genres))
+            if preferred_cities:
+                scores += weights.preferences * self._gather(
+                    store, "venues", lambda venues: preferred_cities.get(_first_city(venues), 0.0))
+        return scores
+
+    def rank(self, response: EventSearchResponse, params: EventSearchParams,
+             preferences: Optional[UserPreferences] = None, top_k: Optional[int] = None,
+             today: Optional[date] = None) -> EventSearchResponse:
+        """
+        Order the events of a response by score and keep the top-k.
+
+        The response is not modified (cached responses are shared); a copy with
+        the ranked events is returned. Ties keep the API order.
+
+        Returns:
+            EventSearchResponse: The ranked response; `omitted_count` holds the
+            number of events of the page that were left out
+        """
+        started = time.perf_counter()
+        store = response.events if isinstance(response.events, EventStore) else EventStore(response.events)
+        top_k = self.top_k if top_k is None else top_k
+        scores = self.score(store, params, preferences, today)
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        ranked = response.model_copy(update={
+            "events": store.take(order.tolist()),
+            "omitted_count": response.omitted_count + len(store) - len(order),
+        })
+        logger.debug("Ranked %d events in %.2f ms", len(store), (time.perf_counter() - started) * 1000)
+        return ranked
+
+    def _nodes(self, text: Optional[str]) -> List[Node]:
+        return self.taxonomy.resolve(text) if text else []
+
+    def _genre_similarity(self, value: Optional[str], text: str, nodes: List[Node]) -> float:
+        if not value:
+            return 0.0
+        if normalize_name(value) == text:
+            return 1.0
+        event_nodes = self._nodes(value)
+        return max((node_similarity(a, b) for a in nodes for b in event_nodes), default=0.0)
+
+    @staticmethod
+    def _gather(store: EventStore, field_name: str, signal: Callable[[Any], float]) -> np.ndarray:
+        """Evaluate a signal once per distinct value of a column and spread it over the events."""
+        codes, table = store.codes(field_name)
+        codes = np.frombuffer(codes, dtype=np.uint32)
+        used = np.unique(codes)
+        lookup = np.zeros(len(table), dtype=np.float64)
+        lookup[used] = [signal(table[code]) for code in used.tolist()]
+        return lookup[codes]
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def _date_proximity(value: Optional[str], reference: date) -> float:
+    """1 on the reference date, decaying with distance; past events decay twice as fast."""
+    event_date = _parse_date(value)
+    if event_date is None:
+        return 0.0
+    days = (event_date - reference).days
+    return math.exp(-(days if days >= 0 else -2 * days) / DATE_SCALE_DAYS)
+
+
+def _first_city(venues: Any) -> Optional[str]:
+    if not venues or not venues[0][1]:
+        return None
+    return normalize_name(venues[0][1])
@@ -0,0 +1,217 @@
+"""
+Event Store
+
+A compact, column-oriented container for the events of a search response.
+
+Search results are kept for a while (in the search cache, across prefetched
+pages), and a list of Pydantic `Event` objects with their nested `EventDate`,
+`Venue` and `EventImage` objects costs several kilobytes per event. The store
+keeps one column per field instead: repeated values such as dates, genres
+and venues are stored once and referenced by small integer codes, and full
+`Event` objects are only built when an element is accessed.
+
+Events are added either as `Event` objects or as plain records (see
+`EventRecord`); the fast response parser writes records, so no models are
+built for events that are never accessed.
+"""
+
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from services.event_models import Event, EventDate, EventImage, Venue, format_event_summary
+
+_VENUE_FIELDS = ("name", "city", "country", "country_code", "address")
+
+# The fields of an event as plain values:
+# (id, name, description, url, images, start_date, start_time, end_date, end_time, genre, venues)
+# where images are (url, alt) pairs and venues are tuples of _VENUE_FIELDS
+EventRecord = Tuple[
+    str, str, Optional[str], Optional[str], Tuple[Tuple[str, Optional[str]], ...],
+    str, Optional[str], Optional[str], Optional[str], Optional[str], Tuple[Tuple[Optional[str], ...], ...],
+]
+
+# Columns stored as codes into the shared value table
+_CODED_COLUMNS = ("start_date", "start_time", "end_date", "end_time", "genre", "venues")
+
+
+class EventStore(Sequence):
+    """
+    Read-only sequence of events stored in columns.
+
+    Behaves like a list of `Event` objects: indexing and iteration build the
+    events on demand. Events are added with `append`/`extend`; the materialized
+    objects are independent copies, so changing them does not change the store.
+    """
+
+    __slots__ = (
+        "_ids", "_names", "_descriptions", "_urls", "_images",
+        "_start_date", "_start_time", "_end_date", "_end_time", "_genre", "_venues",
+        "_values", "_codes",
+    )
+
+    def __init__(self, events: Iterable[Event] = ()):
+        self._ids: List[str] = []
+        self._names: List[str] = []
+        self._descriptions: List[Optional[str]] = []
+        self._urls: List[Optional[str]] = []
+        self._images: List[Tuple[Tuple[str, Optional[str]], ...]] = []
+        for column in _CODED_COLUMNS:
+            setattr(self, "_" + column, array("I"))
+        # Distinct values of the coded columns; code 0 is None
+        self._values: List[Any] = [None]
+        self._codes: Dict[Any, int] = {None: 0}
+        self.extend(events)
+
+    def _code(self, value: Any) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._values)
+            self._values.append(value)
+        return code
+
+    def append(self, event: Event) -> None:
+        """Add an event to the end of the store."""
+        self.append_record(event_record(event))
+
+    def append_record(self, record: EventRecord) -> None:
+        """Add an event given as a plain record to the end of the store."""
+        (event_id, name, description, url, images,
+         start_date, start_time, end_date, end_time, genre, venues) = record
+        self._ids.append(event_id)
+        self._names.append(name)
+        self._descriptions.append(description)
+        self._urls.append(url)
+        self._images.append(images)
+        self._start_date.append(self._code(start_date))
+        self._start_time.append(self._code(start_time))
+        self._end_date.append(self._code(end_date))
+        self._end_time.append(self._code(end_time))
+        self._genre.append(self._code(genre))
+        self._venues.append(self._code(venues))
+
+    def extend(self, events: Iterable[Event]) -> None:
+        """Add several events to the end of the store."""
+        for event in events:
+            self.append(event)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Event, List[Event]]:
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self)))]
+        return self._materialize(range(len(self))[index])
+
+    def __iter__(self) -> Iterator[Event]:
+        for i in range(len(self)):
+            yield self._materialize(i)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, EventStore):
+            return all(self.column(field) == other.column(field) for field in (
+                "id", "name", "description", "url", "images") + _CODED_COLUMNS)
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"EventStore({len(self)} events)"
+
+    def _materialize(self, i: int) -> Event:
+        # The stored values were checked when they were added, so validation passes
+        values = self._values
+        return Event(
+            id=self._ids[i],
+            name=self._names[i],
+            description=self._descriptions[i],
+            url=self._urls[i],
+            dates=EventDate(
+                start_date=values[self._start_date[i]],
+                start_time=values[self._start_time[i]],
+                end_date=values[self._end_date[i]],
+                end_time=values[self._end_time[i]],
+            ),
+            venues=[Venue(**dict(zip(_VENUE_FIELDS, venue))) for venue in values[self._venues[i]]],
+            images=[EventImage(url=url, alt=alt) for url, alt in self._images[i]],
+            genre=values[self._genre[i]],
+        )
+
+    def column(self, field: str) -> List[Any]:
+        """
+        All values of one field, without building any events.
+
+        Args:
+            field: "id", "name", "description", "url", "images", one of the date
+                   fields ("start_date", ...), "genre" or "venues", or "city" /
+                   "country" for the first venue's city and country
+        """
+        if field in ("city", "country"):
+            position = _VENUE_FIELDS.index(field)
+            firsts = [venues[0][position] if venues else None for venues in self._values_of(self._venues)]
+            return firsts
+        if field in _CODED_COLUMNS:
+            return self._values_of(getattr(self, "_" + field))
+        columns = {"id": self._ids, "name": self._names, "description": self._descriptions,
+                   "url": self._urls, "images": self._images}
+        if field not in columns:
+            raise KeyError(field)
+        return list(columns[field])
+
+    def codes(self, field: str) -> Tuple[array, List[Any]]:
+        """
+        A coded column as codes and the shared value table (`table[code]` is
+        the value), for vectorized processing. Both must be treated as read-only.
+        """
+        if field not in _CODED_COLUMNS:
+            raise KeyError(field)
+        return getattr(self, "_" + field), self._values
+
+    def take(self, indices: Iterable[int]) -> "EventStore":
+        """A new store with the events at the given positions, in that order."""
+        store = EventStore()
+        store._values = list(self._values)
+        store._codes = dict(self._codes)
+        for i in indices:
+            store._ids.append(self._ids[i])
+            store._names.append(self._names[i])
+            store._descriptions.append(self._descriptions[i])
+            store._urls.append(self._urls[i])
+            store._images.append(self._images[i])
+            for column in _CODED_COLUMNS:
+                getattr(store, "_" + column).append(getattr(self, "_" + column)[i])
+        return store
+
+    def _values_of(self, codes: array) -> List[Any]:
+        values = self._values
+        return [values[code] for code in codes]
+
+    def format_summary(self, i: int) -> str:
+        """`Event.format_summary` of the i-th event, without building the event."""
+        i = range(len(self))[i]
+        venues = self._values[self._venues[i]]
+        return format_event_summary(
+            self._names[i],
+            venues[0][:3] if venues else None,
+            self._values[self._start_date[i]],
+            self._values[self._start_time[i]],
+            self._urls[i],
+        )
+
+    def summaries(self) -> Iterator[str]:
+        """Summary lines of all events, in order."""
+        for i in range(len(self)):
+            yield self.format_summary(i)
+
+
+def event_record(event: Event) -> EventRecord:
+    """The plain record of an event."""
+    dates = event.dates
+    return (
+        event.id, event.name, event.description, event.url,
+        tuple((image.url, image.alt) for image in event.images),
+        dates.start_date, dates.start_time, dates.end_date, dates.end_time, event.genre,
+        tuple((venue.name, venue.city, venue.country, venue.country_code, venue.address) for venue in event.venues),
+    )
@@ -0,0 +1,205 @@
+"""
+Genre Resolver
+
+Turns free-text genres written by the LLM ("sports - footbal", "Theater",
+"hip hop") into canonical taxonomy entries such as "Sports - Football".
+
+Names and full paths of all segments, genres and subgenres are indexed:
+exact lookups go through a dict of normalized keys (case, punctuation and a
+few spelling variants folded away), everything else through an inverted
+index of character trigrams scored by Dice similarity. The index is cached
+under .cache/ next to the compiled taxonomy, keyed by the taxonomy source
+hash, and results are cached per input text.
+"""
+
+import heapq
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from services.taxonomy import Node, Taxonomy, get_taxonomy, read_artifact, write_artifact
+
+GENRE_INDEX_CACHE_PATH = Path(__file__).parent.parent / ".cache" / "genre_index.pickle"
+
+# Bumped whenever the index changes shape or keys are folded differently
+_INDEX_FORMAT = 1
+
+# Matches scoring below this are not trusted
+MIN_SCORE = 0.6
+
+# Spelling variants folded into the spelling used by the taxonomy
+_WORD_ALIASES = {
+    "theater": "theatre",
+    "theaters": "theatre",
+    "theatres": "theatre",
+    "n": "and",
+    "hiphop": "hip hop",
+    "rnb": "r and b",
+    "edm": "dance electronic",
+}
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+# Keys, their categories, their trigram counts and the trigram postings
+_Index = Tuple[List[str], List[Tuple[Node, ...]], List[int], Dict[str, Tuple[int, ...]]]
+
+
+class GenreMatch(NamedTuple):
+    """A taxonomy entry matching a genre text."""
+    node: Node
+    path: str
+    score: float
+
+
+def fold(text: str) -> str:
+    """Normalized form of a genre text: lowercase words, "&" as "and", no punctuation or level separators."""
+    words = _NON_WORD.sub(" ", text.lower().replace("&", " and ")).split()
+    return " ".join(_WORD_ALIASES.get(word, word) for word in words)
+
+
+def node_path(node: Node) -> str:
+    """Canonical genre string of a category, e.g. "Sports - Football"."""
+    return " - ".join(level for level in node if level)
+
+
+def genre_path(node: Node) -> str:
+    """The "Segment - Genre" string of a category, without its subgenre, as the search API takes it."""
+    return node_path(node[:2])
+
+
+def _trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _build_index(taxonomy: Taxonomy) -> _Index:
+    """
+    Index the folded paths of all categories and their folded names. A name
+    used on several levels keys the highest of them, as in `Taxonomy.resolve`.
+    """
+    nodes_by_key: Dict[str, List[Node]] = {}
+    for segment in taxonomy.segment_names:
+        nodes = [(segment, None, None)] + [(segment, genre, None) for genre, _ in taxonomy.segment_genres[segment]]
+        for node in nodes:
+            nodes_by_key.setdefault(fold(node_path(node)), []).append(node)
+    for subgenre, (_, genre, segment) in taxonomy.subgenres.items():
+        node = (segment, genre, subgenre)
+        nodes_by_key.setdefault(fold(node_path(node)), []).append(node)
+    for name in (*taxonomy.segment_names, *taxonomy.genre_names, *taxonomy.subgenre_names):
+        key = fold(name)
+        if key not in nodes_by_key:
+            nodes_by_key[key] = taxonomy.resolve(name)
+
+    keys = list(nodes_by_key)
+    key_sizes: List[int] = []
+    postings: Dict[str, List[int]] = {}
+    for i, key in enumerate(keys):
+        grams = _trigrams(key)
+        key_sizes.append(len(grams))
+        for gram in grams:
+            postings.setdefault(gram, []).append(i)
+    return (
+        keys,
+        [tuple(nodes_by_key[key]) for key in keys],
+        key_sizes,
+        {gram: tuple(ids) for gram, ids in postings.items()},
+    )
+
+
+class GenreResolver:
+    """Fuzzy lookup of taxonomy entries by name or path."""
+
+    def __init__(self, taxonomy: Taxonomy, cache_path: Optional[Path] = None, cache_size: int = 1024):
+        """
+        Args:
+            taxonomy: The category taxonomy to index
+            cache_path: Where the index is cached, or None to always build it
+            cache_size: Number of resolved texts kept
+        """
+        # Only a taxonomy loaded from a file has a source hash to key the cache by
+        if not taxonomy.source_sha256:
+            cache_path = None
+        artifact_key = ("genre_index", _INDEX_FORMAT, taxonomy.source_sha256)
+        index = read_artifact(cache_path, artifact_key) if cache_path else None
+        if index is None:
+            index = _build_index(taxonomy)
+            if cache_path:
+                write_artifact(cache_path, artifact_key, index)
+        self._keys, self._key_nodes, self._key_sizes, self._postings = index
+        self._key_ids: Dict[str, int] = {key: i for i, key in enumerate(self._keys)}
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _resolve(self, text: str, limit: int = 3) -> Tuple[GenreMatch, ...]:
+        """
+        Taxonomy entries matching a genre text, best first.
+
+        Args:
+            text: Free-text genre, a name or a path ("Sports - Football")
+            limit: Maximum number of matches
+
+        Returns:
+            Tuple[GenreMatch, ...]: Matches with scores in [MIN_SCORE, 1]; 1 for an exact match
+        """
+        key = fold(text)
+        if not key:
+            return ()
+        exact = self._key_ids.get(key)
+        if exact is not None:
+            return tuple(GenreMatch(node, node_path(node), 1.0) for node in self._key_nodes[exact][:limit])
+
+        grams = _trigrams(key)
+        size = len(grams)
+        # Number of trigrams each indexed key shares with the text
+        shared = Counter(chain.from_iterable(self._postings.get(gram, ()) for gram in grams))
+        # Dice coefficient; keys sharing fewer trigrams than this cannot reach MIN_SCORE
+        least = MIN_SCORE * size / 2
+        key_sizes = self._key_sizes
+        scored = heapq.nlargest(limit * 4, (
+            (2.0 * overlap / (size + key_sizes[i]), i) for i, overlap in shared.items() if overlap >= least
+        ))
+        matches: List[GenreMatch] = []
+        seen = set()
+        for score, i in scored:
+            if score < MIN_SCORE or len(matches) >= limit:
+                break
+            for node in self._key_nodes[i]:
+                if node not in seen:
+                    seen.add(node)
+                    matches.append(GenreMatch(node, node_path(node), round(score, 3)))
+        return tuple(matches[:limit])
+
+    def canonicalize(self, text: str) -> Optional[str]:
+        """
+        The canonical "Segment - Genre" form of a genre text, if it names one
+        taxonomy genre. A subgenre resolves to its genre ("Heavy Metal" to
+        "Music - Metal"), since the search API only filters by genre.
+
+        Returns:
+            Optional[str]: The genre path, or None when nothing matches well
+            enough or the best matches are tied between genres
+        """
+        matches = self.resolve(text)
+        if not matches:
+            return None
+        best = genre_path(matches[0].node)
+        if len(matches) > 1 and matches[1].score >= matches[0].score and genre_path(matches[1].node) != best:
+            return None
+        return best
+
+
+_resolver: Optional[GenreResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_genre_resolver() -> GenreResolver:
+    """Get the process-wide resolver over the shared taxonomy, building it on first use."""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = GenreResolver(get_taxonomy(), GENRE_INDEX_CACHE_PATH)
+    return _resolver
@@ -0,0 +1,239 @@
+"""
+HTTP Client
+
+A shared, pooled HTTP layer for the event tools. All outgoing API requests go
+through one keep-alive connection pool per event loop, so repeated calls to
+the same host reuse TCP+TLS connections instead of handshaking every time.
+Requests are retried with jittered exponential backoff on 429 and 5xx
+responses and on transport errors, and concurrent requests per host are
+capped. Large bodies can be streamed instead of buffered.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from services.async_runner import LoopLocal
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_PER_HOST_LIMIT = 10
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.25
+DEFAULT_BACKOFF_MAX = 4.0
+
+
+class _ConnectionTrace:
+    """httpcore trace hook recording whether a request opened a new connection."""
+
+    def __init__(self):
+        self.new_connection = False
+
+    async def __call__(self, event_name: str, info: Dict[str, Any]) -> None:
+        if event_name.startswith("connection.connect_") and event_name.endswith(".started"):
+            self.new_connection = True
+
+
+class HttpClient:
+    """Pooled keep-alive HTTP client with retries and per-host concurrency limits."""
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_max: float = DEFAULT_BACKOFF_MAX,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Args:
+            timeout: Default request timeout in seconds
+            max_connections: Maximum number of open connections in the pool
+            max_keepalive_connections: Maximum number of idle connections kept alive
+            keepalive_expiry: Seconds an idle connection is kept alive
+            per_host_limit: Maximum number of concurrent requests to a single host
+            max_retries: Number of retries after the first attempt
+            backoff_base: Base delay of the exponential backoff in seconds
+            backoff_max: Upper bound of a single backoff delay in seconds
+            transport: Optional custom transport (for example httpx.MockTransport in tests)
+        """
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.per_host_limit = per_host_limit
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.transport = transport
+        self._clients: LoopLocal[httpx.AsyncClient] = LoopLocal(self._create_client)
+        self._host_semaphores: LoopLocal[Dict[str, asyncio.Semaphore]] = LoopLocal(dict)
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "new_connections": 0, "reused_connections": 0, "retries": 0}
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=self.timeout, limits=self.limits, transport=self.transport)
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        semaphores = self._host_semaphores.get()
+        semaphore = semaphores.get(host)
+        if semaphore is None:
+            semaphore = semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return semaphore
+
+    def _count(self, **increments: int) -> None:
+        with self._stats_lock:
+            for name, value in increments.items():
+                self._stats[name] += value
+
+    def _backoff_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Delay before the next attempt: Retry-After if given, otherwise full-jitter backoff."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.backoff_max)
+                except ValueError:
+                    pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        """
+        Send a GET request through the shared pool.
+
+        Retries on 429/5xx responses and transport errors. The final response is
+        returned as is; callers decide how to handle its status.
+
+        Raises:
+            httpx.HTTPError: If the last attempt fails with a transport error
+        """
+        return await self._send(url, params, headers, timeout, stream=False)
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Send a GET request and stream the response body.
+
+        Retries like `get` until a final response arrives; its body is then read
+        by the caller (e.g. with `response.aiter_bytes()`) inside the context.
+        The request counts against the per-host limit until the context exits.
+
+        Raises:
+            httpx.HTTPError: If the last attempt fails with a transport error
+        """
+        response = await self._send(url, params, headers, timeout, stream=True)
+        try:
+            yield response
+        finally:
+            try:
+                await response.aclose()
+            finally:
+                self._host_semaphore(httpx.URL(url).host).release()
+
+    async def _send(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        timeout: Optional[float],
+        stream: bool,
+    ) -> httpx.Response:
+        """
+        Send a GET request with retries.
+
+        For streamed responses the per-host slot stays acquired when the final
+        response is returned; the caller releases it after closing the response.
+        """
+        client = self._clients.get()
+        semaphore = self._host_semaphore(httpx.URL(url).host)
+        attempt = 0
+        while True:
+            trace = _ConnectionTrace()
+            request = client.build_request(
+                "GET",
+                url,
+                params=params,
+                headers=headers,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+                extensions={"trace": trace},
+            )
+            await semaphore.acquire()
+            keep_slot = False
+            try:
+                response = await client.send(request, stream=stream)
+            except httpx.TransportError as e:
+                self._count(requests=1, new_connections=int(trace.new_connection))
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning(f"Request to {url} failed ({e}); retrying in {delay:.2f}s")
+            else:
+                self._count(
+                    requests=1,
+                    new_connections=int(trace.new_connection),
+                    reused_connections=int(not trace.new_connection),
+                )
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    keep_slot = stream
+                    return response
+                if stream:
+                    await response.aclose()
+                delay = self._backoff_delay(attempt, response)
+                logger.warning(f"Request to {url} returned {response.status_code}; retrying in {delay:.2f}s")
+            finally:
+                if not keep_slot:
+                    semaphore.release()
+            self._count(retries=1)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Request, retry and connection reuse counters."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        connections = stats["new_connections"] + stats["reused_connections"]
+        stats["reuse_rate"] = round(stats["reused_connections"] / connections, 4) if connections else 0.0
+        return stats
+
+
+_default_client: Optional[HttpClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Get the process-wide HTTP client shared by all event tools."""
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = HttpClient()
+    return _default_client
@@ -0,0 +1,171 @@
+"""
+JSON Stream
+
+Incremental decoding of JSON objects whose bulk is a single array, such as an
+event search response: `{"events": [{...}, {...}, ...], "totalCount": 200}`.
+
+Bytes are fed in as they arrive from the socket. Each element of the watched
+array is decoded and handed out as soon as it is complete, so the whole body
+never has to be buffered and the elements can be processed (and dropped)
+while the download is still running. All other top-level values are small and
+are decoded whole.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+# Decoder states
+_OBJECT_START = "object_start"
+_KEY = "key"
+_COLON = "colon"
+_VALUE = "value"
+_ARRAY_ITEM = "array_item"
+_DONE = "done"
+
+
+class JsonArrayStreamDecoder:
+    """
+    Push-based decoder streaming the elements of one top-level array.
+
+    Example:
+        decoder = JsonArrayStreamDecoder(("events", "items"))
+        async for chunk in response.aiter_bytes():
+            for event in decoder.feed(chunk):
+                handle(event)
+        decoder.close()
+        total = decoder.fields.get("totalCount")
+    """
+
+    def __init__(self, array_keys: Sequence[str]):
+        """
+        Args:
+            array_keys: Top-level keys whose array is streamed. Only the first one
+                        found in the document is streamed; later ones are decoded
+                        whole into `fields`.
+        """
+        self.array_keys = tuple(array_keys)
+        self.array_key: Optional[str] = None
+        self.fields: Dict[str, Any] = {}
+        self.items_decoded = 0
+        self._text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _OBJECT_START
+        self._key: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the closing brace of the top-level object was read."""
+        return self._state == _DONE
+
+    def feed(self, data: bytes) -> List[Any]:
+        """
+        Feed the next chunk of the body.
+
+        Returns:
+            List: Array elements completed by this chunk, in document order
+
+        Raises:
+            ValueError: If the document is not valid JSON of the expected form
+        """
+        self._buffer = self._buffer[self._pos:] + self._text_decoder.decode(data)
+        self._pos = 0
+        return self._drain(final=False)
+
+    def close(self) -> List[Any]:
+        """
+        Signal the end of the body.
+
+        Returns:
+            List: Array elements that were waiting for the end of input
+
+        Raises:
+            ValueError: If the document is incomplete
+        """
+        self._buffer = self._buffer[self._pos:] + self._text_decoder.decode(b"", final=True)
+        self._pos = 0
+        items = self._drain(final=True)
+        if self._state != _DONE:
+            raise ValueError("Incomplete JSON document")
+        return items
+
+    def _skip_whitespace(self) -> Optional[str]:
+        """Advance past whitespace; the next character, or None if the buffer is exhausted."""
+        buffer = self._buffer
+        pos = self._pos = _WHITESPACE.match(buffer, self._pos).end()
+        return buffer[pos] if pos < len(buffer) else None
+
+    def _decode_value(self, final: bool) -> Tuple[bool, Any]:
+        """Decode the value at the current position, if it is complete."""
+        try:
+            value, end = _decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise ValueError(f"Invalid JSON at offset {self._pos}")
+            return False, None
+        # Numbers and literals are not self-delimiting: "12" may continue as "123"
+        if end == len(self._buffer) and not final and not isinstance(value, (dict, list, str)):
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _drain(self, final: bool) -> List[Any]:
+        items = []
+        while True:
+            char = self._skip_whitespace()
+            if char is None:
+                return items
+            state = self._state
+            if state == _OBJECT_START:
+                if char != "{":
+                    raise ValueError("Expected a JSON object")
+                self._pos += 1
+                self._state = _KEY
+            elif state == _KEY:
+                if char == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                elif char == ",":
+                    self._pos += 1
+                else:
+                    if char != '"':
+                        raise ValueError(f"Expected an object key at offset {self._pos}")
+                    complete, self._key = self._decode_value(final)
+                    if not complete:
+                        return items
+                    self._state = _COLON
+            elif state == _COLON:
+                if char != ":":
+                    raise ValueError(f"Expected ':' at offset {self._pos}")
+                self._pos += 1
+                self._state = _VALUE
+            elif state == _VALUE:
+                if char == "[" and self.array_key is None and self._key in self.array_keys:
+                    self.array_key = self._key
+                    self._pos += 1
+                    self._state = _ARRAY_ITEM
+                else:
+                    complete, value = self._decode_value(final)
+                    if not complete:
+                        return items
+                    self.fields[self._key] = value
+                    self._state = _KEY
+            elif state == _ARRAY_ITEM:
+                if char == "]":
+                    self._pos += 1
+                    self._state = _KEY
+                elif char == ",":
+                    self._pos += 1
+                else:
+                    complete, value = self._decode_value(final)
+                    if not complete:
+                        return items
+                    items.append(value)
+                    self.items_decoded += 1
+            else:
+                raise ValueError(f"Unexpected data after the JSON document at offset {self._pos}")
@@ -0,0 +1,122 @@
+"""
+Micro-batcher
+
+Coalesces single-item requests made concurrently -- by different sessions or
+tasks -- into batched calls. Items submitted on an event loop are collected
+for a short window, or until the batch is full, then handed to the flush
+function as one list; each caller gets back its own result.
+
+Pending items are kept per event loop (the background loop of the sync
+wrappers, or an application's own loop), as the flush function normally uses
+loop-bound clients.
+"""
+
+import asyncio
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Generic, List, Optional, Set, Tuple, TypeVar
+
+from services.async_runner import LoopLocal
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Number of most recent batches and items kept for windowed statistics
+DEFAULT_HISTORY_SIZE = 1000
+
+
+class _Pending(Generic[T, R]):
+    """Items waiting for the next batch of one event loop."""
+
+    def __init__(self):
+        self.items: List[Tuple[T, "asyncio.Future[R]", float]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class MicroBatcher(Generic[T, R]):
+    """Collects items for a few milliseconds and processes them as one batch."""
+
+    def __init__(self, flush: Callable[[List[T]], Awaitable[List[R]]], window: float = 0.005,
+                 max_batch_size: int = 32, history_size: int = DEFAULT_HISTORY_SIZE):
+        """
+        Args:
+            flush: Processes a batch, returning one result per item in order
+            window: Seconds to wait for more items after the first one of a batch
+            max_batch_size: A batch is sent as soon as it holds this many items
+            history_size: Number of recent batch sizes and queueing delays kept for statistics
+        """
+        self._flush_batch = flush
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: LoopLocal[_Pending[T, R]] = LoopLocal(_Pending)
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.full_batches = 0
+        self.batch_sizes: Deque[int] = deque(maxlen=history_size)
+        self.queue_delays: Deque[float] = deque(maxlen=history_size)
+
+    async def submit(self, item: T) -> R:
+        """Add an item to the next batch and wait for its result."""
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get()
+        future: "asyncio.Future[R]" = loop.create_future()
+        pending.items.append((item, future, time.perf_counter()))
+        if len(pending.items) >= self.max_batch_size:
+            self._flush(pending)
+        elif pending.timer is None:
+            pending.timer = loop.call_later(self.window, self._flush, pending)
+        return await future
+
+    def _flush(self, pending: _Pending[T, R]) -> None:
+        """Send the pending items of a loop as one batch."""
+        if pending.timer is not None:
+            pending.timer.cancel()
+            pending.timer = None
+        batch, pending.items = pending.items, []
+        if not batch:
+            return
+        now = time.perf_counter()
+        with self._stats_lock:
+            self.batches += 1
+            self.items += len(batch)
+            self.full_batches += len(batch) >= self.max_batch_size
+            self.batch_sizes.append(len(batch))
+            self.queue_delays.extend(now - queued_at for _, _, queued_at in batch)
+        task = asyncio.get_running_loop().create_task(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[Tuple[T, "asyncio.Future[R]", float]]) -> None:
+        try:
+            results = await self._flush_batch([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Batch of {len(batch)} items returned {len(results)} results")
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future, _), result in zip(batch, results):
+            # A caller may have been cancelled while its batch was in flight
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch sizes and the queueing delay added to items, in milliseconds."""
+        with self._stats_lock:
+            sizes = list(self.batch_sizes)
+            delays = sorted(self.queue_delays)
+            stats: Dict[str, Any] = {
+                "batches": self.batches,
+                "items": self.items,
+                "full_batches": self.full_batches,
+            }
+        stats["mean_batch_size"] = round(statistics.mean(sizes), 2) if sizes else 0.0
+        stats["max_batch_size"] = max(sizes, default=0)
+        stats["queue_delay_ms_p50"] = round(delays[len(delays) // 2] * 1000, 3) if delays else 0.0
+        stats["queue_delay_ms_p95"] = round(delays[int(len(delays) * 0.95)] * 1000, 3) if delays else 0.0
+        return stats
@@ -0,0 +1,371 @@
+"""
+Moderation backends.
+
+A moderation backend turns a batch of texts into verdicts. The moderation
+service puts its verdict cache, micro-batching and outage handling in front
+of whichever backend it is given:
+
+- OpenAIModerationBackend: OpenAI's moderation endpoint
+- LocalModerationBackend: an offline stand-in deciding every text locally,
+  for tests and benchmarks
+
+LocalScreener is the first tier in front of the backend. It only decides
+the obvious harmful cases in-process, in microseconds: texts matching one of
+its compiled block patterns, or with a very high risk score, are flagged.
+Everything else goes to the backend; a lexicon this small cannot tell that
+a text is safe. The only local clears are exact matches of an optional,
+vetted allowlist of short messages, which is off by default.
+Its risk-term scores are a small linear (noisy-OR) classifier over a
+hand-weighted lexicon; the repo has no labelled data to fit one.
+"""
+
+import asyncio
+import math
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from openai import AsyncOpenAI
+
+from services.async_runner import LoopLocal
+
+
+class ModerationUnavailableError(RuntimeError):
+    """The moderation backend could not produce verdicts."""
+
+
+@dataclass(frozen=True)
+class ModerationVerdict:
+    """The moderation result of one text: flag, categories and scores."""
+
+    flagged: bool
+    categories: Dict[str, bool] = field(default_factory=dict)
+    category_scores: Dict[str, float] = field(default_factory=dict)
+    # Only reported by the omni model
+    category_applied_input_types: Optional[Dict[str, Any]] = None
+    model: str = ""
+    # What decided the verdict: a backend name, "screen", or "fallback" during an outage
+    source: str = ""
+
+    @classmethod
+    def from_result(cls, result: Any, model: str, source: str = "openai") -> "ModerationVerdict":
+        """Build a verdict from one result of a moderation API response."""
+        input_types = getattr(result, "category_applied_input_types", None)
+        return cls(
+            flagged=result.flagged,
+            categories=result.categories.model_dump(),
+            category_scores=result.category_scores.model_dump(),
+            category_applied_input_types=input_types.model_dump() if input_types is not None else None,
+            model=model,
+            source=source,
+        )
+
+    @property
+    def flagged_categories(self) -> List[str]:
+        """Names of the categories the text was flagged for."""
+        return [category for category, flagged in self.categories.items() if flagged]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The verdict in the format of a moderation analysis result."""
+        result = {
+            "flagged": self.flagged,
+            "categories": dict(self.categories),
+            "category_scores": dict(self.category_scores),
+        }
+        if self.category_applied_input_types is not None:
+            result["category_applied_input_types"] = dict(self.category_applied_input_types)
+        if self.source:
+            result["source"] = self.source
+        return result
+
+
+class ModerationBackend(ABC):
+    """Produces moderation verdicts for batches of texts."""
+
+    # Identifies the backend in cache keys and verdicts
+    name: str = ""
+
+    @abstractmethod
+    async def moderate(self, texts: List[str]) -> List[ModerationVerdict]:
+        """
+        Moderate a batch of texts.
+
+        Returns:
+            One verdict per text, in order
+
+        Raises:
+            ModerationUnavailableError: If the backend cannot produce verdicts
+        """
+        raise NotImplementedError("Subclasses should implement this method.")
+
+
+class OpenAIModerationBackend(ModerationBackend):
+    """OpenAI's moderation endpoint; a batch is one list request."""
+
+    def __init__(self, clients: LoopLocal[AsyncOpenAI], model: str):
+        """
+        Args:
+            clients: Per-loop AsyncOpenAI clients
+            model: The moderation model to use
+        """
+        self.clients = clients
+        self.model = model
+
+    @property
+    def name(self) -> str:
+        return f"openai:{self.model}"
+
+    async def moderate(self, texts: List[str]) -> List[ModerationVerdict]:
+        try:
+            response = await self.clients.get().moderations.create(model=self.model, input=texts)
+        except Exception as e:
+            raise ModerationUnavailableError(f"Moderation API request failed: {e}") from e
+        if len(response.results) != len(texts):
+            raise ModerationUnavailableError(
+                f"Moderation API returned {len(response.results)} results for {len(texts)} texts")
+        return [ModerationVerdict.from_result(result, self.model) for result in response.results]
+
+
+# Phrases flagged by the screener without asking the backend, per category. They must
+# be unambiguous: band names ("Die Toten Hosen", "Sex Pistols"), craft ("bath bomb") and
+# mentions of a topic ("the mass shooting") are left to the backend.
+BLOCK_PATTERNS: Dict[str, List[str]] = {
+    "violence": [
+        r"\b(?:make|making|build|building|plant|planting|detonate)\s+(?:a\s+|an\s+|some\s+)?"
+        r"(?:pipe\s+|nail\s+|car\s+|dirty\s+|fertilizer\s+)?(?:bomb|explosive|ied)s?\b",
+        r"\bshoot\s+up\s+(?:a|the|my)\s+(?:school|church|mosque|synagogue|office|mall|crowd)\b",
+    ],
+    "harassment_threatening": [
+        r"\bi\s*(?:'ll|will|am\s+going\s+to|'m\s+going\s+to|gonna)\s+(?:kill|hurt|stab|shoot)\s+you\b",
+        r"\byou\s+(?:deserve|ought)\s+to\s+die\b",
+    ],
+    "self_harm_intent": [
+        # First person only, and "die" only at the end of a clause ("I want to die.")
+        r"\bi\s*(?:really\s+)?(?:want|wanna|am\s+going|'m\s+going|plan)\s+to\s+"
+        r"(?:kill\s+myself|hurt\s+myself|end\s+my\s+life|end\s+it\s+all|die\s*(?:[.!,;]|$))",
+    ],
+    "self_harm_instructions": [
+        r"\bhow\s+(?:do\s+i|to|can\s+i)\s+(?:kill\s+myself|commit\s+suicide)\b",
+    ],
+    "illicit": [
+        r"\b(?:buy|sell|selling|buying)\s+(?:some\s+)?(?:cocaine|heroin|meth|fentanyl)\b",
+        r"\b(?:buy|make|get)\s+(?:a\s+|some\s+)?fake\s+(?:ids?|passports?)\b",
+    ],
+    "sexual_minors": [
+        r"\b(?:nude|naked|sexual)\s+(?:photos?|pictures?|pics|images?|videos?)\s+of\s+(?:a\s+)?"
+        r"(?:minors?|child|children|kids?)\b",
+        r"\b(?:sex|sexual\s+contact)\s+with\s+(?:a\s+)?(?:minors?|child|children|kids?)\b",
+    ],
+}
+
+# Risk terms with their weight towards a category. A text is flagged by the screener
+# when its score is very high, and during a backend outage when it is high.
+RISK_TERMS: Dict[str, Dict[str, float]] = {
+    "violence": {
+        "kill": 0.5, "murder": 0.6, "bomb": 0.6, "explosive": 0.5, "shoot": 0.4, "shooting": 0.4, "gun": 0.3,
+        "weapon": 0.4, "stab": 0.5, "attack": 0.3, "massacre": 0.6, "terrorist": 0.5, "blood": 0.2, "behead": 0.7,
+        "torture": 0.6, "assault": 0.4, "hostage": 0.5, "die": 0.2, "dead": 0.2, "hurt": 0.3, "ied": 0.5,
+    },
+    "harassment": {
+        "idiot": 0.4, "stupid": 0.3, "moron": 0.4, "loser": 0.3, "ugly": 0.3, "pathetic": 0.3, "worthless": 0.4,
+        "shut": 0.2, "dumb": 0.3, "hate": 0.2, "disgusting": 0.3,
+    },
+    "hate": {
+        "nazi": 0.5, "supremacy": 0.5, "supremacist": 0.6, "inferior": 0.3, "genocide": 0.7, "subhuman": 0.7,
+        "vermin": 0.5,
+    },
+    "self_harm": {
+        "suicide": 0.6, "suicidal": 0.6, "overdose": 0.5, "selfharm": 0.6, "cut": 0.1, "starve": 0.3,
+    },
+    "sexual": {
+        "sex": 0.4, "sexual": 0.3, "nude": 0.5, "naked": 0.4, "porn": 0.7, "erotic": 0.5, "orgasm": 0.7,
+        "fetish": 0.5, "explicit": 0.2, "escort": 0.4,
+    },
+    "illicit": {
+        "cocaine": 0.5, "heroin": 0.6, "meth": 0.5, "fentanyl": 0.6, "drug": 0.3, "steal": 0.4, "hack": 0.3,
+        "counterfeit": 0.5, "smuggle": 0.5, "launder": 0.5, "scalp": 0.2,
+    },
+}
+
+# Words besides the risk terms that a block pattern needs. The patterns only run on
+# texts containing one of these or a risk term, so every pattern must contain one.
+BLOCK_TRIGGERS = ("myself", "life", "fake")
+
+# Score at which risk terms alone flag a text without asking the backend
+DEFAULT_FLAG_THRESHOLD = 0.95
+# Score at which risk terms flag a text the backend could not decide
+DEFAULT_FALLBACK_THRESHOLD = 0.7
+# Texts longer than this are always left to the backend
+DEFAULT_MAX_SCREEN_CHARS = 4000
+
+# Common obfuscations folded before matching
+_LEET = str.maketrans({"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "@": "a", "$": "s"})
+_WORD = re.compile(r"[a-z]+")
+
+# Short messages that may be cleared without the backend, for a screener created with
+# `allowlist=SMALL_TALK`; a text is cleared only if it is one of them as a whole
+SMALL_TALK = (
+    "hi", "hello", "hey", "thanks", "thank you", "thanks a lot", "ok", "okay", "yes", "no", "great", "perfect",
+    "bye", "goodbye",
+)
+
+
+def _normalize(text: str) -> str:
+    return text.casefold().translate(_LEET)
+
+
+def _allowlist_key(text: str) -> str:
+    """The text casefolded, with whitespace collapsed and surrounding punctuation removed."""
+    return " ".join(text.casefold().split()).strip(".,!?;: ")
+
+
+def _forms(term: str) -> List[str]:
+    """The term and its inflected forms (kill, kills, killed, killing, killer, ...)."""
+    if term.endswith("e"):
+        suffixes = ("s", "d", "r", "rs") + (("ing",) if len(term) > 3 else ())
+        return [term] + [(term[:-1] if suffix == "ing" else term) + suffix for suffix in suffixes]
+    plural = "es" if term.endswith(("s", "x", "z", "ch", "sh")) else "s"
+    if 3 <= len(term) <= 4 and term[-1] not in "aeiouwxy" and term[-2] in "aeiou" and term[-3] not in "aeiou":
+        # Short words double the final consonant: stab -> stabbing, cut -> cutting
+        stem = term + term[-1]
+    else:
+        stem = term
+    return [term, term + plural] + [stem + suffix for suffix in ("ed", "ing", "er", "ers")]
+
+
+class LocalScreener:
+    """In-process first-tier screen: flags obvious harmful texts, leaves the rest to a backend."""
+
+    def __init__(self, block_patterns: Optional[Dict[str, List[str]]] = None,
+                 risk_terms: Optional[Dict[str, Dict[str, float]]] = None,
+                 flag_threshold: float = DEFAULT_FLAG_THRESHOLD, max_chars: int = DEFAULT_MAX_SCREEN_CHARS,
+                 fallback_threshold: float = DEFAULT_FALLBACK_THRESHOLD, allowlist: Iterable[str] = ()):
+        """
+        Args:
+            block_patterns: Regular expressions flagged outright, per category
+            risk_terms: Term weights per category; defaults to RISK_TERMS
+            flag_threshold: Risk score at which a text is flagged without the backend
+            max_chars: Longer texts are left to the backend
+            fallback_threshold: Risk score at which a text the backend could not decide is flagged
+            allowlist: Vetted short messages (e.g. SMALL_TALK) cleared without the backend;
+                       by default no text is cleared locally
+        """
+        block_patterns = BLOCK_PATTERNS if block_patterns is None else block_patterns
+        risk_terms = RISK_TERMS if risk_terms is None else risk_terms
+        # One compiled alternation; the name of the matching group is the category
+        self._groups: Dict[str, str] = {}
+        alternatives = []
+        for category, patterns in block_patterns.items():
+            for pattern in patterns:
+                group = f"p{len(self._groups)}"
+                self._groups[group] = category
+                alternatives.append(f"(?P<{group}>{pattern})")
+        self._block = re.compile("|".join(alternatives)) if alternatives else None
+        # Every form of every term, so a word costs one lookup; triggers map to no weights
+        self._terms: Dict[str, List[Tuple[str, float]]] = {}
+        for trigger in BLOCK_TRIGGERS:
+            self._terms[trigger] = []
+        for category, terms in risk_terms.items():
+            for term, weight in terms.items():
+                for form in _forms(term):
+                    self._terms.setdefault(form, []).append((category, weight))
+        self.categories = sorted(set(block_patterns) | set(risk_terms))
+        self.flag_threshold = flag_threshold
+        self.max_chars = max_chars
+        self.fallback_threshold = fallback_threshold
+        self.allowlist = frozenset(_allowlist_key(text) for text in allowlist)
+        self._cleared = self.verdict({}, [], False, "screen")
+
+    def scores(self, text: str) -> Tuple[Dict[str, float], List[str]]:
+        """
+        Score a text.
+
+        Returns:
+            The risk score per category (noisy-OR of the matched term weights), and the
+            categories of the block patterns that matched
+        """
+        normalized = _normalize(text)
+        log_clean: Dict[str, float] = {}
+        triggered = False
+        for word in _WORD.findall(normalized):
+            matches = self._terms.get(word)
+            if matches is not None:
+                triggered = True
+                for category, weight in matches:
+                    log_clean[category] = log_clean.get(category, 0.0) + math.log1p(-weight)
+        blocked: List[str] = []
+        if triggered and self._block is not None:
+            for match in self._block.finditer(normalized):
+                category = self._groups[match.lastgroup]
+                if category not in blocked:
+                    blocked.append(category)
+        return {category: 1.0 - math.exp(value) for category, value in log_clean.items()}, blocked
+
+    def verdict(self, scores: Dict[str, float], blocked: List[str], flagged: bool, source: str) -> ModerationVerdict:
+        """Build a verdict from the scores of a text."""
+        categories = {category: category in blocked or scores.get(category, 0.0) >= self.flag_threshold
+                      for category in self.categories}
+        if flagged and not any(categories.values()) and scores:
+            categories[max(scores, key=scores.get)] = True
+        category_scores = {category: 1.0 if category in blocked else round(scores.get(category, 0.0), 4)
+                           for category in self.categories}
+        return ModerationVerdict(flagged=flagged, categories=categories, category_scores=category_scores,
+                                 model="local", source=source)
+
+    def screen(self, text: str) -> Optional[ModerationVerdict]:
+        """
+        Flag an obvious harmful text, or clear an allowlisted one. Returns None if the
+        text must be left to the backend.
+        """
+        if len(text) > self.max_chars:
+            return None
+        if self.allowlist and _allowlist_key(text) in self.allowlist:
+            return self._cleared
+        scores, blocked = self.scores(text)
+        if blocked or (scores and max(scores.values()) >= self.flag_threshold):
+            return self.verdict(scores, blocked, True, "screen")
+        return None
+
+    def fallback(self, text: str) -> ModerationVerdict:
+        """
+        Verdict for a text the backend could not decide: flagged if a block pattern
+        matches or its risk score reaches `fallback_threshold`.
+        """
+        scores, blocked = self.scores(text)
+        flagged = bool(blocked) or any(score >= self.fallback_threshold for score in scores.values())
+        return self.verdict(scores, blocked, flagged, "fallback")
+
+
+class LocalModerationBackend(ModerationBackend):
+    """Offline stand-in backend deciding every text with the local screener's scores."""
+
+    name = "local"
+
+    def __init__(self, screener: Optional[LocalScreener] = None, flag_threshold: float = 0.5,
+                 latency: float = 0.0):
+        """
+        Args:
+            screener: Scores the texts; defaults to a screener with the default lexicon
+            flag_threshold: Risk score at which a text is flagged
+            latency: Seconds each batch takes, to simulate a remote backend
+        """
+        self.screener = screener or LocalScreener()
+        self.flag_threshold = flag_threshold
+        self.latency = latency
+        self.batches = 0
+
+    async def moderate(self, texts: List[str]) -> List[ModerationVerdict]:
+        self.batches += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        verdicts = []
+        for text in texts:
+            scores, blocked = self.screener.scores(text)
+            flagged = bool(blocked) or any(score >= self.flag_threshold for score in scores.values())
+            verdicts.append(self.screener.verdict(scores, blocked, flagged, self.name))
+        return verdicts
+
+
+# Shared by all moderation services; its compiled state is read-only
+DEFAULT_SCREENER = LocalScreener()
@@ -1,16 +1,32 @@
 """
 OpenAI Moderation Service.
-This module provides functionality to check content using OpenAI's Moderation API.
+This module provides functionality to check content using OpenAI's Moderation API,
+or another moderation backend (see services/moderation_backends.py).
 
 The Moderation API helps identify potentially harmful content in text and images.
 It supports multiple content categories like harassment, hate speech, self-harm,
 sexual content, violence, and more.
 """
 
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any
+import asyncio
+import hashlib
 import logging
-from openai import OpenAI
+import threading
+import time
+from openai import AsyncOpenAI
 from env_config import get_openai_api_key
+from services.async_runner import LoopLocal, run_sync
+from services.micro_batcher import MicroBatcher
+from services.moderation_backends import (
+    DEFAULT_SCREENER,
+    LocalScreener,
+    ModerationBackend,
+    ModerationUnavailableError,
+    ModerationVerdict,
+    OpenAIModerationBackend,
+)
+from services.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -18,15 +34,47 @@ logger = logging.getLogger(__name__)
 MODERATION_MODEL_OMNI = "omni-moderation-latest"  # Newer model with more categories and multi-modal support
 MODERATION_MODEL_TEXT = "text-moderation-latest"   # Legacy model for text only
 
+# Bounds of the verdict cache
+DEFAULT_VERDICT_CACHE_SIZE = 1024
+DEFAULT_VERDICT_TTL_SECONDS = 60 * 60
+
+# Texts checked concurrently, by any session, are sent as one list request
+DEFAULT_BATCH_WINDOW_SECONDS = 0.005
+DEFAULT_MAX_BATCH_SIZE = 32
+
+# Seconds the backend is skipped after it failed
+DEFAULT_BACKEND_COOLDOWN_SECONDS = 30.0
+# Backend calls for the same texts before the backend is considered down
+DEFAULT_BACKEND_ATTEMPTS = 2
+
 class ModerationService:
     """Service for checking content against OpenAI's Moderation API.
     
     This service uses OpenAI's moderation endpoint to detect potentially harmful
     content across multiple categories including harassment, hate speech, 
     self-harm, sexual content, violence, and illicit activities.
+
+    Obviously harmful texts are flagged in-process by a local screener. The
+    verdict of any other text is computed by one backend call and kept in a bounded LRU
+    cache keyed by the backend and the hash of the text, so checking a text
+    and then asking for its categories or scores costs a single round trip.
+    Uncached texts go through a micro-batcher: texts checked within a few
+    milliseconds of each other, from any session, share one API request.
+
+    If the backend fails, the call is retried once. If it fails again, the backend
+    is skipped for a cooldown period and the texts it should have decided are
+    moderated in a degraded mode: with a screener, only texts its fallback flags
+    (block patterns, high risk scores) are flagged and everything else passes;
+    without a screener, every such text is flagged (fail-closed).
     """
     
-    def __init__(self, model: str = MODERATION_MODEL_OMNI):
+    def __init__(self, model: str = MODERATION_MODEL_OMNI, api_key: Optional[str] = None,
+                 clients: Optional[LoopLocal[AsyncOpenAI]] = None,
+                 cache_size: int = DEFAULT_VERDICT_CACHE_SIZE, cache_ttl: float = DEFAULT_VERDICT_TTL_SECONDS,
+                 batch_window: float = DEFAULT_BATCH_WINDOW_SECONDS, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 backend: Optional[ModerationBackend] = None, screener: Optional[LocalScreener] = DEFAULT_SCREENER,
+                 backend_cooldown: float = DEFAULT_BACKEND_COOLDOWN_SECONDS,
+                 backend_attempts: int = DEFAULT_BACKEND_ATTEMPTS):
         """Initialize the moderation service with OpenAI client.
         
         Args:
@@ -34,14 +82,64 @@ class ModerationService:
                   Available options:
                   - omni-moderation-latest: Newer model with more categories and multi-modal support
                   - text-moderation-latest: Legacy model for text only
+            api_key: OpenAI API key; defaults to the environment
+            clients: Per-loop AsyncOpenAI clients to share with other services;
+                     by default the service creates its own
+            cache_size: Maximum number of cached verdicts
+            cache_ttl: Seconds a cached verdict stays valid
+            batch_window: Seconds to collect texts for one moderation request
+            max_batch_size: Maximum number of texts per moderation request
+            backend: Decides the texts the screener leaves open; defaults to
+                     OpenAI's moderation endpoint with `model`
+            screener: First-tier local screener, or None to send every text to the backend
+            backend_cooldown: Seconds the backend is skipped after it failed
+            backend_attempts: Backend calls for the same texts before the backend is skipped
         """
-        api_key = get_openai_api_key()
-        if not api_key:
-            raise ValueError("OpenAI API key is required for moderation service")
-        self.client = OpenAI(api_key=api_key)
-        self.model = model
+        self.clients = clients
+        if backend is None:
+            api_key = api_key or get_openai_api_key()
+            if not api_key:
+                raise ValueError("OpenAI API key is required for moderation service")
+            # One AsyncOpenAI client per event loop (the shared loop for sync callers)
+            self.clients = clients or LoopLocal(lambda: AsyncOpenAI(api_key=api_key))
+            backend = OpenAIModerationBackend(self.clients, model)
+        self.backend = backend
+        self.screener = screener
+        self.backend_cooldown = backend_cooldown
+        self.backend_attempts = max(1, backend_attempts)
+        self._backend_down_until = 0.0
+        self.cache: TTLCache[ModerationVerdict] = TTLCache(max_entries=cache_size, ttl=cache_ttl)
+        self.batcher: MicroBatcher[str, ModerationVerdict] = MicroBatcher(
+            self._moderate_batch, window=batch_window, max_batch_size=max_batch_size)
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.api_calls = 0
+        self.screened = 0
+        self.fallbacks = 0
+        self.backend_errors = 0
+
+    @property
+    def model(self) -> str:
+        """The moderation model of the backend."""
+        return getattr(self.backend, "model", self.backend.name)
+    
+    @property
+    def client(self) -> AsyncOpenAI:
+        """
+        The AsyncOpenAI client bound to the running event loop.
+
+        Raises:
+            ModerationUnavailableError: If the service has a custom backend and no OpenAI clients
+        """
+        if self.clients is None:
+            raise ModerationUnavailableError(f"The {self.backend.name} moderation backend has no OpenAI client")
+        return self.clients.get()
     
     def check_content(self, content: Union[str, List[str]]) -> Any:
+        """Synchronous wrapper around check_content_async."""
+        return run_sync(self.check_content_async(content))
+    
+    async def check_content_async(self, content: Union[str, List[str]]) -> Any:
         """
         Check if content violates OpenAI's content policy.
         
@@ -50,19 +148,125 @@ class ModerationService:
             
         Returns:
             OpenAI moderation response object
+
+        Raises:
+            ModerationUnavailableError: If the API request failed
         """
         try:
-            response = self.client.moderations.create(
+            response = await self.client.moderations.create(
                 model=self.model,
                 input=content
             )
             return response
         except Exception as e:
             logger.error(f"Error in moderation API: {e}")
-            # Return a simple dict that matches the expected structure
-            return {"id": "", "model": self.model, "results": [{"flagged": False}]}
+            raise ModerationUnavailableError(f"Moderation API request failed: {e}") from e
     
+    def get_verdicts(self, content: Union[str, List[str]]) -> List[ModerationVerdict]:
+        """Synchronous wrapper around get_verdicts_async."""
+        return run_sync(self.get_verdicts_async(content))
+
+    async def get_verdicts_async(self, content: Union[str, List[str]]) -> List[ModerationVerdict]:
+        """
+        Get the verdict for each text, calling the backend only for texts that the
+        screener leaves open and that are not in the cache.
+
+        Those texts are checked through the micro-batcher, in one backend call
+        together with the texts of concurrent callers. A failed call is retried;
+        if the retry fails too they get fallback verdicts, which are not cached.
+
+        Args:
+            content: A string or list of strings to check
+
+        Returns:
+            One verdict per input text, in input order
+        """
+        texts = [content] if isinstance(content, str) else list(content)
+        if not texts:
+            return []
+        keys = [self._cache_key(text) for text in texts]
+        verdicts: Dict[Tuple[str, str], ModerationVerdict] = {}
+        missing: Dict[Tuple[str, str], str] = {}
+        for key, text in zip(keys, texts):
+            if key in verdicts or key in missing:
+                continue
+            verdict = self.screener.screen(text) if self.screener is not None else None
+            if verdict is not None:
+                with self._stats_lock:
+                    self.screened += 1
+            else:
+                verdict = self.cache.get(key)
+            if verdict is None:
+                missing[key] = text
+            else:
+                verdicts[key] = verdict
+
+        with self._stats_lock:
+            self.requests += 1
+        attempt = 0
+        while missing and attempt < self.backend_attempts and time.monotonic() >= self._backend_down_until:
+            attempt += 1
+            try:
+                results = await asyncio.gather(*(self.batcher.submit(text) for text in missing.values()))
+            except Exception as e:
+                with self._stats_lock:
+                    self.backend_errors += 1
+                if attempt < self.backend_attempts:
+                    logger.warning(f"Moderation backend {self.backend.name} failed; retrying: {e}")
+                    continue
+                logger.error(f"Moderation backend {self.backend.name} failed; using fallback verdicts "
+                             f"for {self.backend_cooldown:g}s: {e}")
+                self._backend_down_until = time.monotonic() + self.backend_cooldown
+            else:
+                for key, verdict in zip(missing, results):
+                    verdicts[key] = verdict
+                    self.cache.put(key, verdict)
+                break
+        for key, text in missing.items():
+            if key not in verdicts:
+                verdicts[key] = self._fallback(text)
+        return [verdicts[key] for key in keys]
+
+    def _fallback(self, text: str) -> ModerationVerdict:
+        """
+        Verdict for a text the backend could not decide: the screener's degraded-mode
+        verdict, or flagged (fail-closed) without a screener.
+        """
+        with self._stats_lock:
+            self.fallbacks += 1
+        if self.screener is not None:
+            return self.screener.fallback(text)
+        return ModerationVerdict(flagged=True, model=self.model, source="fallback")
+
+    async def _moderate_batch(self, texts: List[str]) -> List[ModerationVerdict]:
+        """Check a batch of texts with one backend call."""
+        unique = list(dict.fromkeys(texts))
+        with self._stats_lock:
+            self.api_calls += 1
+        verdicts = dict(zip(unique, await self.backend.moderate(unique)))
+        return [verdicts[text] for text in texts]
+
+    def _cache_key(self, text: str) -> Tuple[str, str]:
+        return self.backend.name, hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def stats(self) -> Dict[str, Any]:
+        """Screening, verdict cache and batching counters, the API calls they saved, and backend failures."""
+        stats = self.cache.stats()
+        with self._stats_lock:
+            stats["requests"] = self.requests
+            stats["api_calls"] = self.api_calls
+            stats["api_calls_saved"] = self.requests - self.api_calls
+            stats["screened"] = self.screened
+            stats["fallbacks"] = self.fallbacks
+            stats["backend_errors"] = self.backend_errors
+        stats["batching"] = self.batcher.stats()
+        return stats
+
     def is_flagged(self, content: Union[str, List[str]]) -> bool:
+        """Synchronous wrapper around is_flagged_async."""
+        return run_sync(self.is_flagged_async(content))
+    
+    async def is_flagged_async(self, content: Union[str, List[str]]) -> bool:
         """
         Check if content is flagged by the moderation API.
         
@@ -73,20 +277,18 @@ class ModerationService:
             True if content is flagged, False otherwise
         """
         try:
-            response = self.check_content(content)
-            # Check if any content is flagged - handle both dict and response object
-            if hasattr(response, 'results'):
-                # It's a response object
-                return any(result.flagged for result in response.results)
-            else:
-                # It's a dict (fallback)
-                return any(result.get("flagged", False) for result in response.get("results", []))
+            verdicts = await self.get_verdicts_async(content)
+            return any(verdict.flagged for verdict in verdicts)
         except Exception as e:
             logger.error(f"Error checking moderation flag: {e}")
             # In case of error, default to not flagged to prevent blocking users
             return False
     
     def get_flagged_categories(self, content: Union[str, List[str]]) -> Dict[str, List[str]]:
+        """Synchronous wrapper around get_flagged_categories_async."""
+        return run_sync(self.get_flagged_categories_async(content))
+    
+    async def get_flagged_categories_async(self, content: Union[str, List[str]]) -> Dict[str, List[str]]:
         """
         Get detailed information about which categories were flagged.
         
@@ -112,49 +314,22 @@ class ModerationService:
             Dictionary mapping content to list of flagged categories
         """
         try:
-            response = self.check_content(content)
-            results = {}
-            
-            # Handle single string input
-            if isinstance(content, str):
-                contents = [content]
-            else:
-                contents = content
-            
-            # Handle different response types
-            if hasattr(response, 'results'):
-                # It's a response object
-                for i, c in enumerate(contents):
-                    if i < len(response.results):
-                        result = response.results[i]
-                        if result.flagged:
-                            # Get all flagged categories
-                            categories = result.categories.model_dump()
-                            flagged_categories = [
-                                category for category, flagged in categories.items()
-                                if flagged
-                            ]
-                            results[c] = flagged_categories
-            else:
-                # It's a dict (fallback)
-                for i, c in enumerate(contents):
-                    if i < len(response.get("results", [])):
-                        result = response["results"][i]
-                        if result.get("flagged", False):
-                            # Get all flagged categories
-                            categories = result.get("categories", {})
-                            flagged_categories = [
-                                category for category, flagged in categories.items()
-                                if flagged
-                            ]
-                            results[c] = flagged_categories
-            
-            return results
+            texts = [content] if isinstance(content, str) else list(content)
+            verdicts = await self.get_verdicts_async(texts)
+            return {
+                text: verdict.flagged_categories
+                for text, verdict in zip(texts, verdicts)
+                if verdict.flagged
+            }
         except Exception as e:
             logger.error(f"Error getting flagged categories: {e}")
             return {}
             
     def get_moderation_analysis(self, content: Union[str, List[str]]) -> Dict:
+        """Synchronous wrapper around get_moderation_analysis_async."""
+        return run_sync(self.get_moderation_analysis_async(content))
+    
+    async def get_moderation_analysis_async(self, content: Union[str, List[str]]) -> Dict:
         """
         Get full moderation analysis including scores for each category.
         
@@ -168,49 +343,11 @@ class ModerationService:
             Dictionary with detailed moderation analysis
         """
         try:
-            response = self.check_content(content)
-            
-            # Convert API response to a standard dictionary format
-            if hasattr(response, 'results'):
-                # It's a response object
-                analysis = {
-                    "flagged": any(result.flagged for result in response.results),
-                    "results": []
-                }
-                
-                for result in response.results:
-                    result_dict = {
-                        "flagged": result.flagged,
-                        "categories": result.categories.model_dump(),
-                        "category_scores": result.category_scores.model_dump()
-                    }
-                    
-                    # Add input types if available (omni model only)
-                    if hasattr(result, 'category_applied_input_types'):
-                        result_dict["category_applied_input_types"] = result.category_applied_input_types.model_dump()
-                    
-                    analysis["results"].append(result_dict)
-            else:
-                # It's a dict (fallback)
-                analysis = {
-                    "flagged": any(result.get("flagged", False) for result in response.get("results", [])),
-                    "results": []
-                }
-                
-                for result in response.get("results", []):
-                    result_dict = {
-                        "flagged": result.get("flagged", False),
-                        "categories": result.get("categories", {}),
-                        "category_scores": result.get("category_scores", {})
-                    }
-                    
-                    # Add input types if available (omni model only)
-                    if "category_applied_input_types" in result:
-                        result_dict["category_applied_input_types"] = result.get("category_applied_input_types", {})
-                    
-                    analysis["results"].append(result_dict)
-            
-            return analysis
+            verdicts = await self.get_verdicts_async(content)
+            return {
+                "flagged": any(verdict.flagged for verdict in verdicts),
+                "results": [verdict.to_dict() for verdict in verdicts],
+            }
         except Exception as e:
             logger.error(f"Error getting moderation analysis: {e}")
             return {"flagged": False, "results": []}
@@ -0,0 +1,158 @@
+"""
+Stream moderation
+
+Moderates a streamed reply while it is being generated. The text is cut into
+chunks at sentence boundaries once a chunk is long enough, and each chunk is
+checked in the background as soon as it is complete; the deltas keep flowing
+meanwhile. As soon as a chunk is flagged, the stream stops. When the stream
+ends only the last, unfinished chunk remains to be checked, so the verdict on
+the whole reply is ready shortly after the last token.
+
+Chunks are moderated independently of each other (and are batched with other
+sessions' checks by the moderation service).
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterator, List, Optional
+
+from services.async_runner import iterate_sync
+from services.moderation_service import ModerationService
+
+logger = logging.getLogger(__name__)
+
+# Minimum length of a chunk before it is cut at the next sentence boundary
+DEFAULT_MIN_CHUNK_CHARS = 120
+
+# End of a sentence (with closing quotes or brackets) followed by whitespace, or a line break
+SENTENCE_BOUNDARY = re.compile(r"[.!?…][\"')\]”]*\s+|\n+")
+
+
+class ModeratedStream:
+    """
+    Wraps a stream of content deltas, moderating it chunk by chunk.
+
+    Iterate it (with `for` or `async for`) instead of the wrapped stream. After
+    iteration, `flagged` and `flagged_categories` hold the verdict on all text
+    received; if a chunk was flagged, the stream stopped early and `stopped` is set.
+
+    A wrapped stream that can still withdraw its text once it is complete (e.g.
+    a StreamedTurn, through its `review`) can await `verdict()` at that point.
+    """
+
+    def __init__(self, deltas: AsyncIterable[str], moderation: ModerationService,
+                 min_chunk_chars: int = DEFAULT_MIN_CHUNK_CHARS):
+        """
+        Args:
+            deltas: The stream to moderate, e.g. a StreamedTurn
+            moderation: The moderation service checking the chunks
+            min_chunk_chars: Minimum length of a chunk before it is cut at a sentence boundary
+        """
+        self._deltas = deltas
+        self.moderation = moderation
+        self.min_chunk_chars = min_chunk_chars
+        self.flagged = False
+        self.flagged_categories: List[str] = []
+        self.stopped = False
+        self.chunks: List[str] = []
+        self._pending: List[str] = []
+        self._pending_chars = 0
+        self._checks: List["asyncio.Task[None]"] = []
+        self._ended = False
+        self.last_token_at: Optional[float] = None
+        self.verdict_at: Optional[float] = None
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        iterator = self._deltas.__aiter__()
+        try:
+            async for delta in iterator:
+                if self.flagged:
+                    self.stopped = True
+                    break
+                self._add(delta)
+                yield delta
+            else:
+                await self.verdict()
+            if self.stopped:
+                await asyncio.gather(*self._checks)
+                self.verdict_at = time.perf_counter()
+            if self.flagged:
+                logger.warning(f"Streamed response flagged by moderation. Categories: "
+                               f"{', '.join(self.flagged_categories)}")
+        finally:
+            for check in self._checks:
+                check.cancel()
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    def __iter__(self) -> Iterator[str]:
+        return iterate_sync(self.__aiter__())
+
+    async def verdict(self) -> bool:
+        """
+        Check the last chunk once the stream has ended and wait for all checks.
+        Returns False if any text was flagged.
+        """
+        if not self._ended:
+            self._ended = True
+            self.last_token_at = time.perf_counter()
+            self._check("".join(self._pending))
+        if self._checks:
+            await asyncio.gather(*self._checks)
+        if self.verdict_at is None:
+            self.verdict_at = time.perf_counter()
+        return not self.flagged
+
+    def _add(self, delta: str) -> None:
+        """Add a delta, cutting off and checking a chunk when one is complete."""
+        self._pending.append(delta)
+        self._pending_chars += len(delta)
+        if self._pending_chars < self.min_chunk_chars:
+            return
+        text = "".join(self._pending)
+        boundary = None
+        for boundary in SENTENCE_BOUNDARY.finditer(text, self.min_chunk_chars - 1):
+            pass
+        if boundary is None:
+            return
+        rest = text[boundary.end():]
+        self._pending, self._pending_chars = [rest], len(rest)
+        self._check(text[:boundary.end()])
+
+    def _check(self, chunk: str) -> None:
+        """Moderate a chunk in the background."""
+        if not chunk.strip():
+            return
+        self.chunks.append(chunk)
+        self._checks.append(asyncio.ensure_future(self._moderate(chunk)))
+
+    async def _moderate(self, chunk: str) -> None:
+        try:
+            verdict = (await self.moderation.get_verdicts_async(chunk))[0]
+        except Exception as e:
+            logger.error(f"Error during response moderation: {e}")
+            return
+        if verdict.flagged:
+            self.flagged = True
+            self.flagged_categories.extend(
+                category for category in verdict.flagged_categories if category not in self.flagged_categories)
+
+    @property
+    def verdict_delay(self) -> Optional[float]:
+        """Seconds from the last token to the verdict on the whole stream."""
+        if self.last_token_at is None or self.verdict_at is None:
+            return None
+        return self.verdict_at - self.last_token_at
+
+    def metrics(self) -> Dict[str, Any]:
+        """Moderation metrics of the stream."""
+        delay = self.verdict_delay
+        return {
+            "chunks_checked": len(self.chunks),
+            "flagged": self.flagged,
+            "stopped": self.stopped,
+            "verdict_after_last_token_ms": round(delay * 1000, 1) if delay is not None else None,
+        }
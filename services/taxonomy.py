@@ -0,0 +1,287 @@
+"""
+Taxonomy
+
+The Ticketmaster classification taxonomy (segment > genre > subgenre) from
+data/ticketmaster_event_types.json, with name lookups, pre-sorted views and a
+similarity measure between categories.
+
+The source file is large, so it is compiled once into a compact artifact (the
+lookup tables, sorted views and rendered name lists) cached under .cache/.
+The artifact records the SHA-256 of the source and is rebuilt when the source
+changes. The process-wide instance from `get_taxonomy` is loaded on first use
+and shared read-only by all sessions.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TAXONOMY_PATH = Path(__file__).parent.parent / "data" / "ticketmaster_event_types.json"
+TAXONOMY_CACHE_PATH = Path(__file__).parent.parent / ".cache" / "ticketmaster_event_types.pickle"
+
+# Bumped whenever the compiled state changes shape
+_ARTIFACT_FORMAT = 2
+
+# A category: (segment, genre, subgenre), with None below the level it names
+Node = Tuple[str, Optional[str], Optional[str]]
+
+# Separator of the levels in genre strings such as "Sports - Football"
+_LEVEL_SEPARATOR = re.compile(r"\s+[-/>]\s+")
+
+
+def normalize_name(name: str) -> str:
+    """Case- and whitespace-insensitive form of a category name."""
+    return " ".join(name.lower().split())
+
+
+def _compile(classifications: List[dict]) -> Dict[str, Any]:
+    """Build the lookup tables, sorted views and name lists from the raw classifications."""
+    segments: Dict[str, str] = {}
+    genres: Dict[str, Tuple[str, str]] = {}
+    subgenres: Dict[str, Tuple[str, str, str]] = {}
+    segment_genres: Dict[str, Dict[str, str]] = {}
+    genre_subgenres: Dict[str, Dict[str, str]] = {}
+    nodes_by_name: Dict[str, List[Node]] = {}
+
+    def index(name: str, node: Node) -> None:
+        nodes = nodes_by_name.setdefault(normalize_name(name), [])
+        if node not in nodes:
+            nodes.append(node)
+
+    for classification in classifications:
+        segment = classification.get("segment") or {}
+        segment_name = segment.get("name")
+        if not segment.get("id") or not segment_name:
+            continue
+        segments[segment_name] = segment["id"]
+        segment_genres[segment_name] = {}
+        index(segment_name, (segment_name, None, None))
+        for genre in segment.get("_embedded", {}).get("genres", []):
+            genre_name = genre.get("name")
+            if not genre.get("id") or not genre_name:
+                continue
+            genres[genre_name] = (genre["id"], segment_name)
+            segment_genres[segment_name][genre_name] = genre["id"]
+            # A genre name used in several segments lists the subgenres of its last one
+            genre_subgenres[genre_name] = {}
+            index(genre_name, (segment_name, genre_name, None))
+            for subgenre in genre.get("_embedded", {}).get("subgenres", []):
+                subgenre_name = subgenre.get("name")
+                if not subgenre.get("id") or not subgenre_name:
+                    continue
+                subgenres[subgenre_name] = (subgenre["id"], genre_name, segment_name)
+                genre_subgenres[genre_name][subgenre_name] = subgenre["id"]
+                index(subgenre_name, (segment_name, genre_name, subgenre_name))
+
+    sorted_segment_genres = {name: tuple(sorted(children.items())) for name, children in segment_genres.items()}
+    sorted_genre_subgenres = {name: tuple(sorted(children.items())) for name, children in genre_subgenres.items()}
+    name_lists = {
+        ("segments", None): ", ".join(sorted(segments)),
+        ("genres", None): ", ".join(sorted(genres)),
+        ("subgenres", None): ", ".join(sorted(subgenres)),
+    }
+    for level, children_by_parent in (("genres", sorted_segment_genres), ("subgenres", sorted_genre_subgenres)):
+        for parent, children in children_by_parent.items():
+            name_lists[(level, parent)] = ", ".join(name for name, _ in children)
+
+    return {
+        "segments": segments,
+        "genres": genres,
+        "subgenres": subgenres,
+        "segment_genres": sorted_segment_genres,
+        "genre_subgenres": sorted_genre_subgenres,
+        "segment_names": tuple(sorted(segments)),
+        "genre_names": tuple(sorted(genres)),
+        "subgenre_names": tuple(sorted(subgenres)),
+        "nodes_by_name": {name: tuple(nodes) for name, nodes in nodes_by_name.items()},
+        "name_lists": name_lists,
+    }
+
+
+class Taxonomy:
+    """
+    Segments, genres and subgenres with lookups by name.
+
+    Instances are read-only (mapping proxies over dicts of tuples), so one
+    instance can be shared by every session.
+
+    Attributes:
+        segments: Segment name -> id
+        genres: Genre name -> (id, segment)
+        subgenres: Subgenre name -> (id, genre, segment)
+        segment_genres: Segment name -> ((genre, id), ...), sorted by name
+        genre_subgenres: Genre name -> ((subgenre, id), ...), sorted by name
+        segment_names, genre_names, subgenre_names: All names, sorted
+        source_sha256: SHA-256 of the source file, when loaded from one
+    """
+
+    def __init__(self, classifications: List[dict]):
+        """
+        Args:
+            classifications: The `_embedded.classifications` list of the Ticketmaster response
+        """
+        self._set_state(_compile(classifications))
+        self.source_sha256: Optional[str] = None
+
+    def _set_state(self, state: Dict[str, Any]) -> None:
+        self.segments: Mapping[str, str] = MappingProxyType(state["segments"])
+        self.genres: Mapping[str, Tuple[str, str]] = MappingProxyType(state["genres"])
+        self.subgenres: Mapping[str, Tuple[str, str, str]] = MappingProxyType(state["subgenres"])
+        self.segment_genres: Mapping[str, Tuple[Tuple[str, str], ...]] = MappingProxyType(state["segment_genres"])
+        self.genre_subgenres: Mapping[str, Tuple[Tuple[str, str], ...]] = MappingProxyType(state["genre_subgenres"])
+        self.segment_names: Tuple[str, ...] = state["segment_names"]
+        self.genre_names: Tuple[str, ...] = state["genre_names"]
+        self.subgenre_names: Tuple[str, ...] = state["subgenre_names"]
+        self._nodes_by_name: Mapping[str, Tuple[Node, ...]] = MappingProxyType(state["nodes_by_name"])
+        self._name_lists: Mapping[Tuple[str, Optional[str]], str] = MappingProxyType(state["name_lists"])
+
+    @classmethod
+    def load(cls, path: Path = TAXONOMY_PATH, cache_path: Optional[Path] = TAXONOMY_CACHE_PATH) -> "Taxonomy":
+        """
+        Load the taxonomy from a Ticketmaster classifications JSON file.
+
+        The compiled artifact at `cache_path` is used if it was built from the
+        same source content; otherwise the source is compiled and cached.
+
+        Args:
+            path: The classifications JSON file
+            cache_path: Where the compiled artifact is cached, or None to always compile
+        """
+        source = Path(path).read_bytes()
+        source_sha256 = hashlib.sha256(source).hexdigest()
+        artifact_key = ("taxonomy", _ARTIFACT_FORMAT, source_sha256)
+        state = read_artifact(cache_path, artifact_key) if cache_path else None
+        if state is None:
+            data = json.loads(source)
+            state = _compile(data.get("_embedded", {}).get("classifications", []))
+            if cache_path:
+                write_artifact(cache_path, artifact_key, state)
+        taxonomy = cls.__new__(cls)
+        taxonomy._set_state(state)
+        taxonomy.source_sha256 = source_sha256
+        return taxonomy
+
+    def nodes(self, name: str) -> Tuple[Node, ...]:
+        """All categories with exactly this (normalized) name."""
+        return self._nodes_by_name.get(normalize_name(name), ())
+
+    def name_list(self, level: str, parent: Optional[str] = None) -> Optional[str]:
+        """
+        Comma-separated sorted names of a level, rendered at compile time.
+
+        Args:
+            level: "segments", "genres" or "subgenres"
+            parent: Only the genres of this segment or the subgenres of this genre
+
+        Returns:
+            Optional[str]: The names, or None if `parent` is unknown
+        """
+        return self._name_lists.get((level, parent))
+
+    def resolve(self, text: str) -> List[Node]:
+        """
+        Categories named by a genre string.
+
+        Accepts a single name ("Rock") or a path such as "Sports - Football" or
+        "Music - Rock - Alternative Rock", where each level must be a child of
+        the previous one. If the path does not match, its last level is looked
+        up on its own. A single name used on several levels (e.g. "Pop" is a
+        genre and also a subgenre of "Rock") means the highest of them.
+        """
+        parts = [part for part in _LEVEL_SEPARATOR.split(text.strip()) if part]
+        if len(parts) > 1:
+            parents = list(self.nodes(parts[0]))
+            for part in parts[1:]:
+                children = self.nodes(part)
+                parents = [child for child in children if any(_is_ancestor(parent, child) for parent in parents)]
+            if parents:
+                return parents
+        nodes = list(self.nodes(parts[-1])) if parts else []
+        if len(nodes) > 1:
+            top = min(_depth(node) for node in nodes)
+            nodes = [node for node in nodes if _depth(node) == top]
+        return nodes
+
+
+def read_artifact(cache_path: Path, key: Tuple) -> Optional[Any]:
+    """
+    A cached compiled state, or None if it is missing, unreadable or was built
+    for a different key (kind, format version and source hash).
+    """
+    try:
+        with open(cache_path, "rb") as f:
+            artifact = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache {cache_path}: {e}")
+        return None
+    if not isinstance(artifact, dict) or artifact.get("key") != key:
+        return None
+    return artifact["state"]
+
+
+def write_artifact(cache_path: Path, key: Tuple, state: Any) -> None:
+    """Cache a compiled state; a failure only costs a recompile on the next start."""
+    cache_path = Path(cache_path)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"key": key, "state": state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Atomic, so a concurrent process never reads a partial artifact
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not write the cache {cache_path}: {e}")
+        tmp_path.unlink(missing_ok=True)
+
+
+def _depth(node: Node) -> int:
+    return 1 + (node[1] is not None) + (node[2] is not None)
+
+
+def _is_ancestor(parent: Node, child: Node) -> bool:
+    """Whether `parent` is `child` or one of its ancestors."""
+    depth = _depth(parent)
+    return depth <= _depth(child) and parent[:depth] == child[:depth]
+
+
+def node_similarity(a: Node, b: Node) -> float:
+    """
+    Similarity of two categories in [0, 1].
+
+    1 for the same category, 0.8 if one contains the other, 0.6 for siblings
+    within one genre, 0.3 within one segment and 0 otherwise.
+    """
+    if a == b:
+        return 1.0
+    if _is_ancestor(a, b) or _is_ancestor(b, a):
+        return 0.8
+    if a[1] is not None and a[:2] == b[:2]:
+        return 0.6
+    if a[0] == b[0]:
+        return 0.3
+    return 0.0
+
+
+_taxonomy: Optional[Taxonomy] = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy() -> Taxonomy:
+    """Get the process-wide taxonomy, loading it on first use."""
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = Taxonomy.load()
+    return _taxonomy
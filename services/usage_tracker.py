@@ -0,0 +1,113 @@
+"""
+Usage Tracker
+
+Records token usage reported by chat completion calls, in particular the
+number of prompt tokens served from the provider's automatic prompt-prefix
+cache (`usage.prompt_tokens_details.cached_tokens`), so the cache hit rate
+can be tracked over time.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Number of most recent calls kept for windowed statistics
+DEFAULT_HISTORY_SIZE = 500
+
+
+@dataclass
+class UsageRecord:
+    """Token usage of a single completion call."""
+    timestamp: float
+    source: str
+    model: str
+    prompt_tokens: int
+    cached_tokens: int
+    completion_tokens: int
+
+
+class PromptCacheStats:
+    """Thread-safe accumulator of prompt cache usage across completion calls."""
+
+    def __init__(self, history_size: int = DEFAULT_HISTORY_SIZE):
+        self._lock = threading.Lock()
+        self.history: Deque[UsageRecord] = deque(maxlen=history_size)
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+
+    def record(self, usage: Any, source: str, model: str = "") -> Optional[UsageRecord]:
+        """
+        Record the `usage` object of a completion (or the final chunk of a stream).
+
+        Args:
+            usage: The usage object returned by the API; None is ignored
+            source: Name of the caller, e.g. "event_agent" or "memory_agent"
+            model: The model used for the call
+
+        Returns:
+            The stored record, or None if no usage was reported
+        """
+        if usage is None:
+            return None
+        details = getattr(usage, "prompt_tokens_details", None)
+        record = UsageRecord(
+            timestamp=time.time(),
+            source=source,
+            model=model,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            cached_tokens=(getattr(details, "cached_tokens", 0) or 0) if details is not None else 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+        )
+        with self._lock:
+            self.history.append(record)
+            self.calls += 1
+            self.prompt_tokens += record.prompt_tokens
+            self.cached_tokens += record.cached_tokens
+            self.completion_tokens += record.completion_tokens
+        logger.info(
+            "%s completion: %d prompt tokens, %d cached (%.0f%%)",
+            source, record.prompt_tokens, record.cached_tokens,
+            100.0 * record.cached_tokens / record.prompt_tokens if record.prompt_tokens else 0.0,
+        )
+        return record
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of all prompt tokens that were served from the cache."""
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    def recent(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The most recent usage records, oldest first."""
+        with self._lock:
+            records = list(self.history)
+        if n is not None:
+            records = records[-n:]
+        return [asdict(r) for r in records]
+
+    def summary(self) -> Dict[str, Any]:
+        """Cumulative and windowed cache statistics."""
+        with self._lock:
+            window = list(self.history)
+            totals = {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
+        window_prompt = sum(r.prompt_tokens for r in window)
+        window_cached = sum(r.cached_tokens for r in window)
+        totals["hit_rate"] = round(self.hit_rate, 4)
+        totals["recent_hit_rate"] = round(window_cached / window_prompt, 4) if window_prompt else 0.0
+        totals["recent_calls"] = len(window)
+        return totals
+
+
+# Process-wide statistics shared by all agents
+prompt_cache_stats = PromptCacheStats()
@@ -1,58 +1,131 @@
-from typing import Any
+from collections import deque
+from typing import Any, Deque, List, Optional
 from structs.message import Message
+from structs.tokens import estimate_message_tokens
+
+# Budget for the conversation part of the prompt (system prompt and tools excluded)
+DEFAULT_MAX_TOKENS = 8000
+
+class _Unit:
+    """
+    Messages that are kept or evicted together: a single message, or an
+    assistant message with tool calls followed by its tool results.
+    """
+    __slots__ = ("messages", "api_messages", "tokens")
+
+    def __init__(self):
+        self.messages: List[Message] = []
+        self.api_messages: List[dict[str, Any]] = []
+        self.tokens = 0
 
 class Context:
-    def __init__(self, max_msgs: int = 15):
-        self.max_msgs = max_msgs
-        self.messages = []
+    def __init__(self, max_tokens: int = DEFAULT_MAX_TOKENS):
+        self.max_tokens = max_tokens
+        self.units: Deque[_Unit] = deque()
         self.msg_count = 0
+        self.token_count = 0
+        self._messages: Optional[List[Message]] = None
+        self._messages_for_api: Optional[List[dict[str, Any]]] = None
+        # Unit of the newest user message; it and everything after it form the current turn
+        self._turn_start: Optional[_Unit] = None
     
     def add_message(self, message: Message):
-        if self.msg_count >= self.max_msgs:
-            self.messages.pop(0)
-            self.msg_count -= 1
-            if self.messages[0].role == "tool":
-                self.messages.pop(0)
-                self.msg_count -= 1
-        self.messages.append(message)
+        api_message = self._to_api_message(message)
+        if message.role == "tool" and self.units and self._expects_tool_result(self.units[-1], message):
+            unit = self.units[-1]
+        else:
+            unit = _Unit()
+            self.units.append(unit)
+            if message.role == "user":
+                self._turn_start = unit
+        tokens = estimate_message_tokens(api_message) if api_message is not None else 0
+        unit.messages.append(message)
+        if api_message is not None:
+            unit.api_messages.append(api_message)
+        unit.tokens += tokens
         self.msg_count += 1
+        self.token_count += tokens
         
+        # Evict whole units from the oldest end. The current turn (the user message and the
+        # tool results being answered) is always kept, even if it alone exceeds the budget.
+        while self.token_count > self.max_tokens and len(self.units) > 1 and self.units[0] is not self._turn_start:
+            evicted = self.units.popleft()
+            self.msg_count -= len(evicted.messages)
+            self.token_count -= evicted.tokens
+        self._messages = None
+        self._messages_for_api = None
+
+    @staticmethod
+    def _expects_tool_result(unit: _Unit, message: Message) -> bool:
+        """Check if the unit's assistant message requested the tool call this message answers"""
+        first = unit.messages[0]
+        if first.role != "assistant" or not first.tool_calls:
+            return False
+        return any(call.get("id") == message.tool_call_id for call in first.tool_calls)
+    
+    @property
+    def messages(self) -> List[Message]:
+        if self._messages is None:
+            self._messages = [m for unit in self.units for m in unit.messages]
+        return self._messages
     
     def get_messages(self):
         return self.messages
+
+    @staticmethod
+    def _to_api_message(m: Message) -> Optional[dict[str, Any]]:
+        if m.role == "system":
+            return {"role": m.role, "content": m.content}
+        elif m.role == "user":
+            return {"role": m.role, "content": m.content}
+        elif m.role == "assistant" and not m.tool_calls:
+            return {"role": m.role, "content": m.content}
+        elif m.role == "assistant" and m.tool_calls:
+            d = {
+                "role": m.role,
+                "content": m.content if m.content else "",
+                "tool_calls": m.tool_calls
+            }
+            # Usuń None
+            return {k: v for k, v in d.items() if v is not None}
+        elif m.role == "tool":
+            d = {
+                "role": m.role,
+                "content": m.content,
+                "tool_call_id": m.tool_call_id
+            }
+            return {k: v for k, v in d.items() if v is not None}
+        return None
     
     def messages_for_api(self) -> list[dict[str, Any]]:
-        messages_for_api: list[dict[str, Any]] = []
-        for m in self.get_messages():
-            if m.role == "system":
-                messages_for_api.append({"role": m.role, "content": m.content})
-            elif m.role == "user":
-                messages_for_api.append({"role": m.role, "content": m.content})
-            elif m.role == "assistant" and not m.tool_calls:
-                messages_for_api.append({"role": m.role, "content": m.content})
-            elif m.role == "assistant" and m.tool_calls:
-                d = {
-                    "role": m.role,
-                    "content": m.content if m.content else "",
-                    "tool_calls": m.tool_calls
-                }
-                # Usuń None
-                d = {k: v for k, v in d.items() if v is not None}
-                messages_for_api.append(d)
-            elif m.role == "tool":
-                d = {
-                    "role": m.role,
-                    "content": m.content,
-                    "tool_call_id": m.tool_call_id
-                }
-                d = {k: v for k, v in d.items() if v is not None}
-                messages_for_api.append(d)
-        return messages_for_api
+        # Serialized once per message; the flattened list is rebuilt only after changes
+        if self._messages_for_api is None:
+            self._messages_for_api = [d for unit in self.units for d in unit.api_messages]
+        return list(self._messages_for_api)
+
 
+    def copy(self) -> "Context":
+        """Copy the context; messages added to the copy do not change this one."""
+        context = Context(self.max_tokens)
+        for unit in self.units:
+            copied = _Unit()
+            copied.messages = list(unit.messages)
+            copied.api_messages = list(unit.api_messages)
+            copied.tokens = unit.tokens
+            context.units.append(copied)
+            if unit is self._turn_start:
+                context._turn_start = copied
+        context.msg_count = self.msg_count
+        context.token_count = self.token_count
+        return context
         
     def clear(self):
-        self.messages = []
+        self.units = deque()
         self.msg_count = 0
+        self.token_count = 0
+        self._turn_start = None
+        self._messages = None
+        self._messages_for_api = None
     
     def __str__(self):
         return str(self.messages)
@@ -0,0 +1,28 @@
+"""
+Cheap token estimates for prompt budgeting.
+
+Exact counts depend on the model's tokenizer; for budgeting the prompt we only
+need a fast, stable approximation. English text averages roughly four
+characters per token, and every chat message carries a few tokens of framing.
+"""
+
+import json
+from typing import Any, Dict
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a piece of text."""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_message_tokens(message: Dict[str, Any]) -> int:
+    """Estimate the number of tokens an API-formatted chat message occupies in the prompt."""
+    tokens = MESSAGE_OVERHEAD_TOKENS + estimate_tokens(message.get("content") or "")
+    if message.get("tool_calls"):
+        tokens += estimate_tokens(json.dumps(message["tool_calls"]))
+    return tokens
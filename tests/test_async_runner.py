@@ -0,0 +1,110 @@
+"""
+Tests for the background event loop runner.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.async_runner import LoopLocal, get_loop, iterate_sync, run_sync
+
+
+async def _double(value):
+    await asyncio.sleep(0)
+    return value * 2
+
+
+def test_run_sync_runs_on_the_background_loop():
+    async def loop_of_coroutine():
+        return asyncio.get_running_loop()
+
+    assert run_sync(_double(21)) == 42
+    assert run_sync(loop_of_coroutine()) is get_loop()
+
+
+def test_run_sync_works_inside_another_running_loop():
+    async def caller():
+        # The caller's loop is blocked meanwhile, but the coroutine runs on the background loop
+        return run_sync(_double(4)), asyncio.get_running_loop()
+
+    result, caller_loop = asyncio.run(caller())
+
+    assert result == 8 and caller_loop is not get_loop()
+
+
+def test_run_sync_refuses_to_deadlock_the_background_loop():
+    async def nested():
+        coroutine = _double(1)
+        try:
+            run_sync(coroutine)
+        finally:
+            coroutine.close()
+
+    with pytest.raises(RuntimeError, match="cannot be called from the async runner thread"):
+        run_sync(nested())
+
+
+def test_run_sync_propagates_exceptions():
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        run_sync(fail())
+
+
+def test_iterate_sync_yields_every_item():
+    async def numbers():
+        for number in range(3):
+            await asyncio.sleep(0)
+            yield number
+
+    assert list(iterate_sync(numbers())) == [0, 1, 2]
+
+
+def test_closing_iterate_sync_early_closes_the_async_iterator():
+    events = []
+
+    async def numbers():
+        try:
+            for number in range(10):
+                yield number
+        finally:
+            events.append("closed")
+
+    iterator = iterate_sync(numbers())
+    assert next(iterator) == 0 and next(iterator) == 1
+    iterator.close()
+
+    assert events == ["closed"]
+
+
+def test_loop_local_creates_one_instance_per_loop():
+    created = []
+    local = LoopLocal(lambda: created.append(object()) or created[-1])
+
+    async def get_twice():
+        return local.get(), local.get()
+
+    background = run_sync(get_twice())
+    own = asyncio.run(get_twice())
+
+    assert background[0] is background[1] and own[0] is own[1]
+    assert background[0] is not own[0] and len(created) == 2
+    assert run_sync(get_twice())[0] is background[0]
+
+
+def test_loop_local_set_overrides_the_background_instance():
+    local = LoopLocal(object)
+    replacement = object()
+    local.set(replacement)
+
+    async def get():
+        return local.get()
+
+    assert run_sync(get()) is replacement
+    assert asyncio.run(get()) is not replacement
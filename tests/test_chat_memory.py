@@ -0,0 +1,95 @@
+"""
+Tests for the chat memory's summary watermark and incremental summarization.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+from openai import AsyncOpenAI
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.memory_agent import MemoryAgent
+from memory.chat_memory import ChatMemory
+from services.async_runner import LoopLocal
+from structs.message import Message
+
+
+def _add_turn(memory, text):
+    memory.add_message(Message(role="user", content=text), f"Reply to {text}")
+
+
+def test_new_memory_starts_at_the_watermark():
+    memory = ChatMemory()
+    assert memory.get_new_memory() == ("", 0)
+
+    _add_turn(memory, "first")
+    new, upto = memory.get_new_memory()
+    assert upto == 2 and "first" in new
+
+    memory.update_summary("Summary 1", summarized_upto=upto)
+    _add_turn(memory, "second")
+    new, upto = memory.get_new_memory()
+    assert upto == 4
+    assert new.splitlines() == memory.get_memory().splitlines()[2:]
+    assert "first" not in new and "second" in new
+
+    memory.update_summary("Summary 2", summarized_upto=upto)
+    assert memory.get_new_memory() == ("", 4)
+
+
+def test_watermark_never_moves_back_or_past_the_end():
+    memory = ChatMemory()
+    _add_turn(memory, "first")
+    _add_turn(memory, "second")
+
+    memory.update_summary("Summary", summarized_upto=4)
+    memory.update_summary("Older summary", summarized_upto=2)
+    assert memory.summarized_upto == 4
+
+    memory.update_summary("Summary", summarized_upto=10)
+    assert memory.summarized_upto == 4
+    memory.update_summary("Summary")
+    assert memory.summarized_upto == 4 and memory.get_summary() == "Summary"
+
+    memory.clear()
+    assert memory.summarized_upto == 0 and memory.get_new_memory() == ("", 0)
+
+
+def test_update_summary_sends_only_new_messages_and_keeps_late_ones():
+    requests = []
+    memory = ChatMemory()
+
+    async def handler(request):
+        prompt = json.loads(request.content)["messages"][-1]["content"]
+        requests.append(prompt)
+        # A turn finishing while the summary is generated must be left for the next one
+        if len(requests) == 1:
+            _add_turn(memory, "late")
+        completion = {
+            "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": "gpt-4.1",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": f"Summary {len(requests)}"},
+                         "finish_reason": "stop"}],
+        }
+        return httpx.Response(200, json=completion)
+
+    agent = MemoryAgent(clients=LoopLocal(lambda: AsyncOpenAI(
+        api_key="test", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))))
+
+    _add_turn(memory, "first")
+    asyncio.run(agent.update_summary_async(memory))
+    assert memory.get_summary() == "Summary 1" and memory.summarized_upto == 2
+    assert "first" in requests[0] and "late" not in requests[0]
+
+    asyncio.run(agent.update_summary_async(memory))
+    assert memory.summarized_upto == 4
+    assert "Summary 1" in requests[1] and "late" in requests[1] and "User: [" in requests[1]
+    assert "Reply to first" not in requests[1]
+
+    # Nothing new: the summary is kept without calling the API
+    asyncio.run(agent.update_summary_async(memory))
+    assert len(requests) == 2 and memory.get_summary() == "Summary 2"
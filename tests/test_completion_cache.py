@@ -0,0 +1,114 @@
+"""
+Tests for the completion cache, in particular for streamed completions.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+from openai import AsyncOpenAI
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SWAGGER_API_KEY", "test-key")
+
+from agents.event_agent import EventAgent
+from agents.shared_resources import SharedResources
+from services.completion_cache import CompletionCache, create_chat_completion, stream_chat_completion
+from structs.context import Context
+from structs.message import Message
+
+REQUEST = {"model": "gpt-4.1", "messages": [{"role": "user", "content": "Concerts tonight?"}]}
+
+
+def _chunk(delta, finish_reason=None):
+    return {"id": "chatcmpl-test", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4.1",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+
+
+def _client(chunks):
+    requests = []
+
+    async def handler(request):
+        requests.append(json.loads(request.content))
+        body = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks)
+        return httpx.Response(200, content=body + "data: [DONE]\n\n", headers={"content-type": "text/event-stream"})
+
+    client = AsyncOpenAI(api_key="test", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return client, requests
+
+
+def _collect(client, cache, limit=None, **request):
+    async def run():
+        chunks = []
+        async for chunk in stream_chat_completion(client, cache, "test", **request):
+            chunks.append(chunk)
+            if limit is not None and len(chunks) >= limit:
+                break
+        return chunks
+
+    return asyncio.run(run())
+
+
+def _content(chunks):
+    return "".join(chunk.choices[0].delta.content or "" for chunk in chunks if chunk.choices)
+
+
+def test_streamed_completion_is_cached_and_replayed(tmp_path):
+    cache = CompletionCache(str(tmp_path / "cache.db"))
+    client, requests = _client([_chunk({"role": "assistant", "content": "Two "}), _chunk({"content": "concerts."}),
+                                _chunk({}, finish_reason="stop")])
+
+    first = _collect(client, cache, **REQUEST)
+    replayed = _collect(client, cache, **REQUEST)
+
+    assert _content(first) == _content(replayed) == "Two concerts."
+    assert len(requests) == 1 and requests[0]["stream"] is True
+    assert replayed[-1].choices[0].finish_reason == "stop"
+    # Non-streamed requests with the same payload share the entry
+    completion = asyncio.run(create_chat_completion(client, cache, "test", **REQUEST))
+    assert completion.choices[0].message.content == "Two concerts." and len(requests) == 1
+
+
+def test_tool_calls_are_replayed(tmp_path):
+    cache = CompletionCache(str(tmp_path / "cache.db"))
+    call = {"index": 0, "id": "call_1", "type": "function", "function": {"name": "search_events", "arguments": ""}}
+    client, requests = _client([
+        _chunk({"role": "assistant", "tool_calls": [call]}),
+        _chunk({"tool_calls": [{"index": 0, "function": {"arguments": '{"eventLocationCity": "Oslo"}'}}]}),
+        _chunk({}, finish_reason="tool_calls"),
+    ])
+
+    _collect(client, cache, **REQUEST)
+    replayed = _collect(client, cache, **REQUEST)
+
+    tool_call = replayed[0].choices[0].delta.tool_calls[0]
+    assert len(requests) == 1
+    assert tool_call.id == "call_1" and tool_call.function.name == "search_events"
+    assert json.loads(tool_call.function.arguments) == {"eventLocationCity": "Oslo"}
+
+
+def test_incomplete_streams_are_not_cached(tmp_path):
+    cache = CompletionCache(str(tmp_path / "cache.db"))
+    client, requests = _client([_chunk({"content": "Two "}), _chunk({"content": "concerts."})])
+
+    _collect(client, cache, limit=1, **REQUEST)
+    _collect(client, cache, **REQUEST)
+
+    assert len(requests) == 2 and cache.stats()["entries"] == 1
+
+
+def test_streamed_agent_turns_are_served_from_the_cache(tmp_path):
+    cache = CompletionCache(str(tmp_path / "cache.db"))
+    client, requests = _client([_chunk({"content": "Two concerts."})])
+    resources = SharedResources(completion_cache=cache, client_factory=lambda: client)
+
+    def turn():
+        # A new session each time, so the memory summary in the request is the same
+        agent = EventAgent(resources=resources)
+        return list(agent.process_stream(Message(role="user", content="Concerts tonight?"), Context()))
+
+    assert turn() == turn() == ["Two concerts."]
+    assert len([r for r in requests if r.get("stream")]) == 1 and cache.stats()["hits"] >= 1
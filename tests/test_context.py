@@ -0,0 +1,85 @@
+"""
+Tests for the token-budgeted conversation Context.
+"""
+
+import os
+import sys
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from structs.context import Context
+from structs.message import Message
+
+
+def _tool_call_pair(call_id: str, result: str):
+    assistant = Message(
+        role="assistant",
+        content="",
+        tool_calls=[{"id": call_id, "type": "function", "function": {"name": "search_events", "arguments": "{}"}}]
+    )
+    tool = Message(role="tool", tool_call_id=call_id, content=result)
+    return assistant, tool
+
+
+def test_evicts_oldest_messages_by_token_budget():
+    context = Context(max_tokens=60)
+    for i in range(10):
+        context.add_message(Message(role="user", content=f"message {i} " + "x" * 40))
+
+    assert context.token_count <= 60
+    assert context.get_messages()[-1].content.startswith("message 9")
+    assert context.msg_count == len(context.get_messages())
+
+
+def test_tool_call_and_result_are_evicted_together():
+    context = Context(max_tokens=70)
+    assistant, tool = _tool_call_pair("call_1", "y" * 200)
+    context.add_message(Message(role="user", content="find concerts"))
+    context.add_message(assistant)
+    context.add_message(tool)
+    assert [m.role for m in context.get_messages()] == ["user", "assistant", "tool"]
+
+    context.add_message(Message(role="user", content="and in London?"))
+    assert [m["role"] for m in context.messages_for_api()] == ["user"]
+
+
+def test_oversized_tool_result_does_not_evict_the_current_turn():
+    context = Context(max_tokens=60)
+    context.add_message(Message(role="user", content="jazz in Berlin?"))
+    context.add_message(Message(role="assistant", content="Here are three jazz concerts."))
+    assistant, tool = _tool_call_pair("call_1", "z" * 400)
+    context.add_message(Message(role="user", content="and in London?"))
+    context.add_message(assistant)
+    context.add_message(tool)
+
+    # The earlier turn goes; the question and the tool result being answered stay
+    assert [m.role for m in context.get_messages()] == ["user", "assistant", "tool"]
+    assert context.get_messages()[0].content == "and in London?"
+    assert context.token_count > context.max_tokens
+
+    context.add_message(Message(role="assistant", content="Two concerts in London."))
+    assert [m.role for m in context.get_messages()] == ["user", "assistant", "tool", "assistant"]
+    copy = context.copy()
+    copy.add_message(Message(role="assistant", content="x" * 400))
+    assert copy.get_messages()[0].content == "and in London?"
+
+
+def test_newest_unit_is_kept_even_if_over_budget():
+    context = Context(max_tokens=10)
+    assistant, tool = _tool_call_pair("call_1", "z" * 400)
+    context.add_message(assistant)
+    context.add_message(tool)
+    context.add_message(Message(role="assistant", content="done"))
+
+    assert [m.role for m in context.get_messages()] == ["assistant"]
+
+
+def test_messages_for_api_is_cached_until_changed():
+    context = Context()
+    context.add_message(Message(role="user", content="hi"))
+    first = context.messages_for_api()
+    assert first == context.messages_for_api()
+
+    context.add_message(Message(role="assistant", content="hello"))
+    assert [m["role"] for m in context.messages_for_api()] == ["user", "assistant"]
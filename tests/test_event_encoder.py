@@ -0,0 +1,68 @@
+"""
+Tests for the token-budgeted event encoder.
+"""
+
+import os
+import sys
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.event_encoder import encode_events
+from services.event_models import Event, EventDate, EventSearchResponse, Venue
+from services.event_store import EventStore
+from structs.tokens import estimate_tokens
+
+
+def _response(count, found_more_events=True):
+    events = [
+        Event(
+            id=str(i),
+            name=f"Symphony night {i}",
+            url=f"https://tickets.example.com/event/{i}",
+            dates=EventDate(start_date=f"2025-06-{i % 28 + 1:02d}", start_time="19:30:00"),
+            venues=[Venue(name=f"National Philharmonic Concert Hall {i % 3}", city="Warsaw", country="Poland")],
+            genre="Classical" if i % 2 else "Opera",
+        )
+        for i in range(count)
+    ]
+    response = EventSearchResponse(total_count=500, page=1, page_size=count, found_more_events=found_more_events)
+    response.events = EventStore(events)
+    return response
+
+
+def test_encoding_fits_budget_and_marks_truncation():
+    encoded = encode_events(_response(200), token_budget=400)
+
+    assert encoded.tokens <= 400
+    assert encoded.tokens == estimate_tokens(encoded.text)
+    assert 0 < encoded.shown < 200
+    assert encoded.truncated
+    assert f"({200 - encoded.shown} more matches on this page not shown; narrow the search to see them; more on page 2)" in encoded.text
+    assert encoded.text.startswith("Found at least 500 events (page 1, more pages available)")
+
+
+def test_repeated_venue_and_shared_location_are_written_once():
+    encoded = encode_events(_response(12, found_more_events=False), token_budget=None)
+
+    assert encoded.shown == 12 and not encoded.truncated
+    assert encoded.text.count("National Philharmonic Concert Hall 0") == 1
+    assert encoded.text.count("Warsaw") == 1
+    assert "Location: Warsaw, Poland." in encoded.text
+    assert "| 2025-06-01 19:30 |" in encoded.text
+    assert "not shown" not in encoded.text
+    assert encoded.text.startswith("Found 500 events (page 1), showing 12.")
+
+
+def test_compact_encoding_is_smaller_than_verbose_summaries():
+    response = _response(50)
+    verbose = "\n".join(event.format_summary() for event in response.events)
+
+    assert encode_events(response, token_budget=None).tokens < estimate_tokens(verbose) * 0.75
+
+
+def test_no_events():
+    encoded = encode_events(EventSearchResponse())
+
+    assert encoded.text == "No events found for the given criteria."
+    assert encoded.shown == 0
@@ -0,0 +1,118 @@
+"""
+Tests for paging through event search results and prefetching the next page.
+"""
+
+import asyncio
+import os
+import sys
+
+import httpx
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SWAGGER_API_KEY", "test-key")
+
+from services.event_api_service import EventApiService
+from services.event_models import EventSearchParams
+from services.http_client import HttpClient
+from services.ttl_cache import TTLCache
+
+PAGES = 3
+
+
+def _service(page_size=2, running=None):
+    requests = []
+    running = running if running is not None else {"now": 0, "peak": 0}
+
+    async def handler(request):
+        page = int(request.url.params.get("page", 1))
+        requests.append(page)
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        events = [{"id": f"{page}-{i}", "name": f"Event {page}-{i}", "startDateTime": "2025-06-01T20:00:00Z"}
+                  for i in range(page_size)]
+        return httpx.Response(200, json={"events": events, "foundMoreEvents": page < PAGES})
+
+    service = EventApiService(api_key="test-key", cache=TTLCache(),
+                              http_client=HttpClient(transport=httpx.MockTransport(handler)))
+    return service, requests
+
+
+def test_next_page_is_prefetched_into_the_cache():
+    service, requests = _service()
+    params = EventSearchParams(eventLocationCity="Berlin", pageSize=2)
+
+    async def run():
+        first = await service.search_events_async(params)
+        service.prefetch_next_page(params, first)
+        await asyncio.gather(*service._prefetch_tasks)
+        second = await service.search_events_async(params.model_copy(update={"page": 2}))
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert requests == [1, 2]
+    assert [event.id for event in second.events] == ["2-0", "2-1"]
+    assert first.found_more_events and first.total_count == 2
+    assert second.page == 2 and second.total_count == 4
+
+
+def test_last_page_is_not_followed_by_a_prefetch():
+    service, requests = _service()
+    params = EventSearchParams(eventLocationCity="Berlin", pageSize=2, page=PAGES)
+
+    async def run():
+        last = await service.search_events_async(params)
+        service.prefetch_next_page(params, last)
+        return last
+
+    last = asyncio.run(run())
+
+    assert requests == [PAGES] and not service._prefetch_tasks
+    assert not last.found_more_events and last.total_count == 2 * PAGES
+
+
+def test_iterator_streams_all_pages_and_reports_the_total():
+    running = {"now": 0, "peak": 0}
+    service, requests = _service(running=running)
+    pages = service.iter_events(EventSearchParams(eventLocationCity="Berlin", pageSize=2), prefetch=2)
+
+    events = [event.id for event in pages]
+
+    assert events == [f"{page}-{i}" for page in range(1, PAGES + 1) for i in range(2)]
+    # Without a total, one page past the last may be requested before the last page arrives
+    assert sorted(requests)[:3] == [1, 2, 3] and pages.pages_requested <= PAGES + 1
+    # Pages 2 and 3 were fetched concurrently, while page 1 was consumed
+    assert running["peak"] == 2
+    assert pages.total_count == 2 * PAGES
+
+
+def test_iterator_stops_once_the_caller_has_enough():
+    service, requests = _service()
+    pages = service.iter_events(EventSearchParams(eventLocationCity="Berlin", pageSize=2), max_events=3, prefetch=5)
+
+    async def run():
+        return [event.id async for event in pages]
+
+    events = asyncio.run(run())
+
+    assert events == ["1-0", "1-1", "2-0"]
+    # Only the one page still needed was prefetched; the total is unknown before the last page
+    assert requests == [1, 2] and pages.total_count is None
+
+
+def test_iterator_stopped_by_the_caller_cancels_prefetches():
+    service, requests = _service()
+    pages = service.iter_events(EventSearchParams(eventLocationCity="Berlin", pageSize=2), prefetch=2)
+
+    async def run():
+        async for _ in pages:
+            break
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+
+    assert pages.total_count is None and service.cache.get(
+        EventSearchParams(eventLocationCity="Berlin", pageSize=2, page=3).cache_key()) is None
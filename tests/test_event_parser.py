@@ -0,0 +1,86 @@
+"""
+Tests that the fast event parser returns the same events as the validated one.
+"""
+
+import os
+import random
+import sys
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SWAGGER_API_KEY", "test-key")
+
+from services.event_api_service import EventApiService
+
+
+def _parse_both(data):
+    service = EventApiService(api_key="test-key", cache=None)
+    fast = service._extract_events_from_response(data, fast=True)
+    validated = service._extract_events_from_response(data, fast=False)
+    return fast, validated
+
+
+def _iso_event(i):
+    return {
+        "id": i,
+        "name": f"Concert {i}",
+        "description": "Live music",
+        "url": f"https://example.com/{i}",
+        "startDateTime": f"2025-06-{i % 28 + 1:02d}T19:30:00Z",
+        "venues": [{"name": "Arena", "city": {"name": "Warsaw"},
+                    "country": {"name": "Poland", "countryCode": "PL"}, "address": {"line1": "Main 1"}}],
+        "images": [{"url": f"https://example.com/{i}.jpg", "alt": "poster"}],
+        "classifications": [{"genre": {"name": "Rock"}}],
+    }
+
+
+def _nested_event(i):
+    return {
+        "id": f"n{i}",
+        "name": f"Match {i}",
+        "dates": {"start": {"localDate": "2025-07-01", "localTime": "18:00:00"},
+                  "end": {"localDate": "2025-07-01", "localTime": "20:00:00"}},
+        "venues": ["Stadium", {"name": "Field", "city": "Krakow", "country": "Poland"}],
+        "image": "https://example.com/match.jpg",
+        "genre": "Sports - Football",
+    }
+
+
+def test_fast_parser_matches_validated_parser_on_both_shapes():
+    for data in ({"events": [_iso_event(i) for i in range(20)]},
+                 {"items": [_nested_event(i) for i in range(20)]}):
+        fast, validated = _parse_both(data)
+        assert len(fast) == 20
+        assert fast == validated
+
+
+def test_fast_parser_matches_validated_parser_on_malformed_items():
+    malformed = [
+        {"id": 1, "name": "Bad date", "startDateTime": "next friday"},
+        {"id": 2, "name": None, "startDateTime": "2025-06-01T19:00:00"},
+        {"id": 3, "name": "Numeric city", "startDateTime": "2025-06-01", "venues": [{"name": "A", "city": 5}]},
+        {"id": 4, "name": "Other shape", "dates": {"start": {"localDate": "2025-06-01"}}},
+        {"id": 5, "name": "Bad nested date", "dates": {"start": {"localDate": "01/06/2025"}}},
+        {"id": 6, "name": "No dates", "images": None, "image": "https://example.com/x.jpg"},
+        {"id": 7, "name": "Bad classifications", "startDateTime": "", "classifications": {"genre": "x"}},
+        {"id": 8, "name": "Venue dict list", "startDateTime": "2025-06-01", "venues": {"name": "A"}},
+        "not an event",
+        {"id": 9, "name": "Image without url", "startDateTime": "2025-06-01", "images": [{"alt": "x"}, {"url": None}]},
+        {"id": 10, "name": "Fine", "startDateTime": "2025-06-01T10:00:00.123+02:00", "genre": ""},
+    ]
+    data = {"events": [_iso_event(0)] + malformed + [_nested_event(0)]}
+    fast, validated = _parse_both(data)
+    assert fast == validated
+    assert [event.id for event in fast] == [event.id for event in validated]
+
+
+def test_fast_parser_matches_validated_parser_on_randomized_items():
+    rng = random.Random(7)
+    values = [None, "", "x", 0, 3, [], {}, ["Hall"], [{"name": "Hall"}], "2025-01-02",
+              "2025-01-02T03:04:05Z", {"start": {"localDate": "2025-01-02"}}, [{"genre": {"name": "Jazz"}}]]
+    keys = ["id", "name", "description", "url", "startDateTime", "dates", "venues",
+            "images", "image", "genre", "classifications"]
+    events = [{key: rng.choice(values) for key in rng.sample(keys, rng.randint(0, len(keys)))}
+              for _ in range(500)]
+    fast, validated = _parse_both({"events": events})
+    assert fast == validated
@@ -0,0 +1,111 @@
+"""
+Tests for ranking search results and inferring user preferences.
+"""
+
+import os
+import sys
+from datetime import date
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from memory.chat_memory import ChatMemory
+from memory.preferences import UserPreferences, infer_preferences
+from services.event_encoder import encode_events
+from services.event_models import Event, EventDate, EventSearchParams, EventSearchResponse, Venue
+from services.event_ranker import EventRanker
+from services.event_store import EventStore
+from services.taxonomy import get_taxonomy
+from structs.message import Message
+
+TODAY = date(2025, 6, 1)
+
+
+def _event(i, genre, city, start_date):
+    return Event(
+        id=str(i),
+        name=f"Event {i}",
+        dates=EventDate(start_date=start_date, start_time="20:00:00"),
+        venues=[Venue(name=f"Venue {i}", city=city)],
+        genre=genre,
+    )
+
+
+def _response(events):
+    response = EventSearchResponse(total_count=len(events), page_size=len(events))
+    response.events = EventStore(events)
+    return response
+
+
+def test_taxonomy_resolves_names_and_paths():
+    taxonomy = get_taxonomy()
+
+    assert taxonomy.resolve("Rock") == [("Music", "Rock", None)]
+    # "Pop" is also a subgenre of Rock; the genre is meant
+    assert taxonomy.resolve("pop") == [("Music", "Pop", None)]
+    assert taxonomy.resolve("Music - Rock - Alternative Rock") == [("Music", "Rock", "Alternative Rock")]
+
+
+def test_rank_orders_by_genre_city_and_date():
+    events = [
+        _event(0, "Comedy", "Warsaw", "2025-06-02"),
+        _event(1, "Rock", "Berlin", "2025-06-02"),
+        _event(2, "Rock", "Warsaw", "2025-08-30"),
+        _event(3, "Rock", "Warsaw", "2025-06-03"),
+        _event(4, "Pop", "Warsaw", "2025-06-03"),
+    ]
+    params = EventSearchParams(eventGenre="Music - Rock", eventLocationCity="Warsaw", eventStartDate="2025-06-01")
+
+    ranked = EventRanker().rank(_response(events), params, today=TODAY)
+
+    assert [event.id for event in ranked.events] == ["3", "2", "1", "4", "0"]
+    assert isinstance(ranked.events, EventStore)
+    assert ranked.omitted_count == 0
+
+
+def test_rank_keeps_top_k_and_reports_the_rest():
+    events = [_event(i, "Jazz", "Warsaw", f"2025-06-{i + 1:02d}") for i in range(10)]
+    response = _response(events)
+
+    ranked = EventRanker(top_k=3).rank(response, EventSearchParams(eventStartDate="2025-06-01"), today=TODAY)
+
+    assert [event.id for event in ranked.events] == ["0", "1", "2"]
+    assert ranked.omitted_count == 7
+    # The cached response is left as it was
+    assert len(response.events) == 10 and response.omitted_count == 0
+    assert "7 more matches on this page not shown; narrow the search" in encode_events(ranked).text
+
+
+def test_preferences_break_ties():
+    events = [
+        _event(0, "Rock", "Warsaw", "2025-06-05"),
+        _event(1, "Jazz", "Warsaw", "2025-06-05"),
+    ]
+    params = EventSearchParams(eventStartDate="2025-06-01")
+    preferences = UserPreferences(genres={"jazz": 1.0})
+
+    assert [event.id for event in EventRanker().rank(_response(events), params, today=TODAY).events] == ["0", "1"]
+    ranked = EventRanker().rank(_response(events), params, preferences, today=TODAY)
+    assert [event.id for event in ranked.events] == ["1", "0"]
+
+
+def test_infer_preferences_counts_specific_genres():
+    preferences = infer_preferences(
+        ["I love jazz and alternative rock", "Any Jazz concerts? Or music in general"], get_taxonomy())
+
+    assert preferences.genres == {"jazz": 1.0, "alternative rock": 0.5}
+
+
+def test_chat_memory_preferences_follow_the_conversation():
+    memory = ChatMemory()
+    assert not memory.get_preferences()
+
+    memory.add_message(Message(role="user", content="Looking for a jazz night"), "Sure!")
+    memory.user_preferences.cities["Krakow"] = 1.0
+    preferences = memory.get_preferences()
+
+    assert preferences.genres == {"jazz": 1.0}
+    assert preferences.cities == {"Krakow": 1.0}
+
+    memory.clear()
+    assert not memory.get_preferences()
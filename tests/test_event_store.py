@@ -0,0 +1,57 @@
+"""
+Tests for the compact column-oriented EventStore.
+"""
+
+import os
+import sys
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.event_models import Event, EventDate, EventImage, Venue
+from services.event_store import EventStore
+
+
+def _events():
+    return [
+        Event(
+            id=str(i),
+            name=f"Event {i}",
+            description="Live" if i % 2 else None,
+            url=f"https://example.com/{i}" if i % 3 else None,
+            dates=EventDate(start_date=f"2025-06-0{i % 3 + 1}", start_time="19:00:00" if i % 2 else None,
+                            end_date="2025-06-09" if i == 4 else None),
+            venues=[Venue(name="Arena", city="Warsaw", country="Poland", country_code="PL")] if i % 4 else [],
+            images=[EventImage(url=f"https://example.com/{i}.jpg", alt="poster")] if i % 2 else [],
+            genre="Rock" if i % 2 else None,
+        )
+        for i in range(10)
+    ]
+
+
+def test_store_materializes_equal_events():
+    events = _events()
+    store = EventStore(events)
+
+    assert len(store) == len(events)
+    assert list(store) == events
+    assert store[-1] == events[-1]
+    assert store[2:5] == events[2:5]
+    assert store == events
+    assert store == EventStore(events)
+
+
+def test_store_formats_summaries_without_materializing():
+    events = _events()
+    store = EventStore(events)
+
+    assert list(store.summaries()) == [event.format_summary() for event in events]
+
+
+def test_store_shares_repeated_values_and_exposes_columns():
+    store = EventStore(_events())
+
+    assert store.column("genre") == [None, "Rock"] * 5
+    assert store.column("city")[:2] == [None, "Warsaw"]
+    # None, three dates, one time, an end date, a genre and two venue lists
+    assert len(store._values) == 9
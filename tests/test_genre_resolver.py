@@ -0,0 +1,96 @@
+"""
+Tests for resolving free-text genres onto the taxonomy.
+"""
+
+import os
+import sys
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SWAGGER_API_KEY", "test-key")
+
+from services.event_models import EventSearchResponse
+from services.genre_resolver import GenreResolver, fold, get_genre_resolver
+from services.taxonomy import Taxonomy, get_taxonomy
+from tools.event_search import EventSearchAPI
+
+
+def test_fold_ignores_case_punctuation_and_spelling_variants():
+    assert fold("Arts & Theater") == fold("arts and theatre") == "arts and theatre"
+    assert fold("Hip-Hop/Rap") == "hip hop rap"
+
+
+def test_exact_names_and_paths():
+    resolver = get_genre_resolver()
+
+    assert resolver.canonicalize("Sports - Football") == "Sports - Football"
+    assert resolver.canonicalize("football") == "Sports - Football"
+    assert resolver.canonicalize("ROCK") == "Music - Rock"
+    assert resolver.resolve("theater")[0].score == 1.0
+
+
+def test_misspelled_genres():
+    resolver = get_genre_resolver()
+
+    assert resolver.canonicalize("sports - footbal") == "Sports - Football"
+    assert resolver.canonicalize("basketbal") == "Sports - Basketball"
+    assert resolver.canonicalize("hip hop") == "Music - Hip-Hop/Rap"
+
+
+def test_subgenres_resolve_to_their_genre():
+    resolver = get_genre_resolver()
+
+    assert resolver.resolve("Heavy Metal")[0].path == "Music - Metal - Heavy Metal"
+    assert resolver.canonicalize("Heavy Metal") == "Music - Metal"
+    assert resolver.canonicalize("Techno") == "Music - Dance/Electronic"
+
+
+def test_ambiguous_or_unknown_genres_are_not_resolved():
+    resolver = get_genre_resolver()
+
+    # A genre of several segments
+    assert len(resolver.resolve("Comedy")) > 1
+    assert resolver.canonicalize("Comedy") is None
+    assert resolver.canonicalize("xyz") is None
+    assert resolver.resolve("") == ()
+
+
+def test_index_cache_is_keyed_by_the_taxonomy_source(tmp_path):
+    cache_path = tmp_path / "genre_index.pickle"
+    taxonomy = Taxonomy.load(cache_path=None)
+
+    built = GenreResolver(taxonomy, cache_path)
+    assert cache_path.exists()
+    loaded = GenreResolver(taxonomy, cache_path)
+    assert loaded.resolve("fotball") == built.resolve("fotball")
+
+    # A taxonomy without a source file is never cached
+    GenreResolver(Taxonomy([]), tmp_path / "other.pickle")
+    assert not (tmp_path / "other.pickle").exists()
+
+
+class _RecordingEventService:
+    def __init__(self):
+        self.params = None
+
+    async def search_events_async(self, params):
+        self.params = params
+        return EventSearchResponse(total_count=0)
+
+    def prefetch_next_page(self, params, response):
+        pass
+
+
+def test_search_tool_canonicalizes_the_genre():
+    tool = EventSearchAPI(genre_resolver=GenreResolver(get_taxonomy()))
+    tool.event_service = _RecordingEventService()
+
+    tool.run({"eventGenre": "Sports - Footbal", "eventLocationCity": "Warsaw"})
+    assert tool.event_service.params.eventGenre == "Sports - Football"
+
+    # The search request gets a "Segment - Genre" value, never a subgenre path
+    tool.run({"eventGenre": "heavy metal", "eventLocationCity": "Warsaw"})
+    assert tool.event_service.params.eventGenre == "Music - Metal"
+
+    tool.run({"eventGenre": "Comedy"})
+    assert tool.event_service.params.eventGenre == "Comedy"
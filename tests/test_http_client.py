@@ -0,0 +1,118 @@
+"""
+Tests for the pooled HTTP client: retries, Retry-After and per-host limits.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.http_client import HttpClient
+
+
+def _client(handler, **options):
+    options.setdefault("backoff_base", 0.001)
+    return HttpClient(transport=httpx.MockTransport(handler), **options)
+
+
+def _responses(*responses):
+    """Handler answering with the given responses in turn; exceptions are raised."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        response = responses[min(len(requests), len(responses)) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return handler, requests
+
+
+def test_retries_server_errors_and_rate_limits():
+    handler, requests = _responses(httpx.Response(503), httpx.Response(429), httpx.Response(200, json={"ok": True}))
+    client = _client(handler)
+
+    response = asyncio.run(client.get("https://api.test/events"))
+
+    assert response.status_code == 200 and len(requests) == 3
+    assert client.stats()["retries"] == 2 and client.stats()["requests"] == 3
+
+
+def test_client_errors_are_not_retried():
+    handler, requests = _responses(httpx.Response(404))
+
+    response = asyncio.run(_client(handler).get("https://api.test/events"))
+
+    assert response.status_code == 404 and len(requests) == 1
+
+
+def test_last_response_is_returned_when_retries_run_out():
+    handler, requests = _responses(httpx.Response(502))
+
+    response = asyncio.run(_client(handler, max_retries=2).get("https://api.test/events"))
+
+    assert response.status_code == 502 and len(requests) == 3
+
+
+def test_transport_errors_are_retried_then_raised():
+    handler, requests = _responses(httpx.ConnectError("refused"), httpx.Response(200))
+    assert asyncio.run(_client(handler).get("https://api.test/events")).status_code == 200
+
+    handler, requests = _responses(httpx.ConnectError("refused"))
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(_client(handler, max_retries=1).get("https://api.test/events"))
+    assert len(requests) == 2
+
+
+def test_retry_after_is_honoured_and_capped():
+    handler, _ = _responses(httpx.Response(429, headers={"Retry-After": "0.1"}), httpx.Response(200))
+    client = _client(handler, backoff_base=0.0)
+
+    started = time.perf_counter()
+    asyncio.run(client.get("https://api.test/events"))
+    assert time.perf_counter() - started >= 0.1
+
+    capped = HttpClient(backoff_max=2.0)
+    assert capped._backoff_delay(0, httpx.Response(429, headers={"Retry-After": "120"})) == 2.0
+    # Unparseable values (e.g. HTTP dates) fall back to jittered backoff
+    assert 0 <= capped._backoff_delay(0, httpx.Response(503, headers={"Retry-After": "soon"})) <= 0.25
+
+
+def test_backoff_grows_exponentially_up_to_the_cap():
+    client = HttpClient(backoff_base=0.5, backoff_max=4.0)
+
+    assert all(0 <= client._backoff_delay(1) <= 1.0 for _ in range(50))
+    assert all(0 <= client._backoff_delay(10) <= 4.0 for _ in range(50))
+
+
+def test_concurrent_requests_per_host_are_capped():
+    running = {"now": 0, "peak": 0}
+
+    async def handler(request):
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        return httpx.Response(200, content=b"[1, 2, 3]")
+
+    client = _client(handler, per_host_limit=2)
+
+    async def run():
+        async def streamed():
+            async with client.stream("https://api.test/events") as response:
+                return b"".join([chunk async for chunk in response.aiter_bytes()])
+
+        gets = [client.get("https://api.test/events") for _ in range(4)]
+        return await asyncio.gather(*gets, streamed(), streamed())
+
+    results = asyncio.run(run())
+
+    assert running["peak"] == 2
+    assert results[-1] == b"[1, 2, 3]" and all(r.status_code == 200 for r in results[:4])
@@ -0,0 +1,101 @@
+"""
+Tests for the incremental JSON array decoder.
+"""
+
+import json
+import os
+import random
+import sys
+
+import httpx
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SWAGGER_API_KEY", "test-key")
+
+from services.event_api_service import EventApiService
+from services.event_models import EventSearchParams
+from services.http_client import HttpClient
+from services.json_stream import JsonArrayStreamDecoder
+
+
+def _decode_in_chunks(body: bytes, chunk_sizes):
+    decoder = JsonArrayStreamDecoder(("events", "items"))
+    items, pos = [], 0
+    for size in chunk_sizes:
+        if pos >= len(body):
+            break
+        items.extend(decoder.feed(body[pos:pos + size]))
+        pos += size
+    if pos < len(body):
+        items.extend(decoder.feed(body[pos:]))
+    items.extend(decoder.close())
+    return decoder, items
+
+
+def test_streams_array_items_across_arbitrary_chunk_boundaries():
+    document = {
+        "page": {"number": 1, "totalElements": 1234},
+        "events": [{"id": i, "name": f"Zdarzenie żółw {i}", "score": i / 3, "tags": [None, True, "a]b,c}"]}
+                   for i in range(50)],
+        "foundMoreEvents": True,
+        "totalCount": 1234,
+    }
+    body = json.dumps(document, ensure_ascii=False, indent=1).encode("utf-8")
+    rng = random.Random(3)
+    for chunk_sizes in ([1] * len(body), [7, 13, 2], [rng.randint(1, 64) for _ in range(len(body))], [len(body)]):
+        decoder, items = _decode_in_chunks(body, chunk_sizes)
+        assert items == document["events"]
+        assert decoder.array_key == "events"
+        assert decoder.fields == {"page": document["page"], "foundMoreEvents": True, "totalCount": 1234}
+
+
+def test_number_at_chunk_end_waits_for_delimiter():
+    decoder = JsonArrayStreamDecoder(("items",))
+    assert decoder.feed(b'{"totalCount": 12') == []
+    assert decoder.fields == {}
+    assert decoder.feed(b'3, "items": [1, 2') == [1]
+    assert decoder.fields == {"totalCount": 123}
+    assert decoder.feed(b"0]}") == [20]
+    assert decoder.done
+
+
+def test_only_first_array_key_is_streamed():
+    body = b'{"events": null, "items": [{"id": 1}], "events2": [], "events": [3]}'
+    decoder, items = _decode_in_chunks(body, [5] * 20)
+    assert items == [{"id": 1}]
+    assert decoder.array_key == "items"
+    assert decoder.fields["events"] == [3]
+
+
+def test_incomplete_document_raises():
+    decoder = JsonArrayStreamDecoder(("events",))
+    decoder.feed(b'{"events": [{"id": 1}, {"id"')
+    with pytest.raises(ValueError):
+        decoder.close()
+
+
+def test_streamed_search_matches_buffered_search():
+    body = json.dumps({
+        "events": [{"id": i, "name": f"Concert {i}", "startDateTime": "2025-06-01T19:30:00Z", "venues": ["Hall"]}
+                   for i in range(30)],
+        "foundMoreEvents": True,
+    }).encode("utf-8")
+
+    async def chunks():
+        for pos in range(0, len(body), 37):
+            yield body[pos:pos + 37]
+
+    def handler(request):
+        return httpx.Response(200, content=chunks())
+
+    def search(stream_responses):
+        service = EventApiService(api_key="test-key", cache=None, stream_responses=stream_responses,
+                                  http_client=HttpClient(transport=httpx.MockTransport(handler)))
+        return service.search_events(EventSearchParams(eventLocationCity="Berlin"))
+
+    streamed, buffered = search(True), search(False)
+
+    assert len(streamed.events) == 30 and streamed.events == buffered.events
+    assert streamed.found_more_events and streamed.total_count == buffered.total_count == 30
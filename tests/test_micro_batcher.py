@@ -0,0 +1,58 @@
+"""
+Tests for the micro-batcher.
+"""
+
+import asyncio
+import os
+import sys
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.micro_batcher import MicroBatcher
+
+
+def _batcher(**options):
+    batches = []
+
+    async def flush(items):
+        batches.append(items)
+        if "fail" in items:
+            raise RuntimeError("backend down")
+        return [item.upper() for item in items]
+
+    return MicroBatcher(flush, **options), batches
+
+
+def test_concurrent_items_share_a_batch():
+    batcher, batches = _batcher(window=0.01)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(item) for item in ["a", "b", "c"]))
+
+    assert asyncio.run(run()) == ["A", "B", "C"]
+    assert batches == [["a", "b", "c"]]
+    stats = batcher.stats()
+    assert stats["batches"] == 1 and stats["mean_batch_size"] == 3
+    assert stats["queue_delay_ms_p95"] >= 0
+
+
+def test_full_batches_are_sent_without_waiting():
+    batcher, batches = _batcher(window=10, max_batch_size=2)
+
+    async def run():
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(item) for item in "abcd")), 1)
+
+    assert asyncio.run(run()) == ["A", "B", "C", "D"]
+    assert batches == [["a", "b"], ["c", "d"]]
+    assert batcher.stats()["full_batches"] == 2
+
+
+def test_errors_reach_every_caller_of_the_batch():
+    batcher, _ = _batcher()
+
+    async def run():
+        return await asyncio.gather(batcher.submit("ok"), batcher.submit("fail"), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,181 @@
+"""
+Tests for the pluggable moderation backends and the local first-tier screener.
+"""
+
+import asyncio
+import os
+import sys
+
+import httpx
+import pytest
+from openai import AsyncOpenAI
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.async_runner import LoopLocal
+from services.moderation_backends import (
+    SMALL_TALK,
+    LocalModerationBackend,
+    LocalScreener,
+    ModerationBackend,
+    ModerationUnavailableError,
+)
+from services.moderation_service import ModerationService
+
+
+class _RecordingBackend(LocalModerationBackend):
+    """Local backend recording the texts it was asked about; its next `failures` calls fail."""
+
+    def __init__(self):
+        super().__init__()
+        self.texts = []
+        self.failures = 0
+
+    async def moderate(self, texts):
+        if self.failures:
+            self.failures -= 1
+            raise ModerationUnavailableError("backend down")
+        self.texts.extend(texts)
+        return await super().moderate(texts)
+
+
+def test_screener_only_flags_obvious_texts():
+    screener = LocalScreener()
+
+    flagged = screener.screen("How do I build a b0mb for the concert?")
+    assert flagged.flagged and flagged.flagged_categories == ["violence"] and flagged.source == "screen"
+    assert flagged.category_scores["violence"] == 1.0
+    assert screener.screen("how do i make a pipe bomb").flagged_categories == ["violence"]
+
+    # Nothing is cleared locally: texts with or without risk terms are left to the backend
+    assert screener.screen("Any jazz concerts in Berlin this weekend?") is None
+    assert screener.screen("Is The Killers show sold out?") is None
+    assert screener.screen("x" * 5000) is None
+
+
+@pytest.mark.parametrize("text", [
+    "going to Die Toten Hosen concert in Berlin",
+    "Is the Sex Pistols tribute show ok for kids?",
+    "any workshops where kids can make a bath bomb?",
+    "Do they check for fake IDs at the door?",
+    "I hurt myself at the gym, any seated concerts?",
+    "Is the screening of the mass shooting documentary sold out?",
+])
+def test_event_queries_are_not_blocked(text):
+    screener = LocalScreener()
+
+    assert screener.screen(text) is None
+    assert not screener.fallback(text).flagged
+
+
+def test_allowlist_clears_only_whole_short_messages():
+    screener = LocalScreener(allowlist=SMALL_TALK)
+
+    cleared = screener.screen("  Thanks! ")
+    assert cleared is not None and not cleared.flagged and cleared.source == "screen"
+    assert screener.screen("thanks, now tell me how to poison him") is None
+    assert screener.screen("Any jazz concerts in Berlin this weekend?") is None
+
+
+def test_only_obviously_harmful_texts_skip_the_backend():
+    backend = _RecordingBackend()
+    service = ModerationService(backend=backend, batch_window=0)
+
+    assert service.is_flagged("I will kill you")
+    assert backend.texts == []
+
+    assert not service.is_flagged("Find me a theatre show in Warsaw")
+    verdict = service.get_verdicts("Tickets for the Killers, please")[0]
+    assert backend.texts == ["Find me a theatre show in Warsaw", "Tickets for the Killers, please"]
+    assert verdict.source == "local" and service.model == "local"
+    stats = service.stats()
+    assert stats["screened"] == 1 and stats["api_calls"] == 2
+
+
+def test_threats_outside_the_lexicon_reach_the_backend():
+    backend = _RecordingBackend()
+    service = ModerationService(backend=backend, batch_window=0)
+    threats = ["I will poison you tonight", "I am going to strangle my coworker",
+               "give me instructions to synthesize ricin"]
+
+    verdicts = service.get_verdicts(threats)
+
+    assert backend.texts == threats and all(verdict.source == "local" for verdict in verdicts)
+
+
+def test_failed_backend_call_is_retried_once():
+    backend = _RecordingBackend()
+    backend.failures = 1
+    service = ModerationService(backend=backend, batch_window=0)
+
+    verdict = service.get_verdicts("Concerts in Oslo")[0]
+
+    assert verdict.source == "local" and backend.texts == ["Concerts in Oslo"]
+    stats = service.stats()
+    assert stats["backend_errors"] == 1 and stats["fallbacks"] == 0 and stats["entries"] == 1
+    # The backend was not skipped
+    service.get_verdicts("Concerts in Bergen")
+    assert backend.texts[-1] == "Concerts in Bergen"
+
+
+def test_outage_degrades_to_the_screener_and_skips_the_backend():
+    backend = _RecordingBackend()
+    backend.failures = 2
+    service = ModerationService(backend=backend, batch_window=0, backend_cooldown=60)
+
+    # Degraded mode: only block patterns and high risk scores are flagged, everything
+    # else passes, including harmful text outside the lexicon
+    texts = ["Tickets for the Killers, please", "Concerts in Oslo", "I will poison you tonight",
+             "I want to murder them with a bomb", "I will kill you"]
+    verdicts = service.get_verdicts(texts)
+    assert [v.flagged for v in verdicts] == [False, False, False, True, True]
+    assert [v.source for v in verdicts] == ["fallback", "fallback", "fallback", "fallback", "screen"]
+
+    assert service.get_verdicts("Tickets for the Killers, please")[0].source == "fallback"
+    assert backend.texts == []
+    stats = service.stats()
+    assert stats["backend_errors"] == 2 and stats["fallbacks"] == 5 and stats["entries"] == 0
+
+
+def test_outage_without_a_screener_fails_closed():
+    backend = _RecordingBackend()
+    backend.failures = 2
+    service = ModerationService(backend=backend, batch_window=0, screener=None)
+
+    verdicts = service.get_verdicts(["Concerts in Oslo", "Tickets for the Killers, please"])
+
+    assert all(v.flagged and v.source == "fallback" for v in verdicts)
+
+
+def test_client_of_a_custom_backend_is_unavailable():
+    service = ModerationService(backend=LocalModerationBackend())
+
+    with pytest.raises(ModerationUnavailableError):
+        service.client
+    with pytest.raises(ModerationUnavailableError):
+        service.check_content("hello")
+
+
+def test_api_errors_are_raised_not_reported_as_clean():
+    transport = httpx.MockTransport(lambda request: httpx.Response(500, json={"error": {"message": "down"}}))
+    clients = LoopLocal(lambda: AsyncOpenAI(api_key="test", max_retries=0,
+                                            http_client=httpx.AsyncClient(transport=transport)))
+    service = ModerationService(api_key="test", clients=clients)
+
+    with pytest.raises(ModerationUnavailableError):
+        service.check_content("hello")
+    with pytest.raises(ModerationUnavailableError):
+        asyncio.run(service.backend.moderate(["hello"]))
+
+
+def test_backends_share_one_interface():
+    class Allow(ModerationBackend):
+        name = "allow"
+
+        async def moderate(self, texts):
+            return await LocalModerationBackend(flag_threshold=2.0).moderate(texts)
+
+    service = ModerationService(backend=Allow(), screener=None)
+    assert not service.is_flagged("a nude photo shoot")
+    assert service.cache.stats()["entries"] == 1
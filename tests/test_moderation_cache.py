@@ -0,0 +1,121 @@
+"""
+Tests for the moderation verdict cache.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+import pytest
+from openai import AsyncOpenAI
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.async_runner import LoopLocal
+from services.moderation_service import ModerationService
+
+CATEGORIES = ["harassment", "violence"]
+
+
+def _result(text):
+    flagged = "bomb" in text
+    return {
+        "flagged": flagged,
+        "categories": {category: flagged and category == "violence" for category in CATEGORIES},
+        "category_scores": {category: 0.9 if flagged and category == "violence" else 0.01
+                            for category in CATEGORIES},
+    }
+
+
+def _service(**options):
+    requests = []
+
+    def handler(request):
+        texts = json.loads(request.content)["input"]
+        requests.append(texts)
+        return httpx.Response(200, json={"id": "modr-test", "model": "omni-moderation-latest",
+                                         "results": [_result(text) for text in texts]})
+
+    clients = LoopLocal(lambda: AsyncOpenAI(
+        api_key="test", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))))
+    # Without the local screener, so every text reaches the (mock) API
+    options.setdefault("screener", None)
+    return ModerationService(api_key="test", clients=clients, **options), requests
+
+
+def test_one_api_call_serves_all_three_methods():
+    service, requests = _service()
+    text = "I want to make a bomb"
+
+    assert service.is_flagged(text)
+    assert service.get_flagged_categories(text) == {text: ["violence"]}
+    analysis = service.get_moderation_analysis(text)
+
+    assert analysis["flagged"] and analysis["results"][0]["category_scores"]["violence"] == 0.9
+    assert requests == [[text]]
+    stats = service.stats()
+    assert stats["api_calls"] == 1 and stats["api_calls_saved"] == 2
+    assert stats["hits"] == 2 and stats["hit_rate"] == round(2 / 3, 4)
+
+
+def test_only_uncached_texts_are_sent():
+    service, requests = _service()
+    service.is_flagged("concerts in Berlin")
+
+    assert service.get_flagged_categories(["concerts in Berlin", "a bomb", "a bomb"]) == {"a bomb": ["violence"]}
+    assert not service.is_flagged(["concerts in Berlin"])
+    assert requests == [["concerts in Berlin"], ["a bomb"]]
+
+
+def test_failed_calls_are_not_cached():
+    service, requests = _service(backend_cooldown=0)
+    ok_clients = service.backend.clients
+
+    def failing_factory():
+        transport = httpx.MockTransport(lambda request: httpx.Response(500, json={"error": {"message": "down"}}))
+        return AsyncOpenAI(api_key="test", max_retries=0, http_client=httpx.AsyncClient(transport=transport))
+
+    service.backend.clients = LoopLocal(failing_factory)
+    # Without a screener, texts the API could not decide are flagged
+    assert service.get_verdicts("concerts")[0].source == "fallback"
+    assert len(service.cache) == 0
+
+    service.backend.clients = ok_clients
+    assert not service.is_flagged("concerts")
+    assert requests == [["concerts"]]
+
+
+def test_cache_is_bounded_and_keyed_by_model():
+    service, requests = _service(cache_size=2)
+    for text in ["a", "b", "c"]:
+        service.is_flagged(text)
+    assert len(service.cache) == 2
+
+    service.backend.model = "text-moderation-latest"
+    service.is_flagged("c")
+    assert requests[-1] == ["c"]
+
+
+def test_moderation_checks_of_concurrent_sessions_share_a_request():
+    service, requests = _service(batch_window=0.01)
+
+    async def run():
+        return await asyncio.gather(service.is_flagged_async("concerts in Berlin"),
+                                    service.is_flagged_async("a bomb"),
+                                    service.get_flagged_categories_async("a bomb"))
+
+    assert asyncio.run(run()) == [False, True, {"a bomb": ["violence"]}]
+    assert requests == [["concerts in Berlin", "a bomb"]]
+    assert service.stats()["batching"]["items"] == 3
+
+
+@pytest.mark.parametrize("window", [0.0, 0.005])
+def test_sync_callers_are_batched_on_the_shared_loop(window):
+    service, requests = _service(batch_window=window)
+
+    assert service.is_flagged(["a", "b bomb"])
+    assert service.get_moderation_analysis("c")["flagged"] is False
+    assert requests == [["a", "b bomb"], ["c"]]
@@ -0,0 +1,91 @@
+"""
+Tests for the TTL cache and the caching of event search results.
+"""
+
+import os
+import sys
+
+import httpx
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SWAGGER_API_KEY", "test-key")
+
+from services.event_api_service import EventApiService
+from services.event_models import EventSearchParams
+from services.http_client import HttpClient
+from services.ttl_cache import TTLCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr("services.ttl_cache.time.monotonic", clock)
+    cache = TTLCache(ttl=10)
+    cache.put("a", 1)
+
+    clock.now += 9.9
+    assert cache.get("a") == 1
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0 and cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = TTLCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_size_bound_evicts_and_skips_oversized_values():
+    cache = TTLCache(max_bytes=100)
+    cache.put("a", 1, size=60)
+    cache.put("b", 2, size=60)
+    assert cache.get("a") is None and cache.stats()["bytes"] == 60
+
+    cache.put("huge", 3, size=101)
+    assert cache.get("huge") is None and cache.get("b") == 2
+
+    cache.put("b", 4, size=10)
+    assert cache.stats()["bytes"] == 10
+
+
+def test_cache_key_normalizes_equivalent_searches():
+    key = EventSearchParams(eventLocationCity="Berlin", eventGenre="Music - Jazz").cache_key()
+
+    assert EventSearchParams(eventLocationCity=" berlin ", eventGenre="music - jazz", page=1).cache_key() == key
+    assert EventSearchParams(eventLocationCity="Berlin", eventGenre="Music - Jazz", pageSize=50).cache_key() == key
+    assert EventSearchParams(eventLocationCity="Berlin", eventGenre="Music - Jazz", page=2).cache_key() != key
+    assert EventSearchParams(eventLocationCity="Berlin", pageSize=20).cache_key() != \
+        EventSearchParams(eventLocationCity="Berlin").cache_key()
+
+
+def test_repeated_searches_are_served_from_the_cache():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        events = [{"id": "1", "name": "Jazz night", "startDateTime": "2025-06-01T20:00:00Z", "venues": ["A-Trane"]}]
+        return httpx.Response(200, json={"events": events, "foundMoreEvents": False})
+
+    service = EventApiService(api_key="test-key", cache=TTLCache(),
+                              http_client=HttpClient(transport=httpx.MockTransport(handler)))
+
+    first = service.search_events(EventSearchParams(eventLocationCity="Berlin"))
+    second = service.search_events(EventSearchParams(eventLocationCity="BERLIN "))
+
+    assert second is first and len(requests) == 1
+    assert [event.name for event in first.events] == ["Jazz night"]
+    assert dict(requests[0].url.params) == {"eventLocationCity": "Berlin", "pageSize": "50"}
@@ -0,0 +1,75 @@
+"""
+Tests for the split between process-wide resources and per-session state.
+"""
+
+import os
+import sys
+
+import httpx
+from openai import AsyncOpenAI
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SWAGGER_API_KEY", "test-key")
+
+from agents.event_agent import EventAgent
+from agents.shared_resources import SharedResources, get_shared_resources
+from structs.context import Context
+from structs.message import Message
+
+COMPLETION = {
+    "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": "gpt-4.1",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "Hello!"}, "finish_reason": "stop"}],
+}
+
+
+def _resources():
+    created = []
+
+    def client_factory():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=COMPLETION))
+        created.append(AsyncOpenAI(api_key="test", http_client=httpx.AsyncClient(transport=transport)))
+        return created[-1]
+
+    return SharedResources(client_factory=client_factory), created
+
+
+def test_sessions_share_clients_and_keep_their_own_state():
+    resources, created = _resources()
+    first, second = EventAgent(resources=resources), EventAgent(resources=resources)
+
+    assert first.memory_agent is second.memory_agent
+    assert first.memory is not second.memory and first.tools is not second.tools
+
+    for agent in (first, second):
+        result = agent.process(Message(role="user", content="Hi"), Context())
+        agent.summary_worker.wait_idle(5)
+        assert result["response"] == "Hello!"
+
+    # One client (and connection pool) for both sessions and their summaries
+    assert len(created) == 1
+    assert len(first.memory.get_messages()) == len(second.memory.get_messages()) == 2
+
+
+def test_default_and_private_resources():
+    assert EventAgent().resources is get_shared_resources()
+    # An explicit key gets resources of its own
+    assert EventAgent(api_key="sk-other").resources is not get_shared_resources()
+
+
+def test_moderation_service_is_shared(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    resources, _ = _resources()
+
+    moderation = resources.moderation_service
+    assert moderation is resources.moderation_service
+    assert moderation.clients is resources.openai_clients
+
+
+def test_moderation_service_unavailable_without_key(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr("services.moderation_service.get_openai_api_key", lambda: None)
+    resources, _ = _resources()
+
+    assert resources.moderation_service is None
+    assert resources.moderation_service is None
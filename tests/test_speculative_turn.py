@@ -0,0 +1,128 @@
+"""
+Tests for speculative agent turns, started while the user message is being moderated.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+from openai import AsyncOpenAI
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SWAGGER_API_KEY", "test-key")
+
+from agents.event_agent import EventAgent
+from agents.shared_resources import SharedResources
+from structs.context import Context
+from structs.message import Message
+
+DELTAS = ["Two ", "concerts ", "tonight."]
+SUMMARY = {
+    "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": "gpt-4.1",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "Summary"}, "finish_reason": "stop"}],
+}
+
+
+def _chunk(delta):
+    return {"id": "chatcmpl-test", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4.1",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+
+
+def _agent(completion_delay=0.0):
+    calls = []
+
+    async def handler(request):
+        payload = json.loads(request.content)
+        if not payload.get("stream"):
+            return httpx.Response(200, json=SUMMARY)
+        calls.append(payload)
+        await asyncio.sleep(completion_delay)
+        body = "".join(f"data: {json.dumps(_chunk({'content': delta}))}\n\n" for delta in DELTAS)
+        return httpx.Response(200, content=body + "data: [DONE]\n\n",
+                              headers={"content-type": "text/event-stream"})
+
+    resources = SharedResources(client_factory=lambda: AsyncOpenAI(
+        api_key="test", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))))
+    return EventAgent(resources=resources), calls
+
+
+async def _verdict(admitted, delay=0.0):
+    await asyncio.sleep(delay)
+    return admitted
+
+
+def _run_turn(agent, context, admission):
+    async def run():
+        turn = agent.process_stream(Message(role="user", content="Concerts tonight?"), context, admission)
+        return turn, [delta async for delta in turn]
+
+    return asyncio.run(run())
+
+
+def test_admitted_turn_streams_and_commits():
+    agent, calls = _agent()
+    context = Context()
+
+    turn, deltas = _run_turn(agent, context, _verdict(True, delay=0.01))
+    agent.summary_worker.wait_idle(5)
+
+    assert deltas == DELTAS and turn.response == "Two concerts tonight."
+    assert [m.role for m in turn.context.messages] == ["user", "assistant"]
+    assert len(agent.memory.get_messages()) == 2
+    assert not turn.rejected and turn.metrics()["admission_ms"] >= 10
+    # Nothing was visible before admission
+    assert turn.first_token_at >= turn.admitted_at
+    assert len(calls) == 1
+
+
+def test_rejected_turn_is_discarded():
+    agent, _ = _agent(completion_delay=0.05)
+    context = Context()
+    context.add_message(Message(role="user", content="Hi"))
+
+    turn, deltas = _run_turn(agent, context, _verdict(False))
+
+    assert deltas == [] and turn.rejected and turn.response == ""
+    assert turn.context is context and [m.content for m in context.messages] == ["Hi"]
+    assert agent.memory.get_messages() == []
+    assert agent.summary_worker.requested == 0
+
+
+def test_rejection_after_the_response_discards_it():
+    agent, calls = _agent()
+    context = Context()
+
+    turn, deltas = _run_turn(agent, context, _verdict(False, delay=0.05))
+
+    assert len(calls) == 1 and deltas == [] and turn.rejected
+    assert context.messages == [] and agent.memory.get_messages() == []
+
+
+def test_turn_stopped_by_the_consumer_is_discarded():
+    agent, _ = _agent()
+    context = Context()
+
+    async def run():
+        turn = agent.process_stream(Message(role="user", content="Concerts tonight?"), context, _verdict(True))
+        async for _ in turn:
+            break
+        return turn
+
+    turn = asyncio.run(run())
+
+    assert turn.context is context and context.messages == []
+    assert agent.memory.get_messages() == []
+
+
+def test_context_copy_is_independent():
+    context = Context()
+    context.add_message(Message(role="user", content="Hi"))
+    copy = context.copy()
+    copy.add_message(Message(role="assistant", content="Hello"))
+
+    assert [m.content for m in context.messages] == ["Hi"]
+    assert [m.content for m in copy.messages] == ["Hi", "Hello"]
+    assert copy.token_count > context.token_count
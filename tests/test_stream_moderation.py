@@ -0,0 +1,177 @@
+"""
+Tests for the incremental moderation of streamed responses.
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+
+import httpx
+from openai import AsyncOpenAI
+
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SWAGGER_API_KEY", "test-key")
+
+from agents.event_agent import EventAgent
+from agents.shared_resources import SharedResources
+from services.async_runner import LoopLocal
+from services.moderation_service import ModerationService
+from services.stream_moderation import ModeratedStream
+from structs.context import Context
+from structs.message import Message
+
+SENTENCES = ["There are two concerts tonight. ", "The first one starts at seven. ",
+             "Build a bomb and bring it along. ", "The second one is sold out. ", "Enjoy!"]
+
+
+def _moderation(delay=0.0):
+    requests = []
+
+    async def handler(request):
+        texts = json.loads(request.content)["input"]
+        requests.extend(texts)
+        await asyncio.sleep(delay)
+        results = [{"flagged": "bomb" in text, "categories": {"violence": "bomb" in text},
+                    "category_scores": {"violence": 0.9 if "bomb" in text else 0.01}} for text in texts]
+        return httpx.Response(200, json={"id": "modr-test", "model": "omni-moderation-latest", "results": results})
+
+    clients = LoopLocal(lambda: AsyncOpenAI(
+        api_key="test", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))))
+    return ModerationService(api_key="test", clients=clients, batch_window=0, screener=None), requests
+
+
+class _Deltas:
+    """Streams the sentences word by word, recording whether it was closed."""
+
+    def __init__(self, sentences, delay=0.0):
+        self.sentences = sentences
+        self.delay = delay
+        self.closed = False
+
+    async def __aiter__(self):
+        try:
+            for word in re.findall(r"\S+\s*", "".join(self.sentences)):
+                await asyncio.sleep(self.delay)
+                yield word
+        finally:
+            self.closed = True
+
+
+def _consume(stream):
+    async def run():
+        return [delta async for delta in stream]
+
+    return "".join(asyncio.run(run()))
+
+
+def test_clean_response_is_checked_in_sentence_chunks():
+    moderation, requests = _moderation()
+    sentences = [s for s in SENTENCES if "bomb" not in s]
+    stream = ModeratedStream(_Deltas(sentences, delay=0.001), moderation, min_chunk_chars=30)
+
+    text = _consume(stream)
+
+    assert not stream.flagged and not stream.stopped
+    assert "".join(stream.chunks) == text
+    assert len(stream.chunks) > 1
+    assert all(chunk.rstrip().endswith((".", "!")) for chunk in stream.chunks)
+    assert sorted(requests) == sorted(stream.chunks)
+    assert stream.metrics()["verdict_after_last_token_ms"] is not None
+
+
+def test_flagged_chunk_stops_the_stream():
+    moderation, _ = _moderation()
+    deltas = _Deltas(SENTENCES, delay=0.005)
+    stream = ModeratedStream(deltas, moderation, min_chunk_chars=20)
+
+    text = _consume(stream)
+
+    assert stream.flagged and stream.stopped and stream.flagged_categories == ["violence"]
+    assert "sold out" not in text and deltas.closed
+
+
+def test_flag_in_the_last_chunk_is_reported_after_the_stream():
+    moderation, _ = _moderation(delay=0.01)
+    stream = ModeratedStream(_Deltas(SENTENCES[:3]), moderation, min_chunk_chars=1000)
+
+    text = _consume(stream)
+
+    assert text.startswith("There are") and stream.chunks == [text]
+    assert stream.flagged and not stream.stopped
+
+
+def _agent(sentences):
+    """An agent whose completions stream the sentences word by word, a few milliseconds apart."""
+
+    async def handler(request):
+        chunks = [{"id": "chatcmpl-test", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4.1",
+                   "choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}]}
+                  for word in re.findall(r"\S+\s*", "".join(sentences))]
+
+        async def body():
+            for chunk in chunks:
+                await asyncio.sleep(0.005)
+                yield f"data: {json.dumps(chunk)}\n\n".encode()
+            yield b"data: [DONE]\n\n"
+
+        return httpx.Response(200, content=body(), headers={"content-type": "text/event-stream"})
+
+    resources = SharedResources(client_factory=lambda: AsyncOpenAI(
+        api_key="test", http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))))
+    return EventAgent(resources=resources)
+
+
+async def _admitted():
+    return True
+
+
+def _moderated_turn(sentences, min_chunk_chars, speculative=False):
+    agent = _agent(sentences)
+    moderation, _ = _moderation()
+    context = Context()
+    context.add_message(Message(role="user", content="Hi"))
+
+    async def run():
+        turn = agent.process_stream(Message(role="user", content="Concerts tonight?"), context,
+                                    _admitted() if speculative else None)
+        stream = ModeratedStream(turn, moderation, min_chunk_chars=min_chunk_chars)
+        turn.review = stream.verdict
+        return turn, stream, "".join([delta async for delta in stream])
+
+    turn, stream, text = asyncio.run(run())
+    return agent, context, turn, stream, text
+
+
+@pytest.mark.parametrize("speculative", [False, True])
+def test_clean_reply_is_committed(speculative):
+    sentences = [s for s in SENTENCES if "bomb" not in s]
+    agent, context, turn, stream, text = _moderated_turn(sentences, 20, speculative)
+    agent.summary_worker.wait_idle(5)
+
+    assert not stream.flagged and not turn.discarded
+    assert [m.content for m in turn.context.messages] == ["Hi", "Concerts tonight?", text]
+    assert len(agent.memory.get_messages()) == 2
+
+
+@pytest.mark.parametrize("speculative", [False, True])
+def test_reply_stopped_mid_stream_is_discarded(speculative):
+    agent, context, turn, stream, text = _moderated_turn(SENTENCES, 20, speculative)
+
+    assert stream.stopped and "sold out" not in text
+    assert turn.discarded and turn.metrics()["discarded"] and turn.total_latency is None
+    assert turn.context is context and [m.content for m in context.messages] == ["Hi"]
+    assert agent.memory.get_messages() == []
+
+
+@pytest.mark.parametrize("speculative", [False, True])
+def test_reply_flagged_by_the_last_chunk_is_discarded(speculative):
+    agent, context, turn, stream, text = _moderated_turn(SENTENCES[:3], 1000, speculative)
+
+    assert stream.flagged and not stream.stopped and "bomb" in text
+    assert turn.discarded and turn.context is context and [m.content for m in context.messages] == ["Hi"]
+    assert agent.memory.get_messages() == [] and agent.summary_worker.requested == 0
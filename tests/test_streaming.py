@@ -0,0 +1,114 @@
+"""
+Tests for the streaming helpers and streamed agent turns.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import httpx
+from openai import AsyncOpenAI
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SWAGGER_API_KEY", "test-key")
+
+from agents.event_agent import EventAgent
+from agents.shared_resources import SharedResources
+from agents.streaming import StreamedTurn, ToolCallAccumulator
+from structs.context import Context
+from structs.message import Message
+
+
+def _delta(index, call_id=None, name=None, arguments=None):
+    return SimpleNamespace(index=index, id=call_id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+def _chunk(delta):
+    return {"id": "chatcmpl-test", "object": "chat.completion.chunk", "created": 0, "model": "gpt-4.1",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+
+
+def _sse(*deltas):
+    body = "".join(f"data: {json.dumps(_chunk(delta))}\n\n" for delta in deltas)
+    return httpx.Response(200, content=body + "data: [DONE]\n\n", headers={"content-type": "text/event-stream"})
+
+
+def test_accumulator_merges_tool_call_deltas_by_index():
+    accumulator = ToolCallAccumulator()
+    accumulator.add([_delta(1, "call_b", "search_events", '{"city"'), _delta(0, "call_a", "get_", "")])
+    accumulator.add([_delta(1, arguments=': "Oslo"}'), _delta(0, name="today_date", arguments="{}")])
+
+    calls = accumulator.tool_calls()
+
+    assert [call.id for call in calls] == ["call_a", "call_b"]
+    assert calls[0].function.name == "get_today_date" and calls[0].function.arguments == "{}"
+    assert json.loads(calls[1].function.arguments) == {"city": "Oslo"}
+    assert ToolCallAccumulator().tool_calls() == []
+
+
+def test_streamed_turn_records_latency_and_iterates_from_sync_code():
+    async def deltas(turn):
+        await asyncio.sleep(0.01)
+        turn.mark_token()
+        yield "Hello"
+        turn.mark_token()
+        yield " there"
+
+    turn = StreamedTurn()
+    turn.bind(deltas(turn))
+
+    assert list(turn) == ["Hello", " there"]
+    assert turn.done and turn.time_to_first_token >= 0.01
+    assert turn.total_latency >= turn.time_to_first_token
+    metrics = turn.metrics()
+    assert metrics["time_to_first_token_ms"] >= 10 and "admission_ms" not in metrics
+
+
+def test_streamed_turn_closes_its_producer_when_stopped_early():
+    closed = []
+
+    async def deltas():
+        try:
+            yield "a"
+            yield "b"
+        finally:
+            closed.append(True)
+
+    async def run():
+        turn = StreamedTurn().bind(deltas())
+        async for _ in turn:
+            break
+        return turn
+
+    turn = asyncio.run(run())
+
+    assert closed == [True] and not turn.done
+
+
+def test_failed_completion_after_tool_calls_ends_the_turn_with_an_error():
+    requests = []
+
+    async def handler(request):
+        payload = json.loads(request.content)
+        requests.append(payload)
+        if len(requests) == 1:
+            tool_call = {"index": 0, "id": "call_1", "type": "function",
+                         "function": {"name": "unknown_tool", "arguments": "{}"}}
+            return _sse({"tool_calls": [tool_call]})
+        return httpx.Response(500, json={"error": {"message": "down"}})
+
+    resources = SharedResources(client_factory=lambda: AsyncOpenAI(
+        api_key="test", max_retries=0, http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))))
+    agent = EventAgent(resources=resources)
+    context = Context()
+
+    turn = agent.process_stream(Message(role="user", content="Concerts tonight?"), context)
+    deltas = list(turn)
+
+    assert turn.failed and deltas == ["Error processing request."]
+    assert [m.role for m in turn.context.messages] == ["user", "assistant", "tool", "assistant"]
+    assert turn.context.messages[-1].content.startswith("I'm sorry")
+    assert agent.memory.get_messages()[-1].content == "Error processing request."
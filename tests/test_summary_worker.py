@@ -0,0 +1,79 @@
+"""
+Tests for the background memory summary worker.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.summary_worker import SummaryWorker
+from memory.chat_memory import ChatMemory
+from structs.message import Message
+
+
+class _FakeMemoryAgent:
+    """Summarizes by counting messages; blocks on `release` and fails while `fail` is set."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        self.fail = False
+        self.calls = 0
+
+    async def update_summary_async(self, memory):
+        self.calls += 1
+        self.started.set()
+        while not self.release.is_set():
+            await asyncio.sleep(0.001)
+        if self.fail:
+            raise RuntimeError("API down")
+        _, upto = memory.get_new_memory()
+        memory.update_summary(f"{upto} messages", summarized_upto=upto)
+
+
+def _add_turn(memory, text):
+    memory.add_message(Message(role="user", content=text), f"Reply to {text}")
+
+
+def test_requests_during_a_summary_are_coalesced_into_one_follow_up():
+    agent, memory = _FakeMemoryAgent(), ChatMemory()
+    worker = SummaryWorker(agent, memory)
+    agent.release.clear()
+
+    _add_turn(memory, "first")
+    worker.request()
+    assert agent.started.wait(5)
+    for text in ["second", "third", "fourth"]:
+        _add_turn(memory, text)
+        worker.request()
+    agent.release.set()
+
+    assert worker.wait_idle(5)
+    stats = worker.stats()
+    assert stats["requested"] == 4 and stats["coalesced"] == 2
+    assert stats["completed"] == 2 and agent.calls == 2 and not stats["running"]
+    # The follow-up summary covers every turn added while the first one ran
+    assert memory.get_summary() == "8 messages" and memory.summarized_upto == 8
+
+
+def test_failures_are_counted_and_the_worker_keeps_going():
+    agent, memory = _FakeMemoryAgent(), ChatMemory()
+    worker = SummaryWorker(agent, memory)
+    summary = memory.get_summary()
+
+    agent.fail = True
+    _add_turn(memory, "first")
+    worker.request()
+    assert worker.wait_idle(5)
+    assert worker.stats()["failed"] == 1 and memory.get_summary() == summary
+    assert memory.summarized_upto == 0
+
+    agent.fail = False
+    worker.request()
+    assert worker.wait_idle(5)
+    assert worker.stats()["completed"] == 1 and memory.summarized_upto == 2
@@ -0,0 +1,69 @@
+"""
+Tests for the compiled category taxonomy and the event categories tool.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.taxonomy import Taxonomy
+from tools.event_categories import EventCategoriesAPI
+
+
+def _write_source(path, genres):
+    classifications = [{"segment": {
+        "id": "S1", "name": "Music",
+        "_embedded": {"genres": [
+            {"id": f"G{i}", "name": name, "_embedded": {"subgenres": [{"id": f"G{i}-1", "name": f"{name} Classics"}]}}
+            for i, name in enumerate(genres)
+        ]},
+    }}]
+    path.write_text(json.dumps({"_embedded": {"classifications": classifications}}))
+
+
+def test_artifact_is_reused_and_rebuilt_when_the_source_changes(tmp_path):
+    source, cache_path = tmp_path / "types.json", tmp_path / "cache" / "taxonomy.pickle"
+    _write_source(source, ["Rock", "Jazz"])
+
+    first = Taxonomy.load(source, cache_path)
+    assert cache_path.exists()
+    assert Taxonomy.load(source, cache_path).genre_names == first.genre_names == ("Jazz", "Rock")
+
+    _write_source(source, ["Rock", "Blues"])
+    updated = Taxonomy.load(source, cache_path)
+    assert updated.genre_names == ("Blues", "Rock")
+    assert updated.name_list("subgenres", "Blues") == "Blues Classics"
+
+
+def test_unreadable_artifact_is_replaced(tmp_path):
+    source, cache_path = tmp_path / "types.json", tmp_path / "taxonomy.pickle"
+    _write_source(source, ["Rock"])
+    cache_path.write_bytes(b"not a pickle")
+
+    assert Taxonomy.load(source, cache_path).segments == {"Music": "S1"}
+    assert Taxonomy.load(source, cache_path).genres == {"Rock": ("G0", "Music")}
+
+
+def test_taxonomy_is_read_only(tmp_path):
+    source = tmp_path / "types.json"
+    _write_source(source, ["Rock"])
+    taxonomy = Taxonomy.load(source, cache_path=None)
+
+    with pytest.raises(TypeError):
+        taxonomy.genres["Jazz"] = ("G9", "Music")
+
+
+def test_categories_tool_lists_sorted_names():
+    tool = EventCategoriesAPI()
+
+    genres = tool.run({"action": "list_genres", "segment": "Music"})
+    names = genres.split(": ", 1)[1].split(", ")
+    assert genres.startswith("Available genres for Music: ")
+    assert names == sorted(names) and "Rock" in names
+    assert tool.run({"action": "get_genre_id", "genre": "Rock"}).startswith("ID for genre 'Rock': ")
+    assert tool.run({"action": "list_genres", "segment": "Nope"}).startswith("Segment 'Nope' not found.")
@@ -0,0 +1,84 @@
+"""
+Tests for the concurrent tool executor.
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.tool_executor import ToolExecutor
+from tools.base_tool import BaseTool
+
+
+class _SleepTool(BaseTool):
+    """Sleeps for `seconds` and echoes its label; records how many calls ran at once."""
+
+    running = 0
+    peak = 0
+
+    def get_description(self) -> str:
+        return "sleep"
+
+    def run(self, params) -> str:
+        raise NotImplementedError
+
+    async def run_async(self, params) -> str:
+        _SleepTool.running += 1
+        _SleepTool.peak = max(_SleepTool.peak, _SleepTool.running)
+        try:
+            await asyncio.sleep(params["seconds"])
+        finally:
+            _SleepTool.running -= 1
+        return params["label"]
+
+
+def _call(call_id, name, arguments):
+    return SimpleNamespace(id=call_id, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+def _sleep(call_id, seconds, name="sleep"):
+    return _call(call_id, name, f'{{"seconds": {seconds}, "label": "{call_id}"}}')
+
+
+def test_results_keep_the_order_of_the_tool_calls():
+    calls = [_sleep("slow", 0.05), _sleep("fast", 0.0), _sleep("medium", 0.02)]
+    results = ToolExecutor().run_all(calls, {"sleep": _SleepTool()})
+
+    assert [r.tool_call_id for r in results] == ["slow", "fast", "medium"]
+    assert [r.output for r in results] == ["slow", "fast", "medium"]
+    assert results[0].duration > results[1].duration
+
+
+def test_a_slow_tool_times_out_without_holding_up_the_others():
+    executor = ToolExecutor(timeout=5.0, tool_timeouts={"stuck": 0.05})
+    calls = [_sleep("stuck", 10, name="stuck"), _sleep("ok", 0.01)]
+    tools = {"sleep": _SleepTool(), "stuck": _SleepTool()}
+
+    results = executor.run_all(calls, tools)
+
+    assert results[0].timed_out and "timed out" in results[0].output
+    assert results[0].duration < 1.0
+    assert not results[1].timed_out and results[1].output == "ok"
+    assert results[0].timing()["timed_out"] is True
+
+
+def test_concurrency_is_capped_by_max_workers():
+    _SleepTool.running = _SleepTool.peak = 0
+    calls = [_sleep(f"call-{i}", 0.02) for i in range(6)]
+
+    results = ToolExecutor(max_workers=2).run_all(calls, {"sleep": _SleepTool()})
+
+    assert len(results) == 6 and _SleepTool.peak == 2
+
+
+def test_failures_become_error_messages():
+    calls = [_call("a", "missing", "{}"), _call("b", "sleep", "{not json"), _call("c", "sleep", "{}")]
+    results = ToolExecutor().run_all(calls, {"sleep": _SleepTool()})
+
+    assert results[0].output == "Error: unknown tool 'missing'."
+    assert results[1].output.startswith("Error: invalid arguments for tool 'sleep'")
+    assert results[2].output.startswith("Unexpected error:")
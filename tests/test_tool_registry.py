@@ -0,0 +1,86 @@
+"""
+Tests for the lazy tool registry.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SWAGGER_API_KEY", "test-key")
+
+from agents.event_agent import EVENT_AGENT_TOOLS, EventAgent
+from tools.base_tool import BaseTool
+from tools.registry import ToolRegistry, ToolSpec, load_tool_description
+
+
+class _DateTool(BaseTool):
+    created = 0
+
+    def __init__(self, suffix: str = ""):
+        _DateTool.created += 1
+        self.suffix = suffix
+
+    def get_description(self) -> str:
+        return "date"
+
+    def run(self, params) -> str:
+        return "2025-06-01" + self.suffix
+
+
+def _registry():
+    return ToolRegistry([
+        ToolSpec("get_today_date", _DateTool, "today_date.json"),
+        ToolSpec("search_events", _DateTool, "event_search.json", enabled=False),
+    ])
+
+
+def test_tools_are_built_on_first_access_once_per_session():
+    registry = _registry()
+    _DateTool.created = 0
+
+    view = registry.view(get_today_date={"suffix": "!"})
+    assert list(view) == ["get_today_date"] and _DateTool.created == 0
+
+    assert view["get_today_date"].run({}) == "2025-06-01!"
+    assert view.get("get_today_date") is view["get_today_date"]
+    assert _DateTool.created == 1
+    assert registry.view()["get_today_date"].run({}) == "2025-06-01"
+    assert registry.startup_report()["get_today_date"]["instances"] == 2
+
+
+def test_disabled_and_unknown_tools_are_not_offered():
+    view = _registry().view()
+
+    assert "search_events" not in view
+    assert view.get("search_events") is None
+    with pytest.raises(KeyError):
+        view["unknown"]
+    with pytest.raises(ValueError):
+        _registry().view(unknown={})
+
+
+def test_schemas_are_loaded_once_and_shared():
+    registry = _registry()
+
+    assert registry.schemas is registry.schemas
+    assert registry.schemas == [load_tool_description("today_date.json")]
+    assert registry.startup_report()["get_today_date"]["schema_tokens"] > 0
+
+
+def test_schema_name_must_match_the_declaration():
+    registry = ToolRegistry([ToolSpec("wrong_name", _DateTool, "today_date.json")])
+
+    with pytest.raises(ValueError):
+        registry.schemas
+
+
+def test_event_agent_sessions_share_schemas_and_build_no_tools():
+    instances = EVENT_AGENT_TOOLS.startup_report()["search_events"]["instances"]
+    first, second = EventAgent(), EventAgent()
+
+    assert first.tool_schemas is second.tool_schemas is EVENT_AGENT_TOOLS.schemas
+    assert [schema["function"]["name"] for schema in first.tool_schemas] == ["search_events"]
+    assert EVENT_AGENT_TOOLS.startup_report()["search_events"]["instances"] == instances
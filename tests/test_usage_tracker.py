@@ -0,0 +1,52 @@
+"""
+Tests for the prompt cache usage tracker.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.usage_tracker import PromptCacheStats
+
+
+def _usage(prompt_tokens, cached_tokens=None, completion_tokens=10):
+    details = SimpleNamespace(cached_tokens=cached_tokens) if cached_tokens is not None else None
+    return SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                           prompt_tokens_details=details)
+
+
+def test_records_cached_prompt_tokens():
+    stats = PromptCacheStats()
+    record = stats.record(_usage(2000, cached_tokens=1536), source="event_agent", model="gpt-4.1")
+    stats.record(_usage(1000), source="memory_agent")
+
+    assert record.cached_tokens == 1536 and record.source == "event_agent"
+    assert stats.calls == 2 and stats.prompt_tokens == 3000 and stats.cached_tokens == 1536
+    assert stats.hit_rate == 1536 / 3000
+    assert [r["source"] for r in stats.recent()] == ["event_agent", "memory_agent"]
+    assert stats.recent(1)[0]["cached_tokens"] == 0
+
+
+def test_missing_usage_is_ignored():
+    stats = PromptCacheStats()
+
+    assert stats.record(None, source="event_agent") is None
+    assert stats.calls == 0 and stats.hit_rate == 0.0
+    assert stats.summary()["recent_hit_rate"] == 0.0
+
+
+def test_summary_separates_totals_from_the_recent_window():
+    stats = PromptCacheStats(history_size=2)
+    stats.record(_usage(1000), source="event_agent")
+    stats.record(_usage(1000, cached_tokens=1000), source="event_agent")
+    stats.record(_usage(1000, cached_tokens=500), source="event_agent")
+
+    summary = stats.summary()
+
+    assert summary["calls"] == 3 and summary["recent_calls"] == 2
+    assert summary["hit_rate"] == 0.5
+    assert summary["recent_hit_rate"] == 0.75
+    assert summary["completion_tokens"] == 30
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 
 class BaseTool(ABC):
@@ -16,4 +17,12 @@ class BaseTool(ABC):
         """
         Run the tool with the given parameters.
         """
-        raise NotImplementedError("Subclasses should implement this method.")
\ No newline at end of file
+        raise NotImplementedError("Subclasses should implement this method.")
+
+    async def run_async(self, params) -> str:
+        """
+        Run the tool with the given parameters without blocking the event loop.
+        Tools doing I/O should override this with a native implementation and make
+        `run` a thin wrapper around it; by default `run` is executed in a worker thread.
+        """
+        return await asyncio.to_thread(self.run, params)
@@ -5,21 +5,28 @@ Handles interaction with the Ticketmaster Discovery API for event details.
 Provides a tool class to fetch details for a specific event by ID, compatible with BaseTool.
 """
 
-import requests
+import httpx
 from tools.base_tool import BaseTool
-import json
+from tools.registry import load_tool_description
+from services.async_runner import run_sync
+from services.http_client import get_http_client
 from env_config import get_ticketmaster_api_key
 
 BASE_URL = "https://app.ticketmaster.com/discovery/v2/events/{id}.json"
 
 class TicketmasterEventDetailsAPI(BaseTool):
     def __init__(self):
-        with open("tools/descriptions/event_details.json", "r") as file:
-            self.tool_description = json.load(file)
+        self.tool_description = load_tool_description("event_details.json")
     def get_description(self) -> str:
         return self.tool_description["function"]["description"]
 
     def run(self, params) -> str:
+        """
+        Synchronous wrapper around run_async.
+        """
+        return run_sync(self.run_async(params))
+
+    async def run_async(self, params) -> str:
         """
         Run the Ticketmaster event details lookup with the given parameters.
         Args:
@@ -35,7 +42,7 @@ class TicketmasterEventDetailsAPI(BaseTool):
         }
         url = BASE_URL.format(id=event_id)
         try:
-            response = requests.get(url, params=api_params, timeout=10)
+            response = await get_http_client().get(url, params=api_params, timeout=10)
             response.raise_for_status()
             data = response.json()
             # Summarize key event details
@@ -69,7 +76,7 @@ class TicketmasterEventDetailsAPI(BaseTool):
             if please_note:
                 summary += f"\nNote: {please_note}"
             return summary
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             return f"Error contacting Ticketmaster API: {e}"
         except Exception as e:
             return f"Unexpected error: {e}"
@@ -1,18 +1,53 @@
 from tools.base_tool import BaseTool
-import json
-from typing import Dict, Any
+from tools.registry import load_tool_description
+import logging
+from typing import Callable, Dict, Any, Optional
+from memory.preferences import UserPreferences
 from services.event_api_service import EventApiService, EventSearchParams
+from services.event_encoder import DEFAULT_TOKEN_BUDGET, encode_events
+from services.event_ranker import EventRanker
+from services.genre_resolver import GenreResolver, get_genre_resolver
+from services.async_runner import run_sync
+
+logger = logging.getLogger(__name__)
 
 class EventSearchAPI(BaseTool):
-    def __init__(self):
-        with open("tools/descriptions/event_search.json", "r") as file:
-            self.tool_description = json.load(file)
+    def __init__(self, token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET, ranker: Optional[EventRanker] = None,
+                 preferences_provider: Optional[Callable[[], UserPreferences]] = None,
+                 genre_resolver: Optional[GenreResolver] = None):
+        """
+        Args:
+            token_budget: Maximum number of estimated tokens of a search result
+                          fed back to the model, or None for no limit
+            ranker: Ranks the results so only the best ones reach the model;
+                    defaults to an EventRanker with its default top-k
+            preferences_provider: Returns the current user's preferences for ranking
+            genre_resolver: Maps free-text genres onto the taxonomy; defaults to
+                            the shared resolver, built on first use
+        """
+        self.tool_description = load_tool_description("event_search.json")
         self.event_service = EventApiService()
+        self.token_budget = token_budget
+        self.ranker = ranker or EventRanker()
+        self.preferences_provider = preferences_provider
+        self._genre_resolver = genre_resolver
+
+    @property
+    def genre_resolver(self) -> GenreResolver:
+        if self._genre_resolver is None:
+            self._genre_resolver = get_genre_resolver()
+        return self._genre_resolver
 
     def get_description(self) -> str:
         return self.tool_description["function"]["description"]
 
     def run(self, params: Dict[str, Any]) -> str:
+        """
+        Synchronous wrapper around run_async.
+        """
+        return run_sync(self.run_async(params))
+
+    async def run_async(self, params: Dict[str, Any]) -> str:
         """
         Run the event search with the given parameters.
         Args:
@@ -28,11 +63,29 @@ class EventSearchAPI(BaseTool):
             # Convert dict to Pydantic model for validation
             search_params = EventSearchParams(**params)
             
+            # Use the canonical taxonomy entry for misspelled or loosely formatted genres
+            if search_params.eventGenre:
+                genre = self.genre_resolver.canonicalize(search_params.eventGenre)
+                if genre and genre != search_params.eventGenre:
+                    logger.info("Resolved genre %r to %r", search_params.eventGenre, genre)
+                    search_params.eventGenre = genre
+            
             # Use the service to get events
-            events_response = self.event_service.search_events(search_params)
+            events_response = await self.event_service.search_events_async(search_params)
+            # Warm the cache for a likely "show me more" follow-up
+            self.event_service.prefetch_next_page(search_params, events_response)
+            
+            # Put the best matches first and forward only the top-k
+            preferences = self.preferences_provider() if self.preferences_provider else None
+            ranked_response = self.ranker.rank(events_response, search_params, preferences)
             
             # Format the response for LLM
-            return self.event_service.format_events_for_llm(events_response)
+            encoded = encode_events(ranked_response, self.token_budget)
+            logger.info(
+                "Encoded %d of %d events in ~%d tokens (budget %s)",
+                encoded.shown, encoded.available, encoded.tokens, self.token_budget,
+            )
+            return encoded.text
             
         except ValueError as e:
             return f"Error: {str(e)}"
@@ -0,0 +1,200 @@
+"""
+registry.py
+
+Declares the tools of an agent once per process and hands each session a
+lazy view of them.
+
+Tool descriptions (the JSON schemas sent with every completion request) are
+read from tools/descriptions once per process, independent of the working
+directory. A ToolRegistry builds the schema list of its enabled tools once;
+every session sends that same list object. Tools are only instantiated when
+a session first calls them, and the registry records what loading schemas
+and constructing tools costs.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from structs.tokens import estimate_tokens
+from tools.base_tool import BaseTool
+
+logger = logging.getLogger(__name__)
+
+DESCRIPTIONS_DIR = Path(__file__).parent / "descriptions"
+
+
+@lru_cache(maxsize=None)
+def load_tool_description(file_name: str) -> Dict[str, Any]:
+    """
+    Load a tool description from tools/descriptions, once per process.
+
+    The returned dict is shared by all tools and sessions and must not be modified.
+    """
+    with open(DESCRIPTIONS_DIR / file_name, "r") as file:
+        return json.load(file)
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """
+    Declaration of a tool.
+
+    Attributes:
+        name: Function name the model calls the tool by
+        factory: Builds the tool; called with the session's options for this tool
+        description_file: File in tools/descriptions with the tool's schema
+        enabled: Whether the tool is offered to the model
+    """
+    name: str
+    factory: Callable[..., BaseTool]
+    description_file: str
+    enabled: bool = True
+
+
+@dataclass
+class ToolStartupCost:
+    """What a tool costs to set up, in milliseconds."""
+    schema_ms: float = 0.0
+    first_init_ms: Optional[float] = None
+    last_init_ms: Optional[float] = None
+    instances: int = 0
+    schema_tokens: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "schema_ms": round(self.schema_ms, 3),
+            "first_init_ms": None if self.first_init_ms is None else round(self.first_init_ms, 3),
+            "last_init_ms": None if self.last_init_ms is None else round(self.last_init_ms, 3),
+            "instances": self.instances,
+            "schema_tokens": self.schema_tokens,
+        }
+
+
+class ToolRegistry:
+    """Process-wide declarations of the tools available to an agent."""
+
+    def __init__(self, specs: List[ToolSpec]):
+        """
+        Args:
+            specs: The tool declarations; names must be unique
+        """
+        self._specs: Dict[str, ToolSpec] = {}
+        for spec in specs:
+            if spec.name in self._specs:
+                raise ValueError(f"Duplicate tool name: {spec.name}")
+            self._specs[spec.name] = spec
+        self._lock = threading.Lock()
+        self._schemas: Optional[List[Dict[str, Any]]] = None
+        self._costs: Dict[str, ToolStartupCost] = {name: ToolStartupCost() for name in self._specs}
+
+    @property
+    def specs(self) -> List[ToolSpec]:
+        """All declared tools, enabled or not."""
+        return list(self._specs.values())
+
+    @property
+    def names(self) -> List[str]:
+        """Names of the enabled tools."""
+        return [name for name, spec in self._specs.items() if spec.enabled]
+
+    @property
+    def schemas(self) -> List[Dict[str, Any]]:
+        """
+        Schemas of the enabled tools, built once.
+
+        Every caller gets the same list, so the `tools` part of every request
+        is identical (and can be served from the provider's prompt cache).
+        It must not be modified.
+        """
+        if self._schemas is None:
+            self._load_schemas()
+        return self._schemas
+
+    def _load_schemas(self) -> None:
+        with self._lock:
+            if self._schemas is not None:
+                return
+            schemas = []
+            for name in self.names:
+                spec = self._specs[name]
+                started = time.perf_counter()
+                schema = load_tool_description(spec.description_file)
+                self._costs[name].schema_ms = (time.perf_counter() - started) * 1000
+                declared = schema.get("function", {}).get("name")
+                if declared != name:
+                    raise ValueError(f"Tool '{name}' is described as '{declared}' in {spec.description_file}")
+                self._costs[name].schema_tokens = estimate_tokens(json.dumps(schema, separators=(",", ":")))
+                schemas.append(schema)
+            self._schemas = schemas
+
+    def create(self, name: str, **options: Any) -> BaseTool:
+        """Instantiate a declared tool, recording how long it took."""
+        spec = self._specs[name]
+        started = time.perf_counter()
+        tool = spec.factory(**options)
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            cost = self._costs[name]
+            if cost.first_init_ms is None:
+                cost.first_init_ms = elapsed
+                logger.info("Tool '%s' initialized in %.2f ms", name, elapsed)
+            cost.last_init_ms = elapsed
+            cost.instances += 1
+        return tool
+
+    def view(self, **options: Dict[str, Any]) -> "ToolView":
+        """
+        A session's view of the enabled tools.
+
+        Args:
+            **options: Keyword arguments for the factory of a tool, by tool name
+                       (e.g. `search_events={"preferences_provider": ...}`)
+        """
+        unknown = set(options) - set(self._specs)
+        if unknown:
+            raise ValueError(f"Options for unknown tools: {', '.join(sorted(unknown))}")
+        return ToolView(self, options)
+
+    def startup_report(self) -> Dict[str, Dict[str, Any]]:
+        """Schema loading and construction cost of each declared tool."""
+        with self._lock:
+            return {name: cost.as_dict() for name, cost in self._costs.items()}
+
+
+class ToolView(Mapping):
+    """
+    Mapping of tool name to tool for one session.
+
+    Creating a view costs nothing; each tool is built on first access and kept
+    for the session.
+    """
+
+    def __init__(self, registry: ToolRegistry, options: Optional[Dict[str, Dict[str, Any]]] = None):
+        self._registry = registry
+        self._options = options or {}
+        self._names = registry.names
+        self._tools: Dict[str, BaseTool] = {}
+
+    def __getitem__(self, name: str) -> BaseTool:
+        tool = self._tools.get(name)
+        if tool is None:
+            if name not in self._names:
+                raise KeyError(name)
+            tool = self._tools[name] = self._registry.create(name, **self._options.get(name, {}))
+        return tool
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
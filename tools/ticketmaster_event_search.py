@@ -5,21 +5,28 @@ Handles interaction with the Ticketmaster Discovery API.
 Provides a tool class to search for events based on parameters, compatible with BaseTool.
 """
 
-import requests
+import httpx
 from tools.base_tool import BaseTool
-import json
+from tools.registry import load_tool_description
+from services.async_runner import run_sync
+from services.http_client import get_http_client
 from env_config import get_ticketmaster_api_key
 
 BASE_URL = "https://app.ticketmaster.com/discovery/v2/events.json"
 
 class TicketmasterAPI(BaseTool):
     def __init__(self):
-        with open("tools/descriptions/ticketmaster_event_search.json", "r") as file:
-            self.tool_description = json.load(file)
+        self.tool_description = load_tool_description("ticketmaster_event_search.json")
     def get_description(self) -> str:
         return self.tool_description["function"]["description"]
 
     def run(self, params) -> str:
+        """
+        Synchronous wrapper around run_async.
+        """
+        return run_sync(self.run_async(params))
+
+    async def run_async(self, params) -> str:
         """
         Run the Ticketmaster event search with the given parameters.
         Args:
@@ -64,7 +71,7 @@ class TicketmasterAPI(BaseTool):
             api_params["page"] = params["page"]
 
         try:
-            response = requests.get(BASE_URL, params=api_params, timeout=10)
+            response = await get_http_client().get(BASE_URL, params=api_params, timeout=10)
             response.raise_for_status()
             data = response.json()
             events = data.get("_embedded", {}).get("events", [])
@@ -86,7 +93,7 @@ class TicketmasterAPI(BaseTool):
                     venue = f"{venue_name}, {city}, {state}".strip(", ")
                 summary.append(f"{name} at {venue} on {date_str} {time_str} - {url}")
             return "\n".join(summary)
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             return f"Error contacting Ticketmaster API: {e}"
         except Exception as e:
             return f"Unexpected error: {e}"
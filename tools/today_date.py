@@ -5,13 +5,12 @@ Provides a tool class to return today's date in ISO format, compatible with Base
 """
 
 from tools.base_tool import BaseTool
+from tools.registry import load_tool_description
 import datetime
-import json
 
 class TodayDateTool(BaseTool):
     def __init__(self):
-        with open("tools/descriptions/today_date.json", "r") as file:
-            self.tool_description = json.load(file)
+        self.tool_description = load_tool_description("today_date.json")
     def get_description(self) -> str:
         return self.tool_description["function"]["description"]
 